@@ -1,21 +1,640 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 import io
-import base64
+import argparse
+import csv
+import functools
 import sqlite3
 import hashlib
+import hmac
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import os
+import platform
+import queue
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is used when zstandard is not installed
+    zstandard = None
+
+try:
+    import openpyxl
+except ImportError:  # optional: needed for the XLSX bulk export
+    openpyxl = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: needed for the Parquet bulk export
+    pyarrow = None
 
 # Database setup
 DB_NAME = "church_reports.db"
+DB_POOL_SIZE = 8
+
+# Connection tuning for many concurrent sessions sharing one database file
+DB_BUSY_TIMEOUT_MS = 5000
+DB_CACHE_SIZE_KB = 16384
+DB_MMAP_SIZE = 64 * 1024 * 1024
+
+# Write retry policy when the database stays locked past the busy timeout
+DB_WRITE_RETRIES = 5
+DB_RETRY_BASE_DELAY = 0.05
+
+# Report snapshots: b'RPT' + format version + compression id + payload
+REPORT_FORMAT_MAGIC = b'RPT'
+REPORT_FORMAT_VERSION = 2
+REPORT_COMPRESSION = 'zstd' if zstandard else 'zlib'
+REPORT_COMPRESS_MIN_BYTES = 256
+
+# Saves append JSON-Patch deltas; a report is folded back into one snapshot after this many
+REPORT_DELTA_COMPACT_EVERY = 50
+
+# Report version history: saves within the coalesce window update the newest version
+# instead of adding one; retention keeps the newest versions plus one per day
+REPORT_VERSION_COALESCE_SECONDS = 300
+REPORT_VERSIONS_KEEP = 20
+REPORT_VERSION_KEEP_DAYS = 30
+
+# Reports decoded at a time by the bulk export
+EXPORT_BATCH_SIZE = 200
+
+# Reports shown per page in the MY REPORTS browser
+REPORTS_PAGE_SIZE = 20
+
+# Ranked full-text search results shown at most
+REPORT_SEARCH_LIMIT = 20
+
+# Per-user report lists are kept current by saves and deletes; the TTL only catches
+# writes from outside this process. Lists, pages and searches kept, least recently used dropped first
+REPORT_LIST_CACHE_TTL_SECONDS = 60
+REPORT_LIST_CACHE_SIZE = 1024
+
+# Parsed templates kept in memory; the catalog itself is always cached
+TEMPLATE_CACHE_SIZE = 32
+
+# Autosave waits for a pause in editing, but never longer than the max delay
+AUTOSAVE_DEBOUNCE_SECONDS = 2.0
+AUTOSAVE_MAX_DELAY_SECONDS = 10.0
+
+# Password hashing: the scheme and cost new hashes get. A stored hash records its own
+# scheme and cost, so raising these upgrades each user's hash at their next login
+PASSWORD_HASHER = 'scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256'
+PASSWORD_SCRYPT_COST = {'n': 2 ** 14, 'r': 8, 'p': 1}
+PASSWORD_PBKDF2_COST = {'iterations': 600_000}
+PASSWORD_SALT_BYTES = 16
+
+# Key derivations run at most this many at a time, so a burst of logins queues
+# instead of taking every core from the sessions already signed in
+PASSWORD_HASH_WORKERS = 2
+
+# Recently verified logins skip the key derivation until they expire
+CREDENTIAL_CACHE_SIZE = 1024
+CREDENTIAL_CACHE_TTL_SECONDS = 15 * 60
+
+# Signed-in sessions survive a browser reload through a signed token in the URL
+# (?session=...); the server keeps each session's last active report to reopen.
+# Anyone holding the URL holds the session, so tokens are single-use (every resume
+# swaps in a new one) and short-lived
+SESSION_TTL_SECONDS = 12 * 60 * 60
+SESSION_QUERY_PARAM = 'session'
+
+# Benchmarks (`python tem.py bench`): synthetic database sizes, reports per synthetic
+# user, and timed rounds per benchmark
+BENCH_SIZES = (10, 10_000, 100_000)
+BENCH_REPORTS_PER_USER = 200
+BENCH_ROUNDS = 20
+BENCH_PASSWORD = 'bench-password'
+
+# Profiling: reruns kept for the diagnostics panel, and the length SQL statements are grouped by
+PROFILE_RERUN_HISTORY = 200
+PROFILE_SQL_KEY_LENGTH = 120
+
+class Profiler:
+    """Process-wide latency, SQL and payload-size statistics for the diagnostics panel.
+    
+    Every figure is kept per name as [count, total, max]. Work done on a script thread
+    between begin_rerun() and end_rerun() is also totalled per rerun.
+    """
+    KINDS = ('rerun', 'function', 'sql', 'payload')
+    
+    def __init__(self, history: int = PROFILE_RERUN_HISTORY):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._history = history
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._stats = {kind: {} for kind in self.KINDS}
+            self._reruns = deque(maxlen=self._history)
+            self._interrupted = 0
+    
+    @staticmethod
+    def _accumulate(table: Dict, name: str, value: float):
+        stat = table.get(name)
+        if stat is None:
+            table[name] = [1, value, value]
+        else:
+            stat[0] += 1
+            stat[1] += value
+            stat[2] = max(stat[2], value)
+    
+    def _add(self, kind: str, name: str, value: float):
+        with self._lock:
+            self._accumulate(self._stats[kind], name, value)
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is not None:
+            self._accumulate(rerun[kind], name, value)
+    
+    @contextmanager
+    def span(self, name: str):
+        """Time the block as a call of `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add('function', name, time.perf_counter() - start)
+    
+    def timed(self, name: Optional[str] = None):
+        """Decorator timing every call of the function"""
+        def decorate(fn):
+            label = name or fn.__name__
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._add('function', label, time.perf_counter() - start)
+            return wrapper
+        return decorate
+    
+    def record_sql(self, sql: str, seconds: float):
+        # Group statements that only differ in layout or in the length of an IN (?, ?, ...) list
+        statement = re.sub(r'\?(?:\s*,\s*\?)+', '?, ...', ' '.join(sql.split()))
+        self._add('sql', statement[:PROFILE_SQL_KEY_LENGTH], seconds)
+    
+    def record_payload(self, name: str, size: int):
+        self._add('payload', name, size)
+    
+    def begin_rerun(self):
+        """Start timing a script run on this thread. A run still open was cut short by st.rerun() or st.stop()."""
+        if getattr(self._local, 'rerun', None) is not None:
+            with self._lock:
+                self._interrupted += 1
+        self._local.rerun = {'started_at': datetime.now(), 'start': time.perf_counter(), 'function': {}, 'sql': {}, 'payload': {}}
+    
+    def end_rerun(self, page: str):
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is None:
+            return
+        self._local.rerun = None
+        duration = time.perf_counter() - rerun['start']
+        record = {
+            'started_at': rerun['started_at'].isoformat(timespec='seconds'),
+            'page': page,
+            'duration': duration,
+            'sql_count': sum(stat[0] for stat in rerun['sql'].values()),
+            'sql_time': sum(stat[1] for stat in rerun['sql'].values()),
+            'payload_bytes': sum(stat[1] for stat in rerun['payload'].values()),
+            'functions': {name: stat[1] for name, stat in rerun['function'].items()},
+        }
+        with self._lock:
+            self._accumulate(self._stats['rerun'], page, duration)
+            self._reruns.append(record)
+    
+    def snapshot(self) -> Dict:
+        """All statistics as plain JSON-serializable data"""
+        with self._lock:
+            stats = {
+                kind: {name: {'count': count, 'total': total, 'max': peak, 'mean': total / count}
+                       for name, (count, total, peak) in table.items()}
+                for kind, table in self._stats.items()
+            }
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'interrupted_reruns': self._interrupted,
+                **stats,
+                'recent_reruns': list(self._reruns),
+            }
+    
+    def to_prometheus(self) -> str:
+        """Statistics in the Prometheus text exposition format"""
+        metrics = {
+            'rerun': ('church_reports_rerun_seconds', 'page', 'Streamlit script run time'),
+            'function': ('church_reports_function_seconds', 'function', 'Hot-path function call time'),
+            'sql': ('church_reports_sql_seconds', 'statement', 'SQLite statement execution time'),
+            'payload': ('church_reports_payload_bytes', 'payload', 'Serialized payload size'),
+        }
+        snapshot = self.snapshot()
+        lines = []
+        for kind, (metric, label, description) in metrics.items():
+            series = [(name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'), stat)
+                      for name, stat in snapshot[kind].items()]
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} summary']
+            for name, stat in series:
+                lines += [f'{metric}_count{{{label}="{name}"}} {stat["count"]}',
+                          f'{metric}_sum{{{label}="{name}"}} {stat["total"]:.6f}']
+            lines += [f'# HELP {metric}_max {description}, largest observed', f'# TYPE {metric}_max gauge']
+            lines += [f'{metric}_max{{{label}="{name}"}} {stat["max"]:.6f}' for name, stat in series]
+        lines += ['# HELP church_reports_interrupted_reruns_total Script runs cut short by st.rerun() or st.stop()',
+                  '# TYPE church_reports_interrupted_reruns_total counter',
+                  f'church_reports_interrupted_reruns_total {snapshot["interrupted_reruns"]}']
+        return '\n'.join(lines) + '\n'
+
+@st.cache_resource(show_spinner=False)
+def get_profiler() -> Profiler:
+    """Process-wide profiler shared by all sessions"""
+    return Profiler()
+
+PROFILER = get_profiler()
+
+class _ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports every statement's execution time to the profiler"""
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            PROFILER.record_sql(sql, time.perf_counter() - start)
+    
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            PROFILER.record_sql(sql, time.perf_counter() - start)
+
+class _ProfiledConnection(sqlite3.Connection):
+    def cursor(self, factory=_ProfiledCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections shared by all sessions"""
+    
+    def __init__(self, db_name: str, max_idle: int = DB_POOL_SIZE):
+        self.db_name = db_name
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, isolation_level=None,
+                               factory=_ProfiledConnection)
+        conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA cache_size = -{DB_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size = {DB_MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Check out a connection and run the block as a single write transaction"""
+        with self.connection() as conn:
+            # Take the write lock up front so WAL readers never need a lock upgrade
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+    
+    @contextmanager
+    def read_transaction(self):
+        """Check out a connection and read from one consistent snapshot"""
+        with self.connection() as conn:
+            conn.execute('BEGIN')
+            yield conn
+            conn.execute('COMMIT')
+
+@st.cache_resource(show_spinner=False)
+def get_connection_pool() -> ConnectionPool:
+    """Process-wide connection pool, reused across reruns and sessions"""
+    return ConnectionPool(DB_NAME)
+
+def db_connection():
+    """Borrow a pooled connection: `with db_connection() as conn: ...`"""
+    return get_connection_pool().connection()
+
+def db_transaction():
+    """Borrow a pooled connection inside a transaction that commits on success"""
+    return get_connection_pool().transaction()
 
-def init_database():
-    """Initialize the SQLite database with required tables"""
-    conn = sqlite3.connect(DB_NAME)
+def db_read_transaction():
+    """Borrow a pooled connection for several reads that must see the same data"""
+    return get_connection_pool().read_transaction()
+
+def _is_lock_error(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+def run_write(write_fn, *args, **kwargs):
+    """Run write_fn(conn, ...) in a transaction, retrying with jittered backoff while the database is locked"""
+    for attempt in range(DB_WRITE_RETRIES + 1):
+        try:
+            with db_transaction() as conn:
+                return write_fn(conn, *args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if not _is_lock_error(e) or attempt == DB_WRITE_RETRIES:
+                raise
+            time.sleep(DB_RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    try:
+        return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+    except sqlite3.OperationalError:
+        # A new database, or one from before versioned migrations
+        return 0
+
+def _migrate(conn: sqlite3.Connection):
     c = conn.cursor()
+    _create_schema(c)
+    apply_migrations(c)
+
+def init_database() -> int:
+    """Bring the database up to the latest schema version and return it.
+    
+    A database that is already current is only read: one query, no write lock.
+    """
+    with db_connection() as conn:
+        if _schema_version(conn) >= SCHEMA_VERSION:
+            return SCHEMA_VERSION
+        # WAL is persistent in the database file; readers no longer block autosave writers
+        conn.execute('PRAGMA journal_mode = WAL')
+    # One transaction; a process that loses the race finds the migrations applied
+    run_write(_migrate)
+    return SCHEMA_VERSION
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_database(db_name: str) -> int:
+    """init_database() once per process and database file; reruns skip the schema check"""
+    return init_database()
+
+# Hot queries, shared with check_query_plans() so the plans checked are the plans run
+USER_REPORTS_SQL = '''
+    SELECT id, report_name, church_name, reporting_year, 
+           completion_percentage, created_at, updated_at, is_archived
+    FROM reports 
+    WHERE user_id = ? AND is_archived = 0
+    ORDER BY updated_at DESC, id DESC
+'''
+# Keyset page of a user's reports: rows after the (updated_at, id) cursor, optionally name-filtered
+USER_REPORTS_PAGE_SQL = '''
+    SELECT id, report_name, church_name, reporting_year, 
+           completion_percentage, created_at, updated_at, is_archived
+    FROM reports 
+    WHERE user_id = ? AND is_archived = 0
+      AND (updated_at, id) < (?, ?)
+      AND (? = '' OR report_name LIKE ? ESCAPE '\\' OR church_name LIKE ? ESCAPE '\\')
+    ORDER BY updated_at DESC, id DESC
+    LIMIT ?
+'''
+# Ranked full-text search: each report scores by its best-matching row, whose section and snippet are returned
+REPORT_SEARCH_SQL = '''
+    WITH m AS MATERIALIZED (
+        SELECT report_id, section, snippet(report_search, 3, '**', '**', '…', 10) AS snippet,
+               bm25(report_search, 0, 0, 5.0, 1.0) AS rank
+        FROM report_search WHERE report_search MATCH ?
+    )
+    SELECT r.id, r.report_name, r.church_name, r.reporting_year,
+           r.completion_percentage, r.created_at, r.updated_at, r.is_archived,
+           m.section, m.snippet, MIN(m.rank) AS rank
+    FROM m
+    JOIN reports r ON r.id = m.report_id
+    WHERE r.user_id = ? AND r.is_archived = 0
+    GROUP BY r.id
+    ORDER BY rank
+    LIMIT ?
+'''
+# Per-report metrics of every active report, for conference rollups
+REPORT_METRICS_SQL = '''
+    SELECT r.id, r.church_name, r.reporting_year, m.annual_conference, m.district,
+           m.budget_total, m.lay_members, m.trustee_ct_cost, m.trustee_total_cost,
+           m.nursery_enrolled, m.kinder_enrolled, m.membership
+    FROM report_metrics m
+    JOIN reports r ON r.id = m.report_id
+    WHERE r.is_archived = 0
+'''
+REPORT_ROW_SQL = '''
+    SELECT id, report_name, church_name, reporting_year, 
+           completion_percentage, created_at, updated_at, is_archived
+    FROM reports 
+    WHERE id = ?
+'''
+REPORT_BY_NAME_SQL = 'SELECT id FROM reports WHERE user_id = ? AND report_name = ?'
+PUBLIC_TEMPLATES_SQL = '''
+    SELECT id, name, description, created_by, created_at 
+    FROM templates 
+    WHERE is_public = 1
+    ORDER BY name
+'''
+SESSION_USER_SQL = '''
+    SELECT u.id, u.username, u.email, u.full_name, u.church_name, u.role, s.report_id
+    FROM sessions s
+    JOIN users u ON u.id = s.user_id
+    WHERE s.id = ? AND s.expires_at > ?
+'''
+
+# Ordered schema migrations: (version, description, steps). Append only.
+# A step is an SQL statement or a callable that receives the cursor.
+SCHEMA_MIGRATIONS = [
+    (1, "Covering indexes for the report list, report lookup and template list", [
+        '''CREATE INDEX IF NOT EXISTS idx_reports_user_active
+           ON reports (user_id, is_archived, updated_at DESC, report_name, church_name,
+                       reporting_year, completion_percentage, created_at)''',
+        'CREATE INDEX IF NOT EXISTS idx_reports_user_name ON reports (user_id, report_name)',
+        '''CREATE INDEX IF NOT EXISTS idx_templates_public_name
+           ON templates (is_public, name, description, created_by, created_at)''',
+    ]),
+    (2, "JSON-Patch deltas applied on top of reports.data_json", [
+        '''CREATE TABLE IF NOT EXISTS report_deltas (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               report_id INTEGER NOT NULL,
+               patch_json TEXT NOT NULL,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (report_id) REFERENCES reports (id)
+           )''',
+        'CREATE INDEX IF NOT EXISTS idx_report_deltas_report ON report_deltas (report_id, id)',
+    ]),
+    (3, "One row per report section; data_json becomes an empty placeholder", [
+        '''CREATE TABLE IF NOT EXISTS report_sections (
+               report_id INTEGER NOT NULL,
+               section TEXT NOT NULL,
+               payload BLOB NOT NULL,
+               content_hash TEXT NOT NULL,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               PRIMARY KEY (report_id, section),
+               FOREIGN KEY (report_id) REFERENCES reports (id)
+           )''',
+        'ALTER TABLE report_deltas ADD COLUMN section TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_report_deltas_section ON report_deltas (report_id, section, id)',
+        lambda c: _split_legacy_reports(c),
+    ]),
+    (4, "Report list index ordered by the (updated_at, id) page cursor", [
+        '''CREATE INDEX IF NOT EXISTS idx_reports_user_page
+           ON reports (user_id, is_archived, updated_at DESC, id DESC, report_name, church_name,
+                       reporting_year, completion_percentage, created_at)''',
+        'DROP INDEX IF EXISTS idx_reports_user_active',
+    ]),
+    (5, "FTS5 index over report names and section text", [
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS report_search USING fts5(
+               report_id UNINDEXED, section UNINDEXED, title, body,
+               tokenize = 'unicode61 remove_diacritics 2'
+           )''',
+        lambda c: _index_all_reports(c),
+    ]),
+    (6, "Per-report metrics summary for district and conference rollups", [
+        '''CREATE TABLE IF NOT EXISTS report_metrics (
+               report_id INTEGER PRIMARY KEY,
+               annual_conference TEXT NOT NULL DEFAULT '',
+               district TEXT NOT NULL DEFAULT '',
+               budget_total REAL NOT NULL DEFAULT 0,
+               lay_members REAL NOT NULL DEFAULT 0,
+               trustee_ct_cost REAL NOT NULL DEFAULT 0,
+               trustee_total_cost REAL NOT NULL DEFAULT 0,
+               nursery_enrolled REAL NOT NULL DEFAULT 0,
+               kinder_enrolled REAL NOT NULL DEFAULT 0,
+               membership REAL NOT NULL DEFAULT 0,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (report_id) REFERENCES reports (id)
+           )''',
+        lambda c: _compute_all_report_metrics(c),
+    ]),
+    (7, "Report version history over content-addressed section snapshots", [
+        '''CREATE TABLE IF NOT EXISTS section_blobs (
+               content_hash TEXT PRIMARY KEY,
+               payload BLOB NOT NULL
+           )''',
+        '''CREATE TABLE IF NOT EXISTS report_versions (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               report_id INTEGER NOT NULL,
+               label TEXT,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (report_id) REFERENCES reports (id)
+           )''',
+        'CREATE INDEX IF NOT EXISTS idx_report_versions_report ON report_versions (report_id, id)',
+        '''CREATE TABLE IF NOT EXISTS report_version_sections (
+               version_id INTEGER NOT NULL,
+               section TEXT NOT NULL,
+               content_hash TEXT NOT NULL,
+               PRIMARY KEY (version_id, section),
+               FOREIGN KEY (version_id) REFERENCES report_versions (id)
+           )''',
+        'CREATE INDEX IF NOT EXISTS idx_report_version_sections_hash ON report_version_sections (content_hash)',
+        lambda c: _record_initial_versions(c),
+    ]),
+    (8, "Seed the default template", [
+        lambda c: _seed_default_template(c),
+    ]),
+    (9, "Sign-in sessions with their last active report, and the key session tokens are signed with", [
+        '''CREATE TABLE IF NOT EXISTS sessions (
+               id TEXT PRIMARY KEY,
+               user_id INTEGER NOT NULL,
+               report_id INTEGER,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               expires_at REAL NOT NULL,
+               FOREIGN KEY (user_id) REFERENCES users (id)
+           )''',
+        'CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)',
+        '''CREATE TABLE IF NOT EXISTS settings (
+               key TEXT PRIMARY KEY,
+               value TEXT NOT NULL
+           )''',
+        lambda c: c.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('session_secret', ?)",
+                            (os.urandom(32).hex(),)),
+    ]),
+]
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+def apply_migrations(c: sqlite3.Cursor):
+    """Apply pending SCHEMA_MIGRATIONS in order and record them in schema_version"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    c.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version')
+    current_version = c.fetchone()[0]
+    
+    for version, description, steps in SCHEMA_MIGRATIONS:
+        if version <= current_version:
+            continue
+        for step in steps:
+            if callable(step):
+                step(c)
+            else:
+                c.execute(step)
+        c.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (version, description))
+
+def explain_query_plan(sql: str, params: Tuple = ()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    with db_connection() as conn:
+        return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+
+def check_query_plans() -> Dict[str, bool]:
+    """Check that each hot query is answered from its index without a sort. Returns {index_name: ok}"""
+    expectations = [
+        ('idx_reports_user_page', USER_REPORTS_SQL, (1,)),
+        ('idx_reports_user_page', USER_REPORTS_PAGE_SQL, (1, '9999', 0, 'a', '%a%', '%a%', REPORTS_PAGE_SIZE + 1)),
+        ('idx_reports_user_name', REPORT_BY_NAME_SQL, (1, '')),
+        ('idx_templates_public_name', PUBLIC_TEMPLATES_SQL, ()),
+    ]
+    results = {}
+    for index_name, sql, params in expectations:
+        plan = explain_query_plan(sql, params)
+        uses_index = any(index_name in line for line in plan)
+        needs_sort = any('TEMP B-TREE' in line for line in plan)
+        results[index_name] = results.get(index_name, True) and uses_index and not needs_sort
+    return results
+
+def _create_schema(c: sqlite3.Cursor):
+    """Create the base tables that SCHEMA_MIGRATIONS build on"""
     
     # Users table for authentication
     c.execute('''
@@ -64,75 +683,12 @@ def init_database():
     ''')
     
     # REMOVED: Default admin user insertion
-    
-    # Insert default template if not exists
+
+def _seed_default_template(c: sqlite3.Cursor):
+    """Migration 8: insert the default template, unless an older version already did"""
     c.execute("SELECT COUNT(*) FROM templates WHERE name = 'Default Template'")
     if c.fetchone()[0] == 0:
-        default_data = {
-            'strategic_df': pd.DataFrame({
-                'Strategic Area': [
-                    'MINISTRY EXPANSION',
-                    'LEADERSHIP DEVELOPMENT',
-                    'FINANCIAL SUSTAINABILITY and STRUCTURAL DEVELOPMENT',
-                    'PARTNERSHIP DEVELOPMENT',
-                    'CHURCH WORKERS HEALTH CARE DEVELOPMENT'
-                ],
-                'Objectives': [''] * 5,
-                'Activities': [''] * 5,
-                'Timeline': [''] * 5,
-                'Responsible Persons': [''] * 5,
-                'Budget (₱)': [0] * 5,
-                'Status': [''] * 5
-            }).to_dict(),
-            'lay_df': pd.DataFrame({
-                'Organization': [
-                    'United Methodist Men',
-                    'United Methodist Women',
-                    'United Methodist Youth',
-                    'United Methodist Young Adults',
-                    'Children\'s Ministry',
-                    'Other (Specify)'
-                ],
-                'President': [''] * 6,
-                'Contact Number': [''] * 6,
-                'No. of Members': [0] * 6,
-                'Regular Meetings': [''] * 6,
-                'Key Programs': [''] * 6
-            }).to_dict(),
-            'trustee_df': pd.DataFrame({
-                'Property Description': [''] * 3,
-                'Date Acquired': [''] * 3,
-                'Specific Project': [''] * 3,
-                'Funding Source': [''] * 3,
-                'Cost of CT (₱)': [0] * 3,
-                'Total Cost (₱)': [0] * 3,
-                'Remarks': [''] * 3
-            }).to_dict(),
-            'leadership_df': pd.DataFrame({
-                'Position': [
-                    'Chairperson',
-                    'Vice-Chairperson',
-                    'Secretary',
-                    'Treasurer',
-                    'Auditor',
-                    'Board of Trustees Chair',
-                    'Lay Leader',
-                    'Other (Specify)'
-                ],
-                'Name': [''] * 8,
-                'Contact Number': [''] * 8,
-                'Email': [''] * 8,
-                'Status (New/Old)': [''] * 8
-            }).to_dict(),
-            'appendix_df': pd.DataFrame({
-                'Organization': [''] * 5,
-                'Position': [''] * 5,
-                'Name': [''] * 5,
-                'Cell Phone Number': [''] * 5,
-                'Facebook Account': [''] * 5,
-                'Email': [''] * 5
-            }).to_dict()
-        }
+        default_data = {frame_key: encode_frame(frame) for frame_key, frame in get_default_frames().items()}
         # Create a default user for the template if no users exist
         c.execute("SELECT id FROM users LIMIT 1")
         default_user = c.fetchone()
@@ -142,43 +698,158 @@ def init_database():
             INSERT INTO templates (name, description, data_json, created_by, is_public)
             VALUES (?, ?, ?, ?, ?)
         ''', ('Default Template', 'Standard church reporting template', json.dumps(default_data), user_id, 1))
-    
-    conn.commit()
-    conn.close()
-
-# Initialize database
-init_database()
 
 # Authentication functions
-def hash_password(password: str) -> str:
-    """Hash password for storage"""
-    return hashlib.sha256(password.encode()).hexdigest()
+# Password schemes: name -> (derive(password, salt, cost) -> digest, cost for new hashes,
+# or None for schemes that only verify).
+# Stored as 'name$key=value,...$salt hex$digest hex'; bare SHA-256 hex digests are legacy
+# hashes from before salting, accepted once and upgraded on login.
+PASSWORD_HASHERS = {
+    'scrypt': (lambda password, salt, cost: hashlib.scrypt(password, salt=salt, n=cost['n'], r=cost['r'], p=cost['p'],
+                                                           maxmem=256 * cost['n'] * cost['r'], dklen=32),
+               PASSWORD_SCRYPT_COST),
+    'pbkdf2_sha256': (lambda password, salt, cost: hashlib.pbkdf2_hmac('sha256', password, salt, cost['iterations']),
+                      PASSWORD_PBKDF2_COST),
+    'sha256': (lambda password, salt, cost: hashlib.sha256(password).digest(), None),
+}
+
+@st.cache_resource(show_spinner=False)
+def get_password_pool() -> ThreadPoolExecutor:
+    """Process-wide pool that bounds concurrent key derivations"""
+    return ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-kdf")
+
+def _derive_password(scheme: str, password: str, salt: bytes, cost: Dict) -> bytes:
+    derive = PASSWORD_HASHERS[scheme][0]
+    with PROFILER.span(f'password_{scheme}'):
+        return get_password_pool().submit(derive, password.encode(), salt, cost).result()
 
+def _parse_password_hash(stored: str) -> Tuple[str, Dict, bytes, bytes]:
+    """(scheme, cost, salt, digest) of a stored password hash"""
+    if '$' not in stored:
+        return 'sha256', {}, b'', bytes.fromhex(stored)
+    scheme, cost, salt, digest = stored.split('$')
+    cost = {key: int(value) for key, value in (item.split('=') for item in cost.split(','))} if cost else {}
+    return scheme, cost, bytes.fromhex(salt), bytes.fromhex(digest)
+
+def hash_password(password: str, scheme: str = PASSWORD_HASHER) -> str:
+    """Hash password for storage with a fresh salt"""
+    cost = PASSWORD_HASHERS[scheme][1]
+    if cost is None:
+        raise ValueError(f"Password scheme {scheme} can only verify legacy hashes")
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    digest = _derive_password(scheme, password, salt, cost)
+    cost_text = ','.join(f"{key}={value}" for key, value in cost.items())
+    return f"{scheme}${cost_text}${salt.hex()}${digest.hex()}"
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a stored hash of any supported scheme"""
+    try:
+        scheme, cost, salt, digest = _parse_password_hash(stored)
+    except ValueError:
+        return False
+    if scheme not in PASSWORD_HASHERS:
+        return False
+    return hmac.compare_digest(_derive_password(scheme, password, salt, cost), digest)
+
+def password_needs_rehash(stored: str) -> bool:
+    """Whether a stored hash predates the current scheme or cost"""
+    scheme, cost, _, _ = _parse_password_hash(stored)
+    return scheme != PASSWORD_HASHER or cost != PASSWORD_HASHERS[PASSWORD_HASHER][1]
+
+@functools.lru_cache(maxsize=1)
+def _unknown_user_hash() -> str:
+    return hash_password(os.urandom(16).hex())
+
+class CredentialCache:
+    """Recently verified logins, so signing in again skips the key derivation.
+    
+    An entry holds a keyed HMAC of the password, under a key that never leaves the
+    process, and the stored hash it was verified against, so a changed or upgraded
+    hash misses.
+    """
+    
+    def __init__(self, max_entries: int = CREDENTIAL_CACHE_SIZE, ttl: float = CREDENTIAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # username -> (verified_at, stored hash, password HMAC)
+    
+    def _fingerprint(self, password: str) -> bytes:
+        return hmac.new(self._key, password.encode(), hashlib.sha256).digest()
+    
+    def check(self, username: str, password: str, stored: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return False
+            if time.monotonic() - entry[0] > self.ttl or entry[1] != stored:
+                del self._entries[username]
+                return False
+            self._entries.move_to_end(username)
+        return hmac.compare_digest(entry[2], self._fingerprint(password))
+    
+    def add(self, username: str, password: str, stored: str):
+        entry = (time.monotonic(), stored, self._fingerprint(password))
+        with self._lock:
+            self._entries[username] = entry
+            self._entries.move_to_end(username)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+@st.cache_resource(show_spinner=False)
+def get_credential_cache() -> CredentialCache:
+    """Process-wide verified-credential cache shared by all sessions"""
+    return CredentialCache()
+
+@PROFILER.timed()
 def authenticate_user(username: str, password: str) -> Optional[Tuple]:
-    """Authenticate user and return user data"""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
+    """Authenticate user and return user data
     
-    password_hash = hash_password(password)
-    c.execute('''
-        SELECT id, username, email, full_name, church_name, role 
-        FROM users 
-        WHERE username = ? AND password_hash = ?
-    ''', (username, password_hash))
+    A hash from an older scheme or cost is replaced by a current one once the
+    password checks out.
+    """
+    with db_connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            SELECT id, username, email, full_name, church_name, role, password_hash
+            FROM users 
+            WHERE username = ?
+        ''', (username,))
+        
+        row = c.fetchone()
     
-    user = c.fetchone()
-    conn.close()
+    if row is None:
+        # Do the work of a real check so the response time does not tell which usernames exist
+        verify_password(password, _unknown_user_hash())
+        return None
     
-    if user:
+    user, stored_hash = row[:6], row[6]
+    cache = get_credential_cache()
+    new_hash = None
+    if not cache.check(username, password, stored_hash):
+        if not verify_password(password, stored_hash):
+            return None
+        if password_needs_rehash(stored_hash):
+            new_hash = hash_password(password)
+        cache.add(username, password, new_hash or stored_hash)
+    
+    def write(conn):
         # Update last login
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        c.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user[0],))
-        conn.commit()
-        conn.close()
+        conn.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user[0],))
+        if new_hash:
+            # Unless the password changed meanwhile
+            conn.execute('UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?',
+                         (new_hash, user[0], stored_hash))
     
+    run_write(write)
     return user
 
+@PROFILER.timed()
 def create_user(username: str, password: str, email: str = None, full_name: str = None, church_name: str = None) -> Tuple[bool, str]:
     """Create a new user account. Returns (success, message)"""
     try:
@@ -192,171 +863,2014 @@ def create_user(username: str, password: str, email: str = None, full_name: str
         if len(password) < 6:
             return False, "Password must be at least 6 characters"
         
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        
-        # Check if username already exists
-        c.execute('SELECT id FROM users WHERE username = ?', (username,))
-        if c.fetchone():
-            conn.close()
-            return False, "Username already exists"
+        # Derive outside the write transaction, which holds the database write lock
+        password_hash = hash_password(password)
         
-        # Check if email already exists (if provided)
-        if email:
-            c.execute('SELECT id FROM users WHERE email = ?', (email,))
+        def write(conn):
+            c = conn.cursor()
+            
+            # Check if username already exists
+            c.execute('SELECT id FROM users WHERE username = ?', (username,))
             if c.fetchone():
-                conn.close()
-                return False, "Email already registered"
-        
-        password_hash = hash_password(password)
-        c.execute('''
-            INSERT INTO users (username, email, password_hash, full_name, church_name)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (username, email, password_hash, full_name, church_name))
+                return False, "Username already exists"
+            
+            # Check if email already exists (if provided)
+            if email:
+                c.execute('SELECT id FROM users WHERE email = ?', (email,))
+                if c.fetchone():
+                    return False, "Email already registered"
+            
+            c.execute('''
+                INSERT INTO users (username, email, password_hash, full_name, church_name)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (username, email, password_hash, full_name, church_name))
+            return True, "Account created successfully! Please sign in."
         
-        conn.commit()
-        conn.close()
-        return True, "Account created successfully! Please sign in."
+        return run_write(write)
     except sqlite3.Error as e:
         return False, f"Database error: {str(e)}"
     except Exception as e:
         return False, f"Error: {str(e)}"
 
+# Sign-in sessions. A token is 'session id.expiry.signature'; only a hash of the id is
+# stored, and the signature lets forged or expired tokens be refused without a query.
+@st.cache_resource(show_spinner=False)
+def get_session_secret() -> bytes:
+    """Key session tokens are signed with; kept in the database so tokens outlive a restart"""
+    with db_connection() as conn:
+        return bytes.fromhex(conn.execute("SELECT value FROM settings WHERE key = 'session_secret'").fetchone()[0])
+
+def _sign_session(session_id: str, expires: int) -> str:
+    return hmac.new(get_session_secret(), f"{session_id}.{expires}".encode(), hashlib.sha256).hexdigest()
+
+def _session_key(token: str) -> str:
+    return hashlib.sha256(token.split('.')[0].encode()).hexdigest()
+
+def _insert_session(conn: sqlite3.Connection, user_id: int, report_id: Optional[int]) -> str:
+    session_id = os.urandom(16).hex()
+    expires = int(time.time()) + SESSION_TTL_SECONDS
+    token = f"{session_id}.{expires}.{_sign_session(session_id, expires)}"
+    conn.execute('INSERT INTO sessions (id, user_id, report_id, expires_at) VALUES (?, ?, ?, ?)',
+                 (_session_key(token), user_id, report_id, expires))
+    return token
+
+def create_session(user_id: int, report_id: Optional[int] = None) -> str:
+    """Start a sign-in session and return its token"""
+    def write(conn):
+        # Expired sessions are cleared out as new ones start
+        conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (time.time(),))
+        return _insert_session(conn, user_id, report_id)
+    
+    return run_write(write)
+
+@PROFILER.timed()
+def resume_session(token: str) -> Optional[Tuple[Tuple, Optional[int], str]]:
+    """Redeem a session token: (user data as from authenticate_user, last active report id,
+    the token that replaces it), or None if the token is invalid, expired or already used"""
+    try:
+        session_id, expires, signature = token.split('.')
+        expires = int(expires)
+    except ValueError:
+        return None
+    if expires <= time.time() or not hmac.compare_digest(signature, _sign_session(session_id, expires)):
+        return None
+    
+    def write(conn):
+        # Checked and swapped in one transaction, so a token is redeemed at most once
+        row = conn.execute(SESSION_USER_SQL, (_session_key(token), time.time())).fetchone()
+        if row is None:
+            return None
+        conn.execute('DELETE FROM sessions WHERE id = ?', (_session_key(token),))
+        return row[:6], row[6], _insert_session(conn, row[0], row[6])
+    
+    return run_write(write)
+
+def set_session_report(token: str, report_id: Optional[int]):
+    """Remember the report a session has open, for resume_session()"""
+    run_write(lambda conn: conn.execute('UPDATE sessions SET report_id = ? WHERE id = ?', (report_id, _session_key(token))))
+
+def end_session(token: str):
+    run_write(lambda conn: conn.execute('DELETE FROM sessions WHERE id = ?', (_session_key(token),)))
+
+class ReportListCache:
+    """Process-wide cache of each user's report list and report pages, kept current by saves and deletes.
+    
+    The full list (key 'all') is updated in place. Pages shift whenever any report
+    moves, so a write simply drops the user's cached pages. Every page cursor and
+    search term is its own entry, so at most max_entries are kept across all users.
+    """
+    
+    def __init__(self, ttl: float = REPORT_LIST_CACHE_TTL_SECONDS, max_entries: int = REPORT_LIST_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (user_id, key) -> (loaded_at, value), least recently used first
+        self._versions = {}   # user_id -> bumped on every change, so in-flight loads are not cached
+    
+    def get(self, user_id: int, loader, key='all'):
+        """Cached value for (user_id, key), or loader() stored under it"""
+        with self._lock:
+            cached = self._entries.get((user_id, key))
+            if cached:
+                if time.monotonic() - cached[0] < self.ttl:
+                    self._entries.move_to_end((user_id, key))
+                    return cached[1]
+                del self._entries[(user_id, key)]
+            version = self._versions.get(user_id, 0)
+        value = loader()
+        with self._lock:
+            if version == self._versions.get(user_id, 0):
+                self._entries[(user_id, key)] = (time.monotonic(), value)
+                self._entries.move_to_end((user_id, key))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+    
+    def upsert(self, user_id: int, report: Dict):
+        """Replace or add one report in the full list, keeping it ordered like USER_REPORTS_SQL"""
+        self._update(user_id, report['id'], None if report['is_archived'] else report)
+    
+    def remove(self, user_id: int, report_id: int):
+        self._update(user_id, report_id, None)
+    
+    def invalidate(self, user_id: int):
+        """Forget everything cached for a user, e.g. after a bulk import"""
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._drop_user(user_id)
+    
+    def _drop_user(self, user_id: int):
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == user_id]:
+            del self._entries[entry_key]
+    
+    def _update(self, user_id: int, report_id: int, report: Optional[Dict]):
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            cached = self._entries.get((user_id, 'all'))
+            self._drop_user(user_id)
+            if not cached:
+                return
+            reports = [r for r in cached[1] if r['id'] != report_id]
+            if report:
+                reports.append(report)
+                reports.sort(key=lambda r: (r['updated_at'] or '', r['id']), reverse=True)
+            self._entries[(user_id, 'all')] = (cached[0], reports)
+
+@st.cache_resource(show_spinner=False)
+def get_report_list_cache() -> ReportListCache:
+    """Process-wide report list cache shared by all sessions"""
+    return ReportListCache()
+
+def _report_row_to_dict(row: Tuple) -> Dict:
+    return {
+        'id': row[0],
+        'report_name': row[1],
+        'church_name': row[2],
+        'reporting_year': row[3],
+        'completion_percentage': row[4],
+        'created_at': row[5],
+        'updated_at': row[6],
+        'is_archived': row[7]
+    }
+
+def _query_user_reports(user_id: int) -> List[Dict]:
+    with db_connection() as conn:
+        c = conn.cursor()
+        c.execute(USER_REPORTS_SQL, (user_id,))
+        rows = c.fetchall()
+    
+    return [_report_row_to_dict(row) for row in rows]
+
+@PROFILER.timed()
 def get_user_reports(user_id: int) -> List[Dict]:
     """Get all reports for a specific user"""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
+    reports = get_report_list_cache().get(user_id, lambda: _query_user_reports(user_id))
+    return [dict(report) for report in reports]
+
+@PROFILER.timed()
+def get_user_reports_page(user_id: int, after: Optional[Tuple[str, int]] = None, search: str = '',
+                          limit: int = REPORTS_PAGE_SIZE) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+    """Get one page of a user's reports, newest first. Returns (reports, next_cursor).
+    
+    after is the (updated_at, id) cursor of the previous page's last report, and
+    search filters on report or church name. next_cursor is None on the last page.
+    """
+    search = search.strip()
+    
+    def query():
+        # Past the end of any timestamp, so the first page starts at the newest report
+        cursor = after or ('\uffff', 0)
+        pattern = '%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        with db_connection() as conn:
+            rows = conn.execute(USER_REPORTS_PAGE_SQL, (user_id, cursor[0], cursor[1], search, pattern, pattern, limit + 1)).fetchall()
+        
+        reports = [_report_row_to_dict(row) for row in rows[:limit]]
+        next_cursor = (reports[-1]['updated_at'], reports[-1]['id']) if len(rows) > limit else None
+        return reports, next_cursor
+    
+    reports, next_cursor = get_report_list_cache().get(user_id, query, key=('page', after, search, limit))
+    return [dict(report) for report in reports], next_cursor
+
+def _escape_pointer(token) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+def _unescape_pointer(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+def diff_json(old, new, path: str = '') -> List[Dict]:
+    """Return JSON-Patch (RFC 6902) ops turning old into new. Objects and same-length arrays
+    are diffed element by element, anything else is replaced whole, so an edited DataFrame
+    diffs down to single cells."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape_pointer(key)}"})
+        for key, value in new.items():
+            child_path = f"{path}/{_escape_pointer(key)}"
+            if key in old:
+                ops.extend(diff_json(old[key], value, child_path))
+            else:
+                ops.append({'op': 'add', 'path': child_path, 'value': value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for position, (old_item, new_item) in enumerate(zip(old, new)):
+            ops.extend(diff_json(old_item, new_item, f"{path}/{position}"))
+        return ops
+    # NaN never equals itself, but an unchanged NaN cell is not a change
+    if old == new or (old != old and new != new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+def apply_json_patch(doc: Dict, ops: List[Dict]) -> Dict:
+    """Apply ops produced by diff_json to doc in place and return it"""
+    for op in ops:
+        tokens = [_unescape_pointer(token) for token in op['path'].split('/')[1:]]
+        target = doc
+        for token in tokens[:-1]:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            target[int(tokens[-1])] = op['value']
+        elif op['op'] == 'remove':
+            target.pop(tokens[-1], None)
+        else:
+            target[tokens[-1]] = op['value']
+    return doc
+
+# Report serialization
+_COMPRESSORS = {
+    0: ('none', lambda data: data, lambda data: data),
+    1: ('zlib', lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard:
+    _COMPRESSORS[2] = ('zstd', zstandard.ZstdCompressor(level=6).compress, lambda data: zstandard.ZstdDecompressor().decompress(data))
+
+def encode_frame(df: pd.DataFrame) -> Dict:
+    """Column-oriented, typed encoding of a DataFrame: one value array per column plus a dtype header"""
+    default_index = isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+    return {
+        '__frame__': 1,
+        'columns': [str(col) for col in df.columns],
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'index': None if default_index else df.index.tolist(),
+        'data': [df.iloc[:, position].tolist() for position in range(df.shape[1])]
+    }
+
+def decode_frame(encoded: Dict) -> pd.DataFrame:
+    """Inverse of encode_frame"""
+    columns = {}
+    for name, dtype, values in zip(encoded['columns'], encoded['dtypes'], encoded['data']):
+        try:
+            columns[name] = pd.Series(values, dtype=dtype)
+        except (TypeError, ValueError):
+            columns[name] = pd.Series(values)
+    df = pd.DataFrame(columns, columns=encoded['columns'])
+    if encoded.get('index') is not None:
+        df.index = encoded['index']
+    return df
+
+def decode_frames(data: Dict) -> Dict:
+    """Rebuild DataFrames in a loaded report or template, columnar or legacy to_dict()"""
+    for key, value in data.items():
+        if isinstance(value, dict) and '__frame__' in value:
+            data[key] = decode_frame(value)
+        elif key in REPORT_TABLES and isinstance(value, dict):
+            data[key] = pd.DataFrame(value)
+    return data
+
+def encode_report_payload(state_json: str) -> bytes:
+    """Tag and compress a JSON report state for storage"""
+    raw = state_json.encode('utf-8')
+    codec_id = 0
+    if len(raw) >= REPORT_COMPRESS_MIN_BYTES:
+        codec_id = next(cid for cid, (name, _, _) in _COMPRESSORS.items() if name == REPORT_COMPRESSION)
+    compress = _COMPRESSORS[codec_id][1]
+    payload = REPORT_FORMAT_MAGIC + bytes([REPORT_FORMAT_VERSION, codec_id]) + compress(raw)
+    PROFILER.record_payload('report_json', len(raw))
+    PROFILER.record_payload('report_stored', len(payload))
+    return payload
+
+def decode_report_payload(payload) -> Dict:
+    """Parse a stored report state; legacy rows are plain JSON text"""
+    PROFILER.record_payload('report_loaded', len(payload))
+    if isinstance(payload, str):
+        return json.loads(payload)
+    if payload[:3] != REPORT_FORMAT_MAGIC:
+        return json.loads(payload.decode('utf-8'))
+    version, codec_id = payload[3], payload[4]
+    if version > REPORT_FORMAT_VERSION:
+        raise ValueError(f"Report format version {version} is newer than this application supports")
+    if codec_id not in _COMPRESSORS:
+        raise ValueError(f"Report was saved with an unavailable compression codec ({codec_id})")
+    return json.loads(_COMPRESSORS[codec_id][2](payload[5:]).decode('utf-8'))
+
+# Report sections: each is stored as its own row so a view only loads what it shows.
+# Keys not listed here belong to the general section.
+GENERAL_SECTION = 'general'
+REPORT_SECTIONS = {
+    'church_info': ['church_name', 'district', 'annual_conference', 'pastor_name', 'council_chairperson',
+                    'vision', 'mission', 'core_values'],
+    'council_report': ['strategic_df'],
+    'lay_organizations': ['lay_df'],
+    'trustees': ['trustee_df'],
+    'kindergarten': ['nursery_enrolled', 'kinder_enrolled'],
+    'workers': ['membership'],
+    'leadership': ['leadership_df'],
+    'appendices': ['appendix_df', 'audit'],
+    'signatures': ['council_signature', 'pastor_signature', 'secretary_signature'],
+}
+_SECTION_BY_KEY = {key: section for section, keys in REPORT_SECTIONS.items() for key in keys}
+
+# Report tables: frame key -> (import/export sheet, {column: 'text' | 'number'}, first-column
+# labels or a count of blank rows). New reports, the default template, imports and exports
+# all take their layout from here; numeric columns start at 0 and text columns blank.
+REPORT_TABLES = {
+    'strategic_df': ('council_report', {
+        'Strategic Area': 'text', 'Objectives': 'text', 'Activities': 'text', 'Timeline': 'text',
+        'Responsible Persons': 'text', 'Budget (₱)': 'number', 'Status': 'text',
+    }, [
+        'MINISTRY EXPANSION',
+        'LEADERSHIP DEVELOPMENT',
+        'FINANCIAL SUSTAINABILITY and STRUCTURAL DEVELOPMENT',
+        'PARTNERSHIP DEVELOPMENT',
+        'CHURCH WORKERS HEALTH CARE DEVELOPMENT',
+    ]),
+    'lay_df': ('lay_organizations', {
+        'Organization': 'text', 'President': 'text', 'Contact Number': 'text', 'No. of Members': 'number',
+        'Regular Meetings': 'text', 'Key Programs': 'text',
+    }, [
+        'United Methodist Men',
+        'United Methodist Women',
+        'United Methodist Youth',
+        'United Methodist Young Adults',
+        'Children\'s Ministry',
+        'Other (Specify)',
+    ]),
+    'trustee_df': ('trustees', {
+        'Property Description': 'text', 'Date Acquired': 'text', 'Specific Project': 'text', 'Funding Source': 'text',
+        'Cost of CT (₱)': 'number', 'Total Cost (₱)': 'number', 'Remarks': 'text',
+    }, 3),
+    'leadership_df': ('leadership', {
+        'Position': 'text', 'Name': 'text', 'Contact Number': 'text', 'Email': 'text', 'Status (New/Old)': 'text',
+    }, [
+        'Chairperson',
+        'Vice-Chairperson',
+        'Secretary',
+        'Treasurer',
+        'Auditor',
+        'Board of Trustees Chair',
+        'Lay Leader',
+        'Other (Specify)',
+    ]),
+    'appendix_df': ('appendices', {
+        'Organization': 'text', 'Position': 'text', 'Name': 'text', 'Cell Phone Number': 'text',
+        'Facebook Account': 'text', 'Email': 'text',
+    }, 5),
+}
+
+def _table_row_count(rows) -> int:
+    return len(rows) if isinstance(rows, list) else rows
+
+@st.cache_resource(show_spinner=False)
+def get_default_frames() -> Dict[str, pd.DataFrame]:
+    """The blank report tables, built once per process. Shared: use default_frames() for copies to edit."""
+    frames = {}
+    for frame_key, (_, columns, rows) in REPORT_TABLES.items():
+        count = _table_row_count(rows)
+        data = {column: [0 if kind == 'number' else ''] * count for column, kind in columns.items()}
+        if isinstance(rows, list):
+            data[next(iter(columns))] = list(rows)
+        frames[frame_key] = pd.DataFrame(data)
+    return frames
+
+def default_frames() -> Dict[str, pd.DataFrame]:
+    """Copies of the blank report tables for one session to edit"""
+    return {frame_key: _share_frame(frame) for frame_key, frame in get_default_frames().items()}
+
+# Report fields: field -> type. The report model holds these and nothing else, so widget
+# and navigation state never reaches a save. Dates are stored as ISO strings.
+REPORT_FIELDS = {
+    'current_year': int,
+    'completion_status': dict,
+    'report_date': date,
+    **{key: str for key in REPORT_SECTIONS['church_info']},
+    **{frame_key: pd.DataFrame for frame_key in REPORT_TABLES},
+    'nursery_enrolled': int, 'kinder_enrolled': int, 'membership': int, 'audit': str,
+    **{key: str for key in REPORT_SECTIONS['signatures']},
+}
+COMPLETION_SECTIONS = [section for section in REPORT_SECTIONS if section != 'signatures']
+
+class ReportModel:
+    """The report a session edits: values of REPORT_FIELDS plus the fields changed since the last save.
+    
+    Fields never set are absent, as in a stored report. loaded_sections is None when
+    the model holds the whole report, otherwise the sections read so far from the
+    stored report; the others are read when first viewed.
+    
+    A field stays dirty until a save holding its latest value is known to have been
+    written, so a failed background save is retried by the next one.
+    """
+    
+    def __init__(self, values: Optional[Dict] = None, loaded_sections: Optional[set] = None):
+        self.values = {
+            'current_year': datetime.now().year,
+            'completion_status': {section: False for section in COMPLETION_SECTIONS},
+            **default_frames(),
+        }
+        self.loaded_sections = loaded_sections
+        self.edits = 0
+        self.dirty = {}          # field -> number of the edit that last changed it
+        self.unconfirmed = None  # (autosave seq, edits, fields) of the newest queued save
+        self.load(values or {})
+    
+    def get(self, field: str):
+        """Value of a field, or what a blank widget for it shows"""
+        if field in self.values:
+            return self.values[field]
+        kind = REPORT_FIELDS[field]
+        return date.today() if kind is date else kind()
+    
+    def set(self, field: str, value):
+        """Set a field from the UI; it becomes dirty if the value changed"""
+        value = self._typed(field, value)
+        current = self.values.get(field)
+        if isinstance(value, pd.DataFrame) or isinstance(current, pd.DataFrame):
+            unchanged = isinstance(current, pd.DataFrame) and isinstance(value, pd.DataFrame) and current.equals(value)
+        else:
+            unchanged = field in self.values and current == value
+        if unchanged:
+            return
+        self.values[field] = value
+        self.edits += 1
+        self.dirty[field] = self.edits
+        # The value replaces the stored one, so its section must not be read over it later
+        if self.loaded_sections is not None:
+            self.loaded_sections.add(_SECTION_BY_KEY.get(field, GENERAL_SECTION))
+    
+    def load(self, data: Dict, sections: Optional[List[str]] = None):
+        """Take stored values, e.g. from load_report(); other keys are ignored and nothing becomes dirty"""
+        for field, value in data.items():
+            if field in REPORT_FIELDS:
+                self.values[field] = self._typed(field, value)
+        if sections and self.loaded_sections is not None:
+            self.loaded_sections.update(sections)
+    
+    def dirty_sections(self) -> set:
+        return {_SECTION_BY_KEY.get(field, GENERAL_SECTION) for field in self.dirty}
+    
+    def snapshot(self, sections: Optional[set] = None) -> Dict:
+        """Set fields of the given sections (all when None) in stored form.
+        
+        DataFrames are copied: the autosave worker serializes them after the UI moves on.
+        """
+        data = {}
+        for field, value in self.values.items():
+            if sections is not None and _SECTION_BY_KEY.get(field, GENERAL_SECTION) not in sections:
+                continue
+            if isinstance(value, pd.DataFrame):
+                value = value.copy()
+            elif isinstance(value, date):
+                value = value.isoformat()
+            data[field] = value
+        return data
+    
+    def mark_saved(self, fields, as_of: int):
+        """Clear the dirty marks of fields written as they were at edit number as_of"""
+        for field in fields:
+            if self.dirty.get(field, as_of + 1) <= as_of:
+                del self.dirty[field]
+    
+    def save_queued(self, seq: int, fields):
+        """Note a background save; its fields stay dirty until confirm_saved() covers it.
+        A newer save carries every field still dirty, so only the newest is kept."""
+        self.unconfirmed = (seq, self.edits, list(fields))
+    
+    def confirm_saved(self, saved_seq: int):
+        """Clear what the queued save wrote once the autosave worker has written up to saved_seq"""
+        if self.unconfirmed and self.unconfirmed[0] <= saved_seq:
+            _, as_of, fields = self.unconfirmed
+            self.mark_saved(fields, as_of)
+            self.unconfirmed = None
+    
+    @staticmethod
+    def _typed(field: str, value):
+        if REPORT_FIELDS[field] is date and isinstance(value, str):
+            return date.fromisoformat(value)
+        return value
+
+def split_report_sections(state: Dict) -> Dict[str, Dict]:
+    """Group a report state by section: {section: {key: value}}"""
+    sections = {}
+    for key, value in state.items():
+        sections.setdefault(_SECTION_BY_KEY.get(key, GENERAL_SECTION), {})[key] = value
+    return sections
+
+def _section_hash(section_state: Dict) -> str:
+    return hashlib.sha256(json.dumps(section_state, sort_keys=True).encode()).hexdigest()
+
+def _read_section_states(c: sqlite3.Cursor, report_id: int, sections: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Persisted section states of a report: snapshots with their deltas replayed"""
+    return _read_report_states(c, [report_id], sections).get(report_id, {})
+
+def _read_report_states(c: sqlite3.Cursor, report_ids: List[int],
+                        sections: Optional[List[str]] = None) -> Dict[int, Dict[str, Dict]]:
+    """Section states of several reports at once: {report_id: {section: state}}"""
+    report_filter = f"report_id IN ({', '.join('?' * len(report_ids))})"
+    params = list(report_ids)
+    if sections is not None:
+        report_filter += f" AND section IN ({', '.join('?' * len(sections))})"
+        params.extend(sections)
+    
+    states = {}
+    c.execute('SELECT report_id, section, payload FROM report_sections WHERE ' + report_filter, params)
+    for report_id, section, payload in c.fetchall():
+        states.setdefault(report_id, {})[section] = decode_report_payload(payload)
+    
+    c.execute('SELECT report_id, section, patch_json FROM report_deltas WHERE ' + report_filter + ' ORDER BY id', params)
+    for report_id, section, patch_json in c.fetchall():
+        if section in states.get(report_id, {}):
+            apply_json_patch(states[report_id][section], json.loads(patch_json))
+    return states
+
+def _write_section_snapshot(c: sqlite3.Cursor, report_id: int, section: str, section_state: Dict, content_hash: str):
+    c.execute('''
+        INSERT OR REPLACE INTO report_sections (report_id, section, payload, content_hash, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (report_id, section, encode_report_payload(json.dumps(section_state)), content_hash))
+    c.execute('DELETE FROM report_deltas WHERE report_id = ? AND section = ?', (report_id, section))
+
+def _save_report_sections(c: sqlite3.Cursor, report_id: int, section_states: Dict[str, Dict], replace_all: bool,
+                          version_label: Optional[str] = None) -> bool:
+    """Persist the sections whose content changed. New sections are written as snapshots,
+    existing ones as a JSON-Patch delta, and the result is recorded as a report version.
+    Returns whether anything was written."""
+    c.execute('SELECT section, content_hash FROM report_sections WHERE report_id = ?', (report_id,))
+    stored_hashes = dict(c.fetchall())
+    changed = {}   # section -> new state, None if removed
+    
+    if replace_all:
+        for section in stored_hashes.keys() - section_states.keys():
+            c.execute('DELETE FROM report_sections WHERE report_id = ? AND section = ?', (report_id, section))
+            c.execute('DELETE FROM report_deltas WHERE report_id = ? AND section = ?', (report_id, section))
+            _index_report_section(c, report_id, section, None)
+            changed[section] = None
+    
+    for section, section_state in section_states.items():
+        content_hash = _section_hash(section_state)
+        if stored_hashes.get(section) == content_hash:
+            continue
+        changed[section] = section_state
+        _index_report_section(c, report_id, section, section_state)
+        if section not in stored_hashes:
+            _write_section_snapshot(c, report_id, section, section_state, content_hash)
+            continue
+        
+        patch = diff_json(_read_section_states(c, report_id, [section])[section], section_state)
+        if patch:
+            c.execute('INSERT INTO report_deltas (report_id, section, patch_json) VALUES (?, ?, ?)',
+                      (report_id, section, json.dumps(patch)))
+        c.execute('UPDATE report_sections SET content_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE report_id = ? AND section = ?',
+                  (content_hash, report_id, section))
+        
+        # Compact once replaying deltas would cost more than rewriting the snapshot
+        c.execute('''
+            SELECT COUNT(*), COALESCE(SUM(LENGTH(patch_json)), 0),
+                   (SELECT LENGTH(payload) FROM report_sections WHERE report_id = ? AND section = ?)
+            FROM report_deltas WHERE report_id = ? AND section = ?
+        ''', (report_id, section, report_id, section))
+        delta_count, delta_bytes, snapshot_bytes = c.fetchone()
+        if delta_count >= REPORT_DELTA_COMPACT_EVERY or delta_bytes >= snapshot_bytes:
+            _write_section_snapshot(c, report_id, section, section_state, content_hash)
+    
+    _update_report_metrics(c, report_id, changed)
+    if changed:
+        _record_report_version(c, report_id, changed, version_label)
+    return bool(changed)
+
+# Full-text index: one row per report for its name and one per indexed section,
+# at a fixed rowid so a save replaces exactly the rows it touched
+_SEARCH_ROW_STRIDE = 16
+_SEARCH_SECTIONS = [None] + list(REPORT_SECTIONS)
+
+def _search_rowid(report_id: int, section: Optional[str]) -> int:
+    return report_id * _SEARCH_ROW_STRIDE + _SEARCH_SECTIONS.index(section)
+
+def _search_text(value) -> List[str]:
+    """Text strings in a serialized section value (scalars, lists, columnar frames)"""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, dict):
+        if '__frame__' in value:
+            value = value['data']
+        else:
+            value = list(value.values())
+    if isinstance(value, list):
+        return [text for item in value for text in _search_text(item)]
+    return []
+
+_SEARCH_INSERT_SQL = 'INSERT INTO report_search (rowid, report_id, section, title, body) VALUES (?, ?, ?, ?, ?)'
+
+def _search_title_row(report_id: int, report_name: str, church_name: str) -> Tuple:
+    return (_search_rowid(report_id, None), report_id, None, f"{report_name} {church_name or ''}", '')
+
+def _search_section_row(report_id: int, section: str, section_state: Optional[Dict]) -> Optional[Tuple]:
+    """Index row for one section, or None when it has no text or is the (unindexed) general section"""
+    body = '\n'.join(_search_text(section_state)) if section in REPORT_SECTIONS and section_state else ''
+    return (_search_rowid(report_id, section), report_id, section, None, body) if body else None
+
+def _index_report_title(c: sqlite3.Cursor, report_id: int, report_name: str, church_name: str):
+    row = _search_title_row(report_id, report_name, church_name)
+    c.execute('DELETE FROM report_search WHERE rowid = ?', (row[0],))
+    c.execute(_SEARCH_INSERT_SQL, row)
+
+def _index_report_section(c: sqlite3.Cursor, report_id: int, section: str, section_state: Optional[Dict]):
+    """Replace the indexed text of one section"""
+    if section not in REPORT_SECTIONS:
+        return
+    c.execute('DELETE FROM report_search WHERE rowid = ?', (_search_rowid(report_id, section),))
+    row = _search_section_row(report_id, section, section_state)
+    if row:
+        c.execute(_SEARCH_INSERT_SQL, row)
+
+def _index_all_reports(c: sqlite3.Cursor):
+    """Migration 5: build the full-text index for existing reports"""
+    c.execute('SELECT id, report_name, church_name FROM reports')
+    for report_id, report_name, church_name in c.fetchall():
+        _index_report_title(c, report_id, report_name, church_name)
+        for section, section_state in _read_section_states(c, report_id).items():
+            _index_report_section(c, report_id, section, section_state)
+
+# Summary metrics kept per report in report_metrics: {section: {column: (state key, frame column)}}.
+# A frame metric is the column total; without a frame column the value is the scalar itself.
+REPORT_METRICS = {
+    'church_info': {'annual_conference': ('annual_conference', None), 'district': ('district', None)},
+    'council_report': {'budget_total': ('strategic_df', 'Budget (₱)')},
+    'lay_organizations': {'lay_members': ('lay_df', 'No. of Members')},
+    'trustees': {'trustee_ct_cost': ('trustee_df', 'Cost of CT (₱)'),
+                 'trustee_total_cost': ('trustee_df', 'Total Cost (₱)')},
+    'kindergarten': {'nursery_enrolled': ('nursery_enrolled', None), 'kinder_enrolled': ('kinder_enrolled', None)},
+    'workers': {'membership': ('membership', None)},
+}
+_TEXT_METRICS = {'annual_conference', 'district'}
+METRIC_TOTAL_COLUMNS = [column for metrics in REPORT_METRICS.values() for column in metrics
+                        if column not in _TEXT_METRICS]
+_METRIC_DEFAULTS = {column: '' if column in _TEXT_METRICS else 0.0
+                    for metrics in REPORT_METRICS.values() for column in metrics}
+
+def _to_number(value) -> float:
+    try:
+        number = float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if pd.isna(number) else number
+
+def _frame_column_total(encoded, column: str) -> float:
+    """Numeric total of one column of a serialized frame, columnar or legacy to_dict()"""
+    if not isinstance(encoded, dict):
+        return 0.0
+    if '__frame__' in encoded:
+        if column not in encoded['columns']:
+            return 0.0
+        values = encoded['data'][encoded['columns'].index(column)]
+    else:
+        values = list(encoded.get(column, {}).values())
+    numbers = pd.to_numeric(pd.Series(values, dtype=object).astype(str).str.replace(',', '', regex=False), errors='coerce')
+    return float(numbers.sum())
+
+def _section_metrics(section: str, section_state: Dict) -> Dict:
+    metrics = {}
+    for column, (key, frame_column) in REPORT_METRICS[section].items():
+        value = section_state.get(key)
+        if column in _TEXT_METRICS:
+            metrics[column] = str(value or '').strip()
+        elif frame_column:
+            metrics[column] = _frame_column_total(value, frame_column)
+        else:
+            metrics[column] = _to_number(value)
+    return metrics
+
+def _metric_values(section_states: Dict[str, Optional[Dict]]) -> Dict:
+    """Metrics derived from the given sections; None gives a removed section's defaults"""
+    values = {}
+    for section, section_state in section_states.items():
+        if section in REPORT_METRICS:
+            values.update(_section_metrics(section, section_state or {}))
+    return values
+
+def _update_report_metrics(c: sqlite3.Cursor, report_id: int, section_states: Dict[str, Optional[Dict]]):
+    """Refresh the metrics derived from the given sections"""
+    values = _metric_values(section_states)
+    if not values:
+        return
+    
+    columns = list(values)
+    c.execute(f'''
+        INSERT INTO report_metrics (report_id, {', '.join(columns)}, updated_at)
+        VALUES (?, {', '.join('?' * len(columns))}, CURRENT_TIMESTAMP)
+        ON CONFLICT (report_id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in columns)},
+                                              updated_at = excluded.updated_at
+    ''', [report_id, *values.values()])
+
+def _compute_all_report_metrics(c: sqlite3.Cursor):
+    """Migration 6: compute report_metrics for existing reports"""
+    c.execute('SELECT id FROM reports')
+    for (report_id,) in c.fetchall():
+        _update_report_metrics(c, report_id, _read_section_states(c, report_id))
+
+def _record_report_version(c: sqlite3.Cursor, report_id: int, changed: Dict[str, Optional[Dict]],
+                           label: Optional[str] = None):
+    """Record the report's current sections as a version, after a write that changed them.
+    
+    Only the changed sections are stored, in section_blobs under their content hash;
+    unchanged sections are already there from the version that introduced them. An
+    unlabeled save soon after the newest unlabeled version replaces its contents.
+    """
+    c.execute('SELECT section, content_hash FROM report_sections WHERE report_id = ?', (report_id,))
+    manifest = dict(c.fetchall())
+    c.executemany('INSERT OR IGNORE INTO section_blobs (content_hash, payload) VALUES (?, ?)',
+                  [(manifest[section], encode_report_payload(json.dumps(section_state)))
+                   for section, section_state in changed.items() if section_state is not None])
+    
+    c.execute('''
+        SELECT id FROM report_versions
+        WHERE report_id = ? AND label IS NULL AND ? IS NULL
+          AND (julianday('now') - julianday(created_at)) * 86400 < ?
+          AND id = (SELECT MAX(id) FROM report_versions WHERE report_id = ?)
+    ''', (report_id, label, REPORT_VERSION_COALESCE_SECONDS, report_id))
+    coalesce = c.fetchone()
+    if coalesce:
+        version_id = coalesce[0]
+        c.execute('UPDATE report_versions SET updated_at = CURRENT_TIMESTAMP WHERE id = ?', (version_id,))
+        c.execute('SELECT content_hash FROM report_version_sections WHERE version_id = ?', (version_id,))
+        replaced_hashes = {content_hash for (content_hash,) in c.fetchall()}
+        c.execute('DELETE FROM report_version_sections WHERE version_id = ?', (version_id,))
+    else:
+        c.execute('INSERT INTO report_versions (report_id, label) VALUES (?, ?)', (report_id, label))
+        version_id = c.lastrowid
+        replaced_hashes = set()
+    c.executemany('INSERT INTO report_version_sections (version_id, section, content_hash) VALUES (?, ?, ?)',
+                  [(version_id, section, content_hash) for section, content_hash in manifest.items()])
+    
+    replaced_hashes |= _evict_report_versions(c, report_id)
+    _delete_unused_blobs(c, replaced_hashes - set(manifest.values()))
+
+def _evict_report_versions(c: sqlite3.Cursor, report_id: int) -> set:
+    """Apply the retention policy to a report's versions: keep the REPORT_VERSIONS_KEEP newest,
+    plus the newest of each day in the last REPORT_VERSION_KEEP_DAYS days.
+    Returns the section hashes the evicted versions referenced."""
+    c.execute('''
+        SELECT id, date(updated_at), julianday('now') - julianday(updated_at) < ?
+        FROM report_versions WHERE report_id = ? ORDER BY id DESC
+    ''', (REPORT_VERSION_KEEP_DAYS, report_id))
+    keep, days_kept, evicted = set(), set(), []
+    for position, (version_id, day, recent) in enumerate(c.fetchall()):
+        if position < REPORT_VERSIONS_KEEP:
+            keep.add(version_id)
+            days_kept.add(day)
+        elif recent and day not in days_kept:
+            days_kept.add(day)
+        else:
+            evicted.append(version_id)
+    if not evicted:
+        return set()
+    
+    placeholders = ', '.join('?' * len(evicted))
+    c.execute(f'SELECT DISTINCT content_hash FROM report_version_sections WHERE version_id IN ({placeholders})', evicted)
+    hashes = {content_hash for (content_hash,) in c.fetchall()}
+    c.execute(f'DELETE FROM report_version_sections WHERE version_id IN ({placeholders})', evicted)
+    c.execute(f'DELETE FROM report_versions WHERE id IN ({placeholders})', evicted)
+    return hashes
+
+def _delete_unused_blobs(c: sqlite3.Cursor, content_hashes: set):
+    """Drop the given section blobs that no version references any more"""
+    c.executemany('''
+        DELETE FROM section_blobs WHERE content_hash = ?
+        AND NOT EXISTS (SELECT 1 FROM report_version_sections WHERE content_hash = ?)
+    ''', [(content_hash, content_hash) for content_hash in content_hashes])
+
+def _record_initial_versions(c: sqlite3.Cursor):
+    """Migration 7: start the history of existing reports with their current contents"""
+    c.execute('SELECT id FROM reports')
+    for (report_id,) in c.fetchall():
+        section_states = _read_section_states(c, report_id)
+        if section_states:
+            _record_report_version(c, report_id, section_states, "Initial version")
+
+def _read_version_states(c: sqlite3.Cursor, version_id: int, sections: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Section states recorded by a version"""
+    c.execute('''
+        SELECT v.section, b.payload FROM report_version_sections v
+        JOIN section_blobs b ON b.content_hash = v.content_hash
+        WHERE v.version_id = ?
+    ''', (version_id,))
+    return {section: decode_report_payload(payload) for section, payload in c.fetchall()
+            if sections is None or section in sections}
+
+def _split_legacy_reports(c: sqlite3.Cursor):
+    """Migration 3: move data_json snapshots and their whole-report deltas into report_sections"""
+    c.execute("SELECT id, data_json FROM reports WHERE data_json != '{}'")
+    for report_id, data_json in c.fetchall():
+        state = decode_report_payload(data_json)
+        c.execute('SELECT patch_json FROM report_deltas WHERE report_id = ? ORDER BY id', (report_id,))
+        for (patch_json,) in c.fetchall():
+            apply_json_patch(state, json.loads(patch_json))
+        
+        c.execute('DELETE FROM report_deltas WHERE report_id = ?', (report_id,))
+        for section, section_state in split_report_sections(state).items():
+            _write_section_snapshot(c, report_id, section, section_state, _section_hash(section_state))
+        c.execute("UPDATE reports SET data_json = '{}' WHERE id = ?", (report_id,))
+
+def compact_report_deltas(report_id: Optional[int] = None) -> int:
+    """Fold pending deltas into their section snapshots, for one report or for every report.
+    Returns the number of sections compacted."""
+    def write(conn):
+        c = conn.cursor()
+        if report_id is None:
+            c.execute('SELECT DISTINCT report_id, section FROM report_deltas')
+        else:
+            c.execute('SELECT DISTINCT report_id, section FROM report_deltas WHERE report_id = ?', (report_id,))
+        pending = c.fetchall()
+        
+        for compact_id, section in pending:
+            section_state = _read_section_states(c, compact_id, [section]).get(section)
+            if section_state is not None:
+                _write_section_snapshot(c, compact_id, section, section_state, _section_hash(section_state))
+        return len(pending)
+    
+    return run_write(write)
+
+def serialize_report_sections(data_dict: Dict) -> Dict[str, Dict]:
+    """Report state as stored: DataFrames encoded columnar, grouped by section"""
+    serializable_data = {}
+    for key, value in data_dict.items():
+        if isinstance(value, pd.DataFrame):
+            serializable_data[key] = encode_frame(value)
+        else:
+            serializable_data[key] = value
+    
+    # Round-trip so the diff compares like with like (e.g. tuples become lists)
+    return split_report_sections(json.loads(json.dumps(serializable_data)))
+
+@PROFILER.timed()
+def save_report(user_id: int, report_name: str, church_name: str, data_dict: Dict,
+                sections: Optional[List[str]] = None) -> Tuple[int, str]:
+    """Save report to database and return (report_id, message)
+    
+    With sections given, only those sections are written and the rest of the
+    stored report is left as is (used when only some sections were loaded).
+    """
+    try:
+        section_states = serialize_report_sections(data_dict)
+        if sections is not None:
+            section_states = {section: state for section, state in section_states.items() if section in sections}
+        
+        def write(conn):
+            c = conn.cursor()
+            
+            # Check if report with same name exists for this user
+            c.execute(REPORT_BY_NAME_SQL, (user_id, report_name))
+            existing_report = c.fetchone()
+            
+            if existing_report:
+                # Update existing report, writing only the sections that changed since the last save
+                report_id = existing_report[0]
+                changed = _save_report_sections(c, report_id, section_states, replace_all=sections is None)
+                if changed:
+                    c.execute('''
+                        UPDATE reports 
+                        SET church_name = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (church_name, report_id))
+                    _index_report_title(c, report_id, report_name, church_name)
+                message = "Report updated successfully!"
+            else:
+                # Create new report
+                reporting_year = f"{datetime.now().year}-{datetime.now().year + 1}"
+                completion_percentage = data_dict.get('completion_percentage', 0)
+                
+                # Content lives in report_sections; data_json is an empty placeholder
+                c.execute('''
+                    INSERT INTO reports (user_id, report_name, church_name, reporting_year, completion_percentage, data_json)
+                    VALUES (?, ?, ?, ?, ?, '{}')
+                ''', (user_id, report_name, church_name, reporting_year, completion_percentage))
+                
+                report_id = c.lastrowid
+                _save_report_sections(c, report_id, section_states, replace_all=True)
+                _index_report_title(c, report_id, report_name, church_name)
+                changed = True
+                message = "Report saved successfully!"
+            
+            # Fresh list row for the report list cache
+            report_row = c.execute(REPORT_ROW_SQL, (report_id,)).fetchone() if changed else None
+            return report_id, message, report_row
+        
+        report_id, message, report_row = run_write(write)
+        if report_row:
+            get_report_list_cache().upsert(user_id, _report_row_to_dict(report_row))
+        return report_id, message
+    except Exception as e:
+        return 0, f"Error saving report: {str(e)}"
+
+@PROFILER.timed()
+def load_report(report_id: int, user_id: int = None, sections: Optional[List[str]] = None) -> Optional[Dict]:
+    """Load report from database, optionally only the given sections"""
+    with db_read_transaction() as conn:
+        c = conn.cursor()
+        if user_id:
+            c.execute('SELECT id FROM reports WHERE id = ? AND user_id = ?', (report_id, user_id))
+        else:
+            c.execute('SELECT id FROM reports WHERE id = ?', (report_id,))
+        
+        if not c.fetchone():
+            return None
+        section_states = _read_section_states(c, report_id, sections)
+    
+    data = {}
+    for section_state in section_states.values():
+        data.update(section_state)
+    
+    # Convert dicts back to dataframes
+    return decode_frames(data)
+
+@PROFILER.timed()
+def load_report_metrics() -> pd.DataFrame:
+    """Summary metrics of every active report, one row per report"""
+    with db_connection() as conn:
+        return pd.read_sql_query(REPORT_METRICS_SQL, conn)
+
+def conference_rollup(metrics: pd.DataFrame, by: str = 'district') -> pd.DataFrame:
+    """Total report metrics per annual conference, or per district within each conference"""
+    if by == 'annual_conference':
+        levels = ['annual_conference']
+    elif by == 'district':
+        levels = ['annual_conference', 'district']
+    else:
+        raise ValueError(f"Unknown rollup level: {by}")
+    
+    metrics = metrics.assign(**{level: metrics[level].replace('', 'Unspecified') for level in levels})
+    aggregations = {'reports': ('id', 'size'), 'churches': ('church_name', 'nunique')}
+    aggregations.update({column: (column, 'sum') for column in METRIC_TOTAL_COLUMNS})
+    return metrics.groupby(levels, sort=True).agg(**aggregations).reset_index()
+
+def _fts_query(text: str) -> str:
+    """FTS5 query matching every word of free text, the last one as a prefix (type-ahead)"""
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+@PROFILER.timed()
+def search_reports(user_id: int, text: str, limit: int = REPORT_SEARCH_LIMIT) -> List[Dict]:
+    """Full-text search over a user's reports, best match first.
+    
+    Each result is a report list dict plus the best-matching 'section' (None for the
+    report name) and a 'snippet' with the matched words in bold.
+    """
+    query = _fts_query(text)
+    if not query:
+        return []
+    with db_connection() as conn:
+        rows = conn.execute(REPORT_SEARCH_SQL, (query, user_id, limit)).fetchall()
+    
+    results = []
+    for row in rows:
+        result = _report_row_to_dict(row[:8])
+        result['section'] = row[8]
+        result['snippet'] = row[9]
+        results.append(result)
+    return results
+
+@PROFILER.timed()
+def delete_report(report_id: int, user_id: int) -> Tuple[bool, str]:
+    """Soft delete (archive) a report. Returns (success, message)"""
+    try:
+        def write(conn):
+            c = conn.cursor()
+            c.execute('UPDATE reports SET is_archived = 1 WHERE id = ? AND user_id = ?', (report_id, user_id))
+            
+            # Pooled connections outlive this call, so total_changes would be cumulative
+            return c.rowcount
+        
+        rows_affected = run_write(write)
+        
+        if rows_affected > 0:
+            get_report_list_cache().remove(user_id, report_id)
+            return True, "Report deleted successfully!"
+        else:
+            return False, "Report not found or you don't have permission to delete it."
+    except Exception as e:
+        return False, f"Error deleting report: {str(e)}"
+
+def _owns_report(c: sqlite3.Cursor, report_id: int, user_id: Optional[int]) -> bool:
+    if user_id:
+        c.execute('SELECT 1 FROM reports WHERE id = ? AND user_id = ?', (report_id, user_id))
+    else:
+        c.execute('SELECT 1 FROM reports WHERE id = ?', (report_id,))
+    return c.fetchone() is not None
+
+@PROFILER.timed()
+def list_report_versions(report_id: int, user_id: int = None) -> List[Dict]:
+    """A report's versions, newest first: {'id', 'label', 'created_at', 'updated_at', 'changed_sections'}.
+    changed_sections lists the sections that differ from the previous version."""
+    with db_read_transaction() as conn:
+        c = conn.cursor()
+        if not _owns_report(c, report_id, user_id):
+            return []
+        c.execute('''
+            SELECT v.id, v.label, v.created_at, v.updated_at, s.section, s.content_hash
+            FROM report_versions v
+            LEFT JOIN report_version_sections s ON s.version_id = v.id
+            WHERE v.report_id = ?
+            ORDER BY v.id
+        ''', (report_id,))
+        rows = c.fetchall()
+    
+    versions, manifests = {}, {}
+    for version_id, label, created_at, updated_at, section, content_hash in rows:
+        versions.setdefault(version_id, {'id': version_id, 'label': label, 'created_at': created_at, 'updated_at': updated_at})
+        manifest = manifests.setdefault(version_id, {})
+        if section is not None:
+            manifest[section] = content_hash
+    
+    previous = {}
+    for version_id, version in versions.items():
+        manifest = manifests[version_id]
+        version['changed_sections'] = sorted(section for section in manifest.keys() | previous.keys()
+                                             if manifest.get(section) != previous.get(section))
+        previous = manifest
+    return list(reversed(versions.values()))
+
+@PROFILER.timed()
+def diff_report_versions(report_id: int, from_version: int, to_version: Optional[int] = None,
+                         user_id: int = None) -> Optional[Dict[str, List[Dict]]]:
+    """JSON-Patch from one version to another (default: the current report), per changed section.
+    Returns None when the report or a version is not found."""
+    with db_read_transaction() as conn:
+        c = conn.cursor()
+        if not _owns_report(c, report_id, user_id):
+            return None
+        manifests = {}
+        for version_id in [from_version, to_version]:
+            if version_id is None:
+                c.execute('SELECT section, content_hash FROM report_sections WHERE report_id = ?', (report_id,))
+            else:
+                c.execute('''
+                    SELECT s.section, s.content_hash FROM report_versions v
+                    JOIN report_version_sections s ON s.version_id = v.id
+                    WHERE v.id = ? AND v.report_id = ?
+                ''', (version_id, report_id))
+            manifests[version_id] = dict(c.fetchall())
+            if not manifests[version_id] and version_id is not None:
+                return None
+        
+        old, new = manifests[from_version], manifests[to_version]
+        changed = [section for section in old.keys() | new.keys() if old.get(section) != new.get(section)]
+        if not changed:
+            return {}
+        old_states = _read_version_states(c, from_version, changed)
+        new_states = (_read_section_states(c, report_id, changed) if to_version is None
+                      else _read_version_states(c, to_version, changed))
+    return {section: diff_json(old_states.get(section, {}), new_states.get(section, {})) for section in sorted(changed)}
+
+@PROFILER.timed()
+def restore_report_version(report_id: int, version_id: int, user_id: int = None) -> Tuple[bool, str]:
+    """Make a version the report's current content. The restore is itself recorded as a
+    new version, so it can be undone. Returns (success, message)"""
+    try:
+        def write(conn):
+            c = conn.cursor()
+            if not _owns_report(c, report_id, user_id):
+                return None
+            c.execute('SELECT 1 FROM report_versions WHERE id = ? AND report_id = ?', (version_id, report_id))
+            if not c.fetchone():
+                return None
+            
+            section_states = _read_version_states(c, version_id)
+            if _save_report_sections(c, report_id, section_states, replace_all=True,
+                                     version_label=f"Restored version {version_id}"):
+                c.execute('UPDATE reports SET updated_at = CURRENT_TIMESTAMP WHERE id = ?', (report_id,))
+            c.execute('SELECT user_id FROM reports WHERE id = ?', (report_id,))
+            return c.fetchone()[0], c.execute(REPORT_ROW_SQL, (report_id,)).fetchone()
+        
+        result = run_write(write)
+        if result is None:
+            return False, "Version not found or you don't have permission to restore it."
+        owner_id, report_row = result
+        get_report_list_cache().upsert(owner_id, _report_row_to_dict(report_row))
+        return True, f"Restored version {version_id}."
+    except Exception as e:
+        return False, f"Error restoring version: {str(e)}"
+
+# Bulk import: one 'reports' sheet with a row per report, plus one sheet per report
+# table whose rows are tied to their report by a report_name column
+IMPORT_SHEETS = {'reports': None, **{sheet: frame_key for frame_key, (sheet, _, _) in REPORT_TABLES.items()}}
+_IMPORT_SHEET_ALIASES = {'board_of_trustees': 'trustees',
+                         **{frame_key: sheet for sheet, frame_key in IMPORT_SHEETS.items() if frame_key}}
+IMPORT_REPORT_FIELDS = [key for section in ['church_info', 'kindergarten', 'workers', 'signatures']
+                        for key in REPORT_SECTIONS[section]] + ['audit']
+_IMPORT_NUMERIC_FIELDS = ['nursery_enrolled', 'kinder_enrolled', 'membership', 'completion_percentage']
+_IMPORT_NUMERIC_COLUMNS = {frame_key: [column for column, kind in columns.items() if kind == 'number']
+                           for frame_key, (_, columns, _) in REPORT_TABLES.items()}
+
+def _import_sheet_name(name: str) -> Optional[str]:
+    normalized = str(name).strip().lower().replace(' ', '_').replace('-', '_')
+    if normalized in IMPORT_SHEETS:
+        return normalized
+    return _IMPORT_SHEET_ALIASES.get(normalized)
+
+def _read_sheet_file(file, name: str) -> Dict[str, pd.DataFrame]:
+    """{sheet name: DataFrame} of one workbook, CSV or Parquet file, or of a zip of CSV or Parquet files"""
+    stem, extension = os.path.splitext(os.path.basename(name))
+    extension = extension.lower()
+    if extension in ('.xlsx', '.xlsm'):
+        try:
+            return pd.read_excel(file, sheet_name=None, dtype=object)
+        except ImportError as e:
+            raise ValueError(f"Excel import is unavailable: {e}")
+    if extension == '.csv':
+        return {stem: pd.read_csv(file, dtype=object)}
+    if extension == '.parquet':
+        if pyarrow is None:
+            raise ValueError("Parquet import needs the pyarrow package (pip install pyarrow)")
+        return {stem: pd.read_parquet(file).astype(object)}
+    if extension == '.zip':
+        # A CSV or Parquet export: one member per sheet
+        file_sheets = {}
+        try:
+            with zipfile.ZipFile(file) as archive:
+                for member in archive.namelist():
+                    if os.path.splitext(member)[1].lower() not in ('.csv', '.parquet'):
+                        raise ValueError(f"Unsupported file type: {member} in {name}")
+                    file_sheets.update(_read_sheet_file(io.BytesIO(archive.read(member)), member))
+        except zipfile.BadZipFile:
+            raise ValueError(f"Not a zip archive: {name}")
+        return file_sheets
+    raise ValueError(f"Unsupported file type: {name}")
+
+def read_import_files(files) -> Dict[str, pd.DataFrame]:
+    """Read Excel workbooks, CSV and Parquet files, or zips of them as written by
+    export_reports() (paths or uploaded files) into import sheets.
+    
+    Workbook sheets and files are matched to IMPORT_SHEETS by name; the same
+    sheet from several files is concatenated, so one workbook per church works too.
+    """
+    sheets = {}
+    for file in files:
+        file_sheets = _read_sheet_file(file, getattr(file, 'name', file))
+        for sheet_name, df in file_sheets.items():
+            sheet = _import_sheet_name(sheet_name)
+            if sheet:
+                sheets[sheet] = pd.concat([sheets[sheet], df], ignore_index=True) if sheet in sheets else df
+    return sheets
+
+def _clean_text(series: pd.Series) -> pd.Series:
+    return series.where(series.notna(), '').astype(str).str.strip()
+
+def _coerce_numeric(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Parse a column as numbers (commas allowed, blanks are 0). Returns (numbers, invalid mask)"""
+    text = _clean_text(series)
+    numbers = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce')
+    invalid = numbers.isna() & (text != '')
+    numbers = numbers.fillna(0)
+    if (numbers % 1 == 0).all():
+        numbers = numbers.astype('int64')
+    return numbers, invalid
+
+def _list_values(values, limit: int = 10) -> str:
+    values = list(dict.fromkeys(values))
+    return ', '.join(map(str, values[:limit])) + (f" and {len(values) - limit} more" if len(values) > limit else '')
+
+def prepare_import(sheets: Dict[str, pd.DataFrame]) -> Tuple[List[Dict], List[str]]:
+    """Validate import sheets as a whole and build one report per 'reports' row.
+    
+    Returns (reports, errors); each report is {'report_name', 'church_name',
+    'reporting_year', 'completion_percentage', 'data'}, with the tables in data
+    already encoded as by encode_frame. Nothing is returned when any check fails.
+    """
+    reports = sheets.get('reports')
+    if reports is None or 'report_name' not in reports.columns:
+        return [], ["A 'reports' sheet with a report_name column is required"]
+    
+    errors = []
+    reports = reports.reset_index(drop=True)
+    names = _clean_text(reports['report_name'])
+    if (names == '').any():
+        errors.append(f"reports: {(names == '').sum()} row(s) have no report_name")
+    duplicated = names[names.duplicated() & (names != '')]
+    if not duplicated.empty:
+        errors.append(f"reports: duplicate report_name {_list_values(duplicated)}")
+    
+    fields = {}
+    for field in IMPORT_REPORT_FIELDS + ['church_name', 'reporting_year', 'completion_percentage']:
+        if field not in reports.columns:
+            continue
+        if field in _IMPORT_NUMERIC_FIELDS:
+            fields[field], invalid = _coerce_numeric(reports[field])
+            if invalid.any():
+                errors.append(f"reports: {field} is not a number for {_list_values(names[invalid])}")
+        else:
+            fields[field] = _clean_text(reports[field])
+    
+    frames = {}
+    known_names = set(names)
+    for sheet, frame_key in IMPORT_SHEETS.items():
+        table = sheets.get(sheet)
+        if frame_key is None or table is None:
+            continue
+        if 'report_name' not in table.columns:
+            errors.append(f"{sheet}: a report_name column is required")
+            continue
+        table = table.reset_index(drop=True)
+        table_names = _clean_text(table.pop('report_name'))
+        unknown = table_names[~table_names.isin(known_names)]
+        if not unknown.empty:
+            errors.append(f"{sheet}: rows for reports not in the reports sheet: {_list_values(unknown)}")
+        
+        for column in table.columns:
+            if column in _IMPORT_NUMERIC_COLUMNS.get(frame_key, []):
+                table[column], invalid = _coerce_numeric(table[column])
+                if invalid.any():
+                    errors.append(f"{sheet}: {column} is not a number for {_list_values(table_names[invalid])}")
+            else:
+                table[column] = _clean_text(table[column])
+        
+        # Encode every report's rows straight from the sheet's columns, without a DataFrame per report
+        columns = [str(column) for column in table.columns]
+        dtypes = [str(dtype) for dtype in table.dtypes]
+        column_values = [table[column].tolist() for column in table.columns]
+        frames[frame_key] = {
+            name: {'__frame__': 1, 'columns': columns, 'dtypes': dtypes, 'index': None,
+                   'data': [[values[position] for position in positions] for values in column_values]}
+            for name, positions in table.groupby(table_names, sort=False).indices.items()
+        }
+    
+    if errors:
+        return [], errors
+    
+    default_year = f"{datetime.now().year}-{datetime.now().year + 1}"
+    prepared = []
+    for report_name, data in zip(names, pd.DataFrame(fields, index=reports.index).to_dict('records')):
+        reporting_year = data.pop('reporting_year', default_year)
+        completion_percentage = data.pop('completion_percentage', 0)
+        for frame_key, groups in frames.items():
+            if report_name in groups:
+                data[frame_key] = groups[report_name]
+        prepared.append({
+            'report_name': report_name,
+            'church_name': data.get('church_name', ''),
+            'reporting_year': reporting_year,
+            'completion_percentage': completion_percentage,
+            'data': data
+        })
+    return prepared, []
+
+@PROFILER.timed()
+def import_reports(user_id: int, sheets: Dict[str, pd.DataFrame]) -> Tuple[int, List[str]]:
+    """Import reports for a user in one transaction. Returns (reports imported, errors).
+    
+    Like save_report, a report whose name the user already has is updated in
+    place; new reports and their sections, search rows and metrics are inserted
+    in batches.
+    """
+    reports, errors = prepare_import(sheets)
+    if errors:
+        return 0, errors
+    
+    try:
+        prepared = [(report, serialize_report_sections(report['data'])) for report in reports]
+        
+        def write(conn):
+            c = conn.cursor()
+            c.execute('SELECT report_name, id FROM reports WHERE user_id = ?', (user_id,))
+            existing = dict(c.fetchall())
+            
+            new_reports = []
+            for report, section_states in prepared:
+                report_id = existing.get(report['report_name'])
+                if report_id is None:
+                    new_reports.append((report, section_states))
+                elif _save_report_sections(c, report_id, section_states, replace_all=True, version_label="Imported"):
+                    c.execute('UPDATE reports SET church_name = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                              (report['church_name'], report_id))
+                    _index_report_title(c, report_id, report['report_name'], report['church_name'])
+            
+            c.executemany('''
+                INSERT INTO reports (user_id, report_name, church_name, reporting_year, completion_percentage, data_json)
+                VALUES (?, ?, ?, ?, ?, '{}')
+            ''', [(user_id, report['report_name'], report['church_name'], report['reporting_year'],
+                   report['completion_percentage']) for report, _ in new_reports])
+            c.execute('SELECT report_name, id FROM reports WHERE user_id = ?', (user_id,))
+            report_ids = dict(c.fetchall())
+            
+            section_rows, search_rows, metric_rows = [], [], []
+            for report, section_states in new_reports:
+                report_id = report_ids[report['report_name']]
+                search_rows.append(_search_title_row(report_id, report['report_name'], report['church_name']))
+                for section, section_state in section_states.items():
+                    section_rows.append((report_id, section, encode_report_payload(json.dumps(section_state)),
+                                         _section_hash(section_state)))
+                    search_row = _search_section_row(report_id, section, section_state)
+                    if search_row:
+                        search_rows.append(search_row)
+                metrics = {**_METRIC_DEFAULTS, **_metric_values(section_states)}
+                metric_rows.append((report_id, *metrics.values()))
+            
+            c.executemany('''
+                INSERT INTO report_sections (report_id, section, payload, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', section_rows)
+            c.executemany(_SEARCH_INSERT_SQL, search_rows)
+            c.executemany(f'''
+                INSERT INTO report_metrics (report_id, {', '.join(_METRIC_DEFAULTS)})
+                VALUES (?, {', '.join('?' * len(_METRIC_DEFAULTS))})
+            ''', metric_rows)
+            
+            # First version of each new report; the write lock makes the new version ids the ones above last_version
+            last_version = c.execute('SELECT COALESCE(MAX(id), 0) FROM report_versions').fetchone()[0]
+            c.executemany("INSERT INTO report_versions (report_id, label) VALUES (?, 'Imported')",
+                          [(report_ids[report['report_name']],) for report, _ in new_reports])
+            version_ids = {report_id: version_id for version_id, report_id in
+                           c.execute('SELECT id, report_id FROM report_versions WHERE id > ?', (last_version,))}
+            c.executemany('INSERT OR IGNORE INTO section_blobs (content_hash, payload) VALUES (?, ?)',
+                          [(content_hash, payload) for _, _, payload, content_hash in section_rows])
+            c.executemany('INSERT INTO report_version_sections (version_id, section, content_hash) VALUES (?, ?, ?)',
+                          [(version_ids[report_id], section, content_hash)
+                           for report_id, section, _, content_hash in section_rows])
+            return len(prepared)
+        
+        count = run_write(write)
+        get_report_list_cache().invalidate(user_id)
+        return count, []
+    except Exception as e:
+        return 0, [f"Error importing reports: {str(e)}"]
+
+# Bulk export: the import layout (a 'reports' sheet plus one sheet per report table),
+# so an export can be imported again
+EXPORT_REPORT_COLUMNS = ['report_name', 'owner', 'reporting_year', 'completion_percentage', 'updated_at'] + IMPORT_REPORT_FIELDS
+_EXPORT_NUMERIC_REPORT_COLUMNS = set(_IMPORT_NUMERIC_FIELDS)
+
+def _frame_columns(encoded) -> Tuple[List[str], List[List]]:
+    """(column names, column values) of a serialized frame, columnar or legacy to_dict()"""
+    if not isinstance(encoded, dict):
+        return [], []
+    if '__frame__' in encoded:
+        return encoded['columns'], encoded['data']
+    return [str(column) for column in encoded], [list(values.values()) for values in encoded.values()]
+
+def _export_value(value, numeric: bool):
+    if numeric:
+        return None if value is None or value == '' else _to_number(value)
+    if value is None or isinstance(value, str):
+        return value or ''
+    return json.dumps(value) if isinstance(value, (list, dict)) else str(value)
+
+class _ZipExportWriter:
+    """Writes each sheet to a temporary file, then packs them into one zip archive"""
+    
+    def __init__(self, target):
+        self.target = target
+        self._files = {}
+    
+    def close(self):
+        with zipfile.ZipFile(self.target, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for sheet, file in self._files.items():
+                self._finish(sheet)
+                file.seek(0)
+                with archive.open(sheet + self.member_extension, 'w') as member:
+                    shutil.copyfileobj(file, member)
+                file.close()
+    
+    def _finish(self, sheet: str):
+        pass
+
+class _CsvExportWriter(_ZipExportWriter):
+    extension, member_extension, mime = '.zip', '.csv', 'application/zip'
+    available = True
+    
+    def __init__(self, target):
+        super().__init__(target)
+        self._text = {}
+        self._writers = {}
+    
+    def add_sheet(self, sheet: str, header: List[str], numeric: set):
+        self._files[sheet] = tempfile.TemporaryFile()
+        self._text[sheet] = io.TextIOWrapper(self._files[sheet], encoding='utf-8', newline='')
+        self._writers[sheet] = csv.writer(self._text[sheet])
+        self._writers[sheet].writerow(header)
+    
+    def write_rows(self, sheet: str, rows: List[List]):
+        self._writers[sheet].writerows(rows)
+    
+    def _finish(self, sheet: str):
+        self._text[sheet].flush()
+        self._text[sheet].detach()
+
+class _ParquetExportWriter(_ZipExportWriter):
+    extension, member_extension, mime = '.zip', '.parquet', 'application/zip'
+    available = pyarrow is not None
+    
+    def __init__(self, target):
+        if pyarrow is None:
+            raise ValueError("Parquet export needs the pyarrow package (pip install pyarrow)")
+        super().__init__(target)
+        self._writers = {}
+    
+    def add_sheet(self, sheet: str, header: List[str], numeric: set):
+        schema = pyarrow.schema([(column, pyarrow.float64() if column in numeric else pyarrow.string()) for column in header])
+        self._files[sheet] = tempfile.TemporaryFile()
+        self._writers[sheet] = pyarrow.parquet.ParquetWriter(self._files[sheet], schema)
+    
+    def write_rows(self, sheet: str, rows: List[List]):
+        writer = self._writers[sheet]
+        # Each batch becomes one row group
+        writer.write_table(pyarrow.Table.from_pylist(
+            [dict(zip(writer.schema.names, row)) for row in rows], schema=writer.schema))
+    
+    def _finish(self, sheet: str):
+        self._writers[sheet].close()
+
+class _XlsxExportWriter:
+    extension, mime = '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    available = openpyxl is not None
+    
+    def __init__(self, target):
+        if openpyxl is None:
+            raise ValueError("XLSX export needs the openpyxl package (pip install openpyxl)")
+        self.target = target
+        # Write-only worksheets stream rows to disk instead of keeping them in memory
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheets = {}
+    
+    def add_sheet(self, sheet: str, header: List[str], numeric: set):
+        self._sheets[sheet] = self._workbook.create_sheet(title=sheet[:31])
+        self._sheets[sheet].append(header)
+    
+    def write_rows(self, sheet: str, rows: List[List]):
+        for row in rows:
+            self._sheets[sheet].append(row)
+    
+    def close(self):
+        self._workbook.save(self.target)
+
+EXPORT_FORMATS = {
+    'xlsx': _XlsxExportWriter,
+    'parquet': _ParquetExportWriter,
+    'csv': _CsvExportWriter,
+}
+
+def _iter_export_batches(conn: sqlite3.Connection, query: str, params: List, sections: Optional[List[str]]):
+    """Yield [(report row, merged state)] a batch at a time, streaming report rows from a cursor"""
+    reports = conn.execute(query, params)
+    while True:
+        rows = reports.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            return
+        states = _read_report_states(conn.cursor(), [row[0] for row in rows], sections)
+        yield [(row, {key: value for section_state in states.get(row[0], {}).values() for key, value in section_state.items()})
+               for row in rows]
+
+@PROFILER.timed()
+def export_reports(target, export_format: str = 'xlsx', user_id: int = None, annual_conference: str = None,
+                   district: str = None, reporting_year: str = None) -> int:
+    """Export active reports, optionally filtered, to a binary file or path. Returns the report count.
+    
+    Reports are read in batches of EXPORT_BATCH_SIZE and written as they are
+    decoded, so memory stays bounded however many reports there are. A first
+    pass over the table sections collects each sheet's columns.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    writer = EXPORT_FORMATS[export_format](target)
+    
+    query = '''
+        SELECT r.id, r.report_name, u.username, r.reporting_year, r.completion_percentage, r.updated_at
+        FROM reports r
+        LEFT JOIN users u ON u.id = r.user_id
+        LEFT JOIN report_metrics m ON m.report_id = r.id
+        WHERE r.is_archived = 0
+    '''
+    params = []
+    for column, value in [('r.user_id', user_id), ('m.annual_conference', annual_conference),
+                          ('m.district', district), ('r.reporting_year', reporting_year)]:
+        if value is not None:
+            query += f' AND {column} = ?'
+            params.append(value)
+    query += ' ORDER BY r.id'
+    
+    frame_sheets = {frame_key: sheet for sheet, frame_key in IMPORT_SHEETS.items() if frame_key}
+    with db_read_transaction() as conn:
+        # Standard columns first, then any other columns imported reports brought along
+        table_columns = {frame_key: dict.fromkeys(REPORT_TABLES[frame_key][1]) for frame_key in frame_sheets}
+        table_sections = sorted({_SECTION_BY_KEY[frame_key] for frame_key in frame_sheets})
+        for batch in _iter_export_batches(conn, query, params, table_sections):
+            for _, state in batch:
+                for frame_key, columns in table_columns.items():
+                    columns.update(dict.fromkeys(_frame_columns(state.get(frame_key))[0]))
+        
+        writer.add_sheet('reports', EXPORT_REPORT_COLUMNS, _EXPORT_NUMERIC_REPORT_COLUMNS)
+        for frame_key, columns in table_columns.items():
+            if columns:
+                writer.add_sheet(frame_sheets[frame_key], ['report_name'] + list(columns), set(_IMPORT_NUMERIC_COLUMNS[frame_key]))
+        
+        count = 0
+        for batch in _iter_export_batches(conn, query, params, None):
+            report_rows = []
+            table_rows = {frame_key: [] for frame_key, columns in table_columns.items() if columns}
+            for (report_id, report_name, owner, year, completion, updated_at), state in batch:
+                values = {'report_name': report_name, 'owner': owner, 'reporting_year': year,
+                          'completion_percentage': completion, 'updated_at': updated_at}
+                report_rows.append([_export_value(values[column] if column in values else state.get(column),
+                                                  column in _EXPORT_NUMERIC_REPORT_COLUMNS)
+                                    for column in EXPORT_REPORT_COLUMNS])
+                
+                for frame_key, rows in table_rows.items():
+                    columns, data = _frame_columns(state.get(frame_key))
+                    numeric = _IMPORT_NUMERIC_COLUMNS[frame_key]
+                    positions = [(columns.index(column) if column in columns else None, column in numeric)
+                                 for column in table_columns[frame_key]]
+                    for row in range(len(data[0]) if data else 0):
+                        rows.append([report_name] + [None if position is None else _export_value(data[position][row], is_numeric)
+                                                     for position, is_numeric in positions])
+            
+            writer.write_rows('reports', report_rows)
+            for frame_key, rows in table_rows.items():
+                if rows:
+                    writer.write_rows(frame_sheets[frame_key], rows)
+            count += len(batch)
+    
+    writer.close()
+    return count
+
+# Session state keys that feed the export; anything else cannot change its content
+EXPORT_STATE_KEYS = [
+    'current_year', 'completion_status',
+    'church_name', 'district', 'annual_conference', 'pastor_name', 'council_chairperson',
+    'vision', 'mission', 'core_values',
+    'strategic_df', 'lay_df', 'trustee_df', 'leadership_df', 'appendix_df',
+    'nursery_enrolled', 'kinder_enrolled', 'membership', 'audit',
+    'council_signature', 'pastor_signature', 'secretary_signature'
+]
+
+def report_content_hash(state: Dict) -> str:
+    """Stable content hash of a report state snapshot"""
+    digest = hashlib.sha256()
+    for key in sorted(state):
+        value = state[key]
+        digest.update(key.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(json.dumps([str(col) for col in value.columns]).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        else:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def build_report_document(state: Dict) -> Dict:
+    """Lay out a report state as an ordered document that every renderer draws from.
+    
+    Sections are (title, blocks); a block is ('fields', [(label, value)]),
+    ('heading', text) or ('table', DataFrame).
+    """
+    # Calculate completion percentage
+    completed_sections = sum(state['completion_status'].values())
+    total_sections = len(state['completion_status'])
+    completion_percentage = (completed_sections / total_sections) * 100
+    # A report that never had a table shows the blank one
+    tables = {**get_default_frames(), **{key: state[key] for key in REPORT_TABLES if key in state}}
+    
+    return {
+        'title': "CHURCH ANNUAL REPORT",
+        'meta': [
+            ("Generated", datetime.now().strftime('%B %d, %Y at %I:%M %p')),
+            ("Reporting Year", f"{state['current_year']}-{state['current_year'] + 1}"),
+            ("Church", state.get('church_name', 'Not Provided')),
+            ("Completion Status", f"{completion_percentage:.1f}%"),
+        ],
+        'sections': [
+            ("1. CHURCH BASIC INFORMATION", [
+                ('fields', [
+                    ("Church Name", state.get('church_name', 'Not Provided')),
+                    ("District", state.get('district', 'Not Provided')),
+                    ("Annual Conference", state.get('annual_conference', 'Not Provided')),
+                    ("Pastor", state.get('pastor_name', 'Not Provided')),
+                    ("Council Chairperson", state.get('council_chairperson', 'Not Provided')),
+                ]),
+                ('heading', "Vision, Mission & Core Values:"),
+                ('fields', [
+                    ("Vision", state.get('vision', 'Not Provided')),
+                    ("Mission", state.get('mission', 'Not Provided')),
+                    ("Core Values", state.get('core_values', 'Not Provided')),
+                ]),
+            ]),
+            ("2. CHURCH COUNCIL CHAIRPERSON REPORT", [('table', tables['strategic_df'])]),
+            ("3. LAY ORGANIZATIONS CONSOLIDATED REPORT", [('table', tables['lay_df'])]),
+            ("4. BOARD OF TRUSTEES REPORT", [('table', tables['trustee_df'])]),
+            ("5. KINDERGARTEN COMMITTEE REPORT", [
+                ('fields', [
+                    ("Nursery Enrollment", state.get('nursery_enrolled', 0)),
+                    ("Kindergarten Enrollment", state.get('kinder_enrolled', 0)),
+                ]),
+            ]),
+            ("6. CHURCH WORKERS REPORT", [('fields', [("Total Church Membership", state.get('membership', 0))])]),
+            ("7. LEADERSHIP 2026-2027", [('table', tables['leadership_df'])]),
+            ("8. APPENDICES", [
+                ('table', tables['appendix_df']),
+                ('fields', [("Audit Completed", state.get('audit', 'No'))]),
+            ]),
+            ("SIGNATURES", [
+                ('fields', [
+                    ("Church Council Chairperson", state.get('council_signature', '')),
+                    ("Administrative Pastor", state.get('pastor_signature', '')),
+                    ("Secretary", state.get('secretary_signature', '')),
+                ]),
+            ]),
+        ],
+        'completion_percentage': completion_percentage,
+    }
+
+def _render_txt(document: Dict) -> bytes:
+    """Fixed-width plain text"""
+    report_content = ["=" * 80, document['title'], "=" * 80]
+    for position, (label, value) in enumerate(document['meta']):
+        blank_line = '\n' if position == 0 else ''
+        report_content.append(f"{blank_line}{label}: {value}")
+    report_content.append("\n" + "=" * 80)
+    
+    for position, (title, blocks) in enumerate(document['sections']):
+        if position > 0:
+            report_content.append("\n" + "=" * 80)
+        report_content.append(f"\n{title}")
+        report_content.append("-" * 40)
+        previous_kind = None
+        for kind, content in blocks:
+            if kind == 'heading':
+                report_content.append(f"\n{content}")
+            elif kind == 'table':
+                report_content.append(content.to_string(index=False))
+            else:
+                for field_position, (label, value) in enumerate(content):
+                    blank_line = '\n' if previous_kind == 'table' and field_position == 0 else ''
+                    report_content.append(f"{blank_line}{label}: {value}")
+            previous_kind = kind
+    
+    report_content.append("\n" + "=" * 80)
+    report_content.append(f"\nREPORT COMPLETION: {document['completion_percentage']:.1f}%")
+    report_content.append("=" * 80)
+    return "\n".join(report_content).encode()
+
+def _table_rows(df: pd.DataFrame) -> List[List]:
+    """DataFrame cells as Python values, with missing values as None"""
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+def _render_xlsx(document: Dict) -> bytes:
+    """Workbook with a Report sheet for the fields and one formatted sheet per table"""
+    bold = openpyxl.styles.Font(bold=True)
+    header_fill = openpyxl.styles.PatternFill('solid', fgColor='E5E7EB')
+    wrap = openpyxl.styles.Alignment(wrap_text=True, vertical='top')
+    
+    workbook = openpyxl.Workbook()
+    summary = workbook.active
+    summary.title = "Report"
+    summary.append([document['title']])
+    summary['A1'].font = openpyxl.styles.Font(bold=True, size=14)
+    for label, value in document['meta']:
+        summary.append([label, value])
+        summary.cell(summary.max_row, 1).font = bold
+    
+    for title, blocks in document['sections']:
+        summary.append([])
+        summary.append([title])
+        summary.cell(summary.max_row, 1).font = openpyxl.styles.Font(bold=True, size=12)
+        for kind, content in blocks:
+            if kind == 'heading':
+                summary.append([content])
+                summary.cell(summary.max_row, 1).font = bold
+            elif kind == 'fields':
+                for label, value in content:
+                    summary.append([label, value])
+                    summary.cell(summary.max_row, 1).font = bold
+                    summary.cell(summary.max_row, 2).alignment = wrap
+            else:
+                # e.g. "4. BOARD OF TRUSTEES REPORT" -> "Board of Trustees"
+                sheet_title = title.split('. ', 1)[-1].replace(' CONSOLIDATED', '').replace(' REPORT', '')
+                sheet_title = sheet_title.title().replace(' Of ', ' of ')
+                for character in '[]:*?/\\':
+                    sheet_title = sheet_title.replace(character, ' ')
+                sheet = workbook.create_sheet(sheet_title[:31])
+                summary.append([f"See the '{sheet.title}' sheet"])
+                
+                sheet.append([str(column) for column in content.columns])
+                for cell in sheet[1]:
+                    cell.font = bold
+                    cell.fill = header_fill
+                for row in _table_rows(content):
+                    sheet.append(row)
+                for position, column in enumerate(content.columns, start=1):
+                    letter = openpyxl.utils.get_column_letter(position)
+                    width = max([len(str(column))] + [len(str(value)) for value in content[column] if value is not None])
+                    sheet.column_dimensions[letter].width = min(width + 2, 50)
+                    if pd.api.types.is_numeric_dtype(content[column]):
+                        for (cell,) in sheet.iter_rows(min_row=2, min_col=position, max_col=position):
+                            cell.number_format = '#,##0.00'
+                    else:
+                        for (cell,) in sheet.iter_rows(min_row=2, min_col=position, max_col=position):
+                            cell.alignment = wrap
+                sheet.freeze_panes = 'A2'
     
-    c.execute('''
-        SELECT id, report_name, church_name, reporting_year, 
-               completion_percentage, created_at, updated_at, is_archived
-        FROM reports 
-        WHERE user_id = ? AND is_archived = 0
-        ORDER BY updated_at DESC
-    ''', (user_id,))
-    
-    reports = []
-    for row in c.fetchall():
-        reports.append({
-            'id': row[0],
-            'report_name': row[1],
-            'church_name': row[2],
-            'reporting_year': row[3],
-            'completion_percentage': row[4],
-            'created_at': row[5],
-            'updated_at': row[6],
-            'is_archived': row[7]
-        })
+    summary.append([])
+    summary.append(["REPORT COMPLETION", f"{document['completion_percentage']:.1f}%"])
+    summary.cell(summary.max_row, 1).font = bold
+    summary.column_dimensions['A'].width = 30
+    summary.column_dimensions['B'].width = 80
     
-    conn.close()
-    return reports
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
 
-def save_report(user_id: int, report_name: str, church_name: str, data_dict: Dict) -> Tuple[int, str]:
-    """Save report to database and return (report_id, message)"""
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard font metrics
+_HELVETICA_WIDTHS = dict(zip(map(chr, range(32, 127)), [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]))
+
+def _pdf_text(value) -> str:
+    """Text limited to what the built-in fonts can show (WinAnsi)"""
+    text = '' if value is None else str(value)
+    return text.replace('₱', 'PHP').encode('cp1252', 'replace').decode('cp1252')
+
+def _pdf_text_width(text: str, size: float, bold: bool = False) -> float:
+    # Bold glyphs are a little wider; the margin keeps wrapped lines inside their box
+    return sum(_HELVETICA_WIDTHS.get(character, 556) for character in text) * size / 1000 * (1.1 if bold else 1)
+
+def _wrap_pdf_text(text: str, width: float, size: float, bold: bool = False) -> List[str]:
+    lines = []
+    for paragraph in _pdf_text(text).split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f"{line} {word}" if line else word
+            if _pdf_text_width(candidate, size, bold) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A word wider than the box is broken across lines
+            while _pdf_text_width(word, size, bold) > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and _pdf_text_width(word[:cut], size, bold) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+class _PdfDocument:
+    """Minimal PDF writer: A4 pages of Helvetica text, lines and boxes"""
+    
+    PAGE_WIDTH, PAGE_HEIGHT, MARGIN = 595, 842, 50
+    
+    def __init__(self):
+        self.pages = []
+        self.new_page()
+    
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = self.PAGE_HEIGHT - self.MARGIN
+    
+    def ensure_space(self, height: float):
+        if self.y - height < self.MARGIN:
+            self.new_page()
+    
+    def text(self, x: float, y: float, text: str, size: float, bold: bool = False):
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        self.ops.append(f"BT /{'F2' if bold else 'F1'} {size} Tf {x:.2f} {y:.2f} Td ({escaped}) Tj ET")
+    
+    def box(self, x: float, y: float, width: float, height: float, fill: Optional[float] = None):
+        if fill is not None:
+            self.ops.append(f"{fill} g {x:.2f} {y:.2f} {width:.2f} {height:.2f} re f 0 g")
+        self.ops.append(f"0.5 w {x:.2f} {y:.2f} {width:.2f} {height:.2f} re S")
+    
+    def to_bytes(self) -> bytes:
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+                ' '.join(f"{5 + 2 * page} 0 R" for page in range(len(self.pages))), len(self.pages))).encode(),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        for page, ops in enumerate(self.pages):
+            objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {6 + 2 * page} 0 R >>").encode())
+            stream = zlib.compress('\n'.join(ops).encode('cp1252', 'replace'))
+            objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
         
-        # Convert dataframes to dict for JSON serialization
-        serializable_data = {}
-        for key, value in data_dict.items():
-            if isinstance(value, pd.DataFrame):
-                serializable_data[key] = value.to_dict()
-            else:
-                serializable_data[key] = value
+        output = io.BytesIO()
+        output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(output.tell())
+            output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = output.tell()
+        output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        output.write(b''.join(b"%010d 00000 n \n" % offset for offset in offsets))
+        output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+        return output.getvalue()
+
+def _render_pdf(document: Dict) -> bytes:
+    """Paginated A4 report; tables repeat their header row on each page"""
+    pdf = _PdfDocument()
+    left, width = pdf.MARGIN, pdf.PAGE_WIDTH - 2 * pdf.MARGIN
+    label_width = 150
+    
+    def paragraph(text, size, bold=False, space_before=0):
+        pdf.y -= space_before
+        for line in _wrap_pdf_text(text, width, size, bold):
+            pdf.ensure_space(size * 1.4)
+            pdf.y -= size * 1.4
+            pdf.text(left, pdf.y, line, size, bold)
+    
+    def fields(pairs):
+        for label, value in pairs:
+            label_lines = _wrap_pdf_text(label, label_width - 10, 10, bold=True)
+            value_lines = _wrap_pdf_text(value, width - label_width, 10)
+            line_count = max(len(label_lines), len(value_lines))
+            # A field that fits on a page is kept together; a longer one flows on to the next pages
+            if 14 * line_count <= pdf.PAGE_HEIGHT - 2 * pdf.MARGIN:
+                pdf.ensure_space(14 * line_count)
+            for position in range(line_count):
+                pdf.ensure_space(14)
+                pdf.y -= 14
+                if position < len(label_lines):
+                    pdf.text(left, pdf.y, label_lines[position], 10, bold=True)
+                if position < len(value_lines):
+                    pdf.text(left + label_width, pdf.y, value_lines[position], 10)
+    
+    def table(df):
+        size, leading, padding = 8, 10, 3
+        columns = [_pdf_text(column) for column in df.columns]
+        rows = [['' if value is None else f"{value:,.2f}" if isinstance(value, float) else _pdf_text(value) for value in row]
+                for row in _table_rows(df)]
+        if not columns:
+            return
         
-        data_json = json.dumps(serializable_data)
+        # Columns get their natural width, scaled down to the page when they do not fit
+        natural = [max([_pdf_text_width(column, size, bold=True)] + [_pdf_text_width(row[position], size) for row in rows])
+                   + 2 * padding for position, column in enumerate(columns)]
+        widths = [max(min(natural_width, width / 2), 40) for natural_width in natural]
+        scale = min(1, width / sum(widths))
+        widths = [column_width * scale for column_width in widths]
         
-        # Check if report with same name exists for this user
-        c.execute('SELECT id FROM reports WHERE user_id = ? AND report_name = ?', (user_id, report_name))
-        existing_report = c.fetchone()
+        page_lines = int((pdf.PAGE_HEIGHT - 2 * pdf.MARGIN - 2 * padding) // leading)
         
-        if existing_report:
-            # Update existing report
-            c.execute('''
-                UPDATE reports 
-                SET church_name = ?, data_json = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (church_name, data_json, existing_report[0]))
-            report_id = existing_report[0]
-            message = "Report updated successfully!"
-        else:
-            # Create new report
-            reporting_year = f"{datetime.now().year}-{datetime.now().year + 1}"
-            completion_percentage = data_dict.get('completion_percentage', 0)
-            
-            c.execute('''
-                INSERT INTO reports (user_id, report_name, church_name, reporting_year, completion_percentage, data_json)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, report_name, church_name, reporting_year, completion_percentage, data_json))
-            
-            report_id = c.lastrowid
-            message = "Report saved successfully!"
+        def draw_row(cells, bold=False, fill=None, repeat_header=False):
+            """Draw a row at pdf.y. A row that fits on a page is moved to the next page whole
+            when it does not fit here; a taller one is split across pages."""
+            wrapped = [_wrap_pdf_text(cell, column_width - 2 * padding, size, bold) for cell, column_width in zip(cells, widths)]
+            line_count = max(len(lines) for lines in wrapped)
+            start, fresh_page = 0, False
+            while start < line_count:
+                fit = int((pdf.y - pdf.MARGIN - 2 * padding) // leading)
+                if fit < min(line_count - start, page_lines) and not fresh_page:
+                    pdf.new_page()
+                    if repeat_header:
+                        draw_row(columns, bold=True, fill=0.9)
+                    fresh_page = True
+                    continue
+                chunk = max(1, min(line_count - start, fit))
+                height = chunk * leading + 2 * padding
+                x = left
+                for lines, column_width in zip(wrapped, widths):
+                    pdf.box(x, pdf.y - height, column_width, height, fill)
+                    for position, line in enumerate(lines[start:start + chunk]):
+                        pdf.text(x + padding, pdf.y - padding - leading * (position + 1) + 2, line, size, bold)
+                    x += column_width
+                pdf.y -= height
+                start, fresh_page = start + chunk, False
         
-        conn.commit()
-        conn.close()
-        return report_id, message
-    except Exception as e:
-        return 0, f"Error saving report: {str(e)}"
+        pdf.ensure_space(2 * (leading + 2 * padding))
+        draw_row(columns, bold=True, fill=0.9)
+        for row in rows:
+            draw_row(row, repeat_header=True)
+    
+    paragraph(document['title'], 18, bold=True)
+    pdf.y -= 8
+    fields(document['meta'])
+    for title, blocks in document['sections']:
+        pdf.ensure_space(60)
+        paragraph(title, 13, bold=True, space_before=18)
+        pdf.y -= 6
+        for kind, content in blocks:
+            if kind == 'heading':
+                paragraph(content, 11, bold=True, space_before=6)
+            elif kind == 'fields':
+                pdf.y -= 4
+                fields(content)
+            else:
+                table(content)
+    paragraph(f"REPORT COMPLETION: {document['completion_percentage']:.1f}%", 12, bold=True, space_before=18)
+    return pdf.to_bytes()
 
-def load_report(report_id: int, user_id: int = None) -> Optional[Dict]:
-    """Load report from database"""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
+# Export renderers: format -> (file extension, MIME type, render(document) -> bytes)
+REPORT_RENDERERS = {
+    'txt': ('.txt', 'text/plain', _render_txt),
+    'pdf': ('.pdf', 'application/pdf', _render_pdf),
+}
+if openpyxl:
+    REPORT_RENDERERS['xlsx'] = ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', _render_xlsx)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _render_downloadable_report(content_hash: str, export_format: str, _state: Dict) -> bytes:
+    """Render a state snapshot; cached by (content_hash, export_format) only"""
+    return REPORT_RENDERERS[export_format][2](build_report_document(_state))
+
+class TemplateCache:
+    """Process-wide cache of the template catalog and parsed templates.
     
-    if user_id:
-        c.execute('SELECT data_json FROM reports WHERE id = ? AND user_id = ?', (report_id, user_id))
-    else:
-        c.execute('SELECT data_json FROM reports WHERE id = ?', (report_id,))
+    Every template write bumps the version; a load that started under an older
+    version is returned but not cached, so a stale read never sticks.
+    """
     
-    result = c.fetchone()
-    conn.close()
+    def __init__(self, max_templates: int = TEMPLATE_CACHE_SIZE):
+        self.max_templates = max_templates
+        self.version = 0
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._templates = OrderedDict()
     
-    if result:
-        data = json.loads(result[0])
-        
-        # Convert dicts back to dataframes
-        for key in ['strategic_df', 'lay_df', 'trustee_df', 'leadership_df', 'appendix_df']:
-            if key in data and isinstance(data[key], dict):
-                data[key] = pd.DataFrame(data[key])
-        
-        return data
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._catalog = None
+            self._templates.clear()
     
-    return None
+    def catalog(self, loader) -> List[Dict]:
+        with self._lock:
+            if self._catalog is not None:
+                return self._catalog
+            version = self.version
+        catalog = loader()
+        with self._lock:
+            if version == self.version:
+                self._catalog = catalog
+        return catalog
+    
+    def template(self, template_id: int, loader) -> Optional[Dict]:
+        with self._lock:
+            if template_id in self._templates:
+                self._templates.move_to_end(template_id)
+                return self._templates[template_id]
+            version = self.version
+        data = loader(template_id)
+        with self._lock:
+            if data is not None and version == self.version:
+                self._templates[template_id] = data
+                if len(self._templates) > self.max_templates:
+                    self._templates.popitem(last=False)
+        return data
 
-def delete_report(report_id: int, user_id: int) -> Tuple[bool, str]:
-    """Soft delete (archive) a report. Returns (success, message)"""
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        
-        c.execute('UPDATE reports SET is_archived = 1 WHERE id = ? AND user_id = ?', (report_id, user_id))
-        
-        rows_affected = conn.total_changes
-        conn.commit()
-        conn.close()
-        
-        if rows_affected > 0:
-            return True, "Report deleted successfully!"
-        else:
-            return False, "Report not found or you don't have permission to delete it."
-    except Exception as e:
-        return False, f"Error deleting report: {str(e)}"
+@st.cache_resource(show_spinner=False)
+def get_template_cache() -> TemplateCache:
+    """Process-wide template cache shared by all sessions"""
+    return TemplateCache()
 
-def get_templates() -> List[Dict]:
-    """Get available templates"""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT id, name, description, created_by, created_at 
-        FROM templates 
-        WHERE is_public = 1
-        ORDER BY name
-    ''')
+def _share_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a cached DataFrame: lazy under pandas copy-on-write, a real copy otherwise"""
+    copy_on_write = int(pd.__version__.split('.')[0]) >= 3 or pd.options.mode.copy_on_write is True
+    return df.copy(deep=not copy_on_write)
+
+def _query_templates() -> List[Dict]:
+    with db_connection() as conn:
+        c = conn.cursor()
+        c.execute(PUBLIC_TEMPLATES_SQL)
+        rows = c.fetchall()
     
     templates = []
-    for row in c.fetchall():
+    for row in rows:
         templates.append({
             'id': row[0],
             'name': row[1],
@@ -365,29 +2879,543 @@ def get_templates() -> List[Dict]:
             'created_at': row[4]
         })
     
-    conn.close()
     return templates
 
+def _read_template(template_id: int) -> Optional[Dict]:
+    with db_connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT data_json FROM templates WHERE id = ?', (template_id,))
+        result = c.fetchone()
+    
+    if result:
+        # Convert dicts back to dataframes
+        return decode_frames(json.loads(result[0]))
+    
+    return None
+
+@PROFILER.timed()
+def get_templates() -> List[Dict]:
+    """Get available templates"""
+    return [dict(template) for template in get_template_cache().catalog(_query_templates)]
+
+@PROFILER.timed()
 def load_template(template_id: int) -> Optional[Dict]:
     """Load template data"""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
+    data = get_template_cache().template(template_id, _read_template)
+    if data is None:
+        return None
+    return {key: _share_frame(value) if isinstance(value, pd.DataFrame) else value for key, value in data.items()}
+
+@PROFILER.timed()
+def save_template(name: str, description: str, data_dict: Dict, created_by: int = None,
+                  is_public: bool = True, template_id: int = None) -> Tuple[int, str]:
+    """Create a template, or update template_id. Returns (template_id, message)"""
+    try:
+        serializable_data = {key: encode_frame(value) if isinstance(value, pd.DataFrame) else value
+                             for key, value in data_dict.items()}
+        data_json = json.dumps(serializable_data)
+        
+        def write(conn):
+            c = conn.cursor()
+            if template_id:
+                c.execute('''
+                    UPDATE templates SET name = ?, description = ?, data_json = ?, is_public = ?
+                    WHERE id = ?
+                ''', (name, description, data_json, int(is_public), template_id))
+                return template_id, "Template updated successfully!"
+            c.execute('''
+                INSERT INTO templates (name, description, data_json, created_by, is_public)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (name, description, data_json, created_by, int(is_public)))
+            return c.lastrowid, "Template saved successfully!"
+        
+        result = run_write(write)
+        get_template_cache().invalidate()
+        return result
+    except Exception as e:
+        return 0, f"Error saving template: {str(e)}"
+
+def _merge_save_args(older: Tuple, newer: Tuple) -> Tuple:
+    """Fold an older save_report() call into a newer one, so sections only the older one wrote are kept"""
+    *_, older_data, older_sections = older
+    *head, data, sections = newer
+    if sections is None:
+        # The newer save writes the whole report
+        return newer
+    merged_sections = None if older_sections is None else sorted(set(older_sections) | set(sections))
+    return (*head, {**older_data, **data}, merged_sections)
+
+class AutosaveWorker:
+    """Background writer that debounces autosaves and coalesces bursts into one save per report
     
-    c.execute('SELECT data_json FROM templates WHERE id = ?', (template_id,))
-    result = c.fetchone()
-    conn.close()
+    Saves may carry only some sections (save_report's sections argument), so a
+    save that replaces a pending or in-flight one for the same report absorbs it.
+    """
     
-    if result:
-        data = json.loads(result[0])
-        
-        # Convert dicts back to dataframes
-        for key in ['strategic_df', 'lay_df', 'trustee_df', 'leadership_df', 'appendix_df']:
-            if key in data and isinstance(data[key], dict):
-                data[key] = pd.DataFrame(data[key])
+    def __init__(self, debounce: float = AUTOSAVE_DEBOUNCE_SECONDS, max_delay: float = AUTOSAVE_MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._seq = 0
+        self._pending = {}       # key -> {'due', 'deadline', 'seq', 'args'}
+        self._in_flight = {}     # key -> (seq, args) being written by the worker thread
+        self._written_seq = {}   # key -> seq of the newest state written
+        self._last_saved = {}    # key -> {'saved_at', 'saved_seq', 'report_id', 'message', 'error', 'failed_at'}
+        self._thread = threading.Thread(target=self._run, name="autosave-worker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, key: Tuple, *save_args) -> int:
+        """Queue save_report(*save_args) and return its sequence number, see last_saved().
+        A newer submit for the same key replaces the pending one."""
+        now = time.monotonic()
+        with self._cond:
+            self._seq += 1
+            previous = self._pending.get(key)
+            deadline = previous['deadline'] if previous else now + self.max_delay
+            if previous:
+                save_args = _merge_save_args(previous['args'], save_args)
+            self._pending[key] = {
+                'due': min(now + self.debounce, deadline),
+                'deadline': deadline,
+                'seq': self._seq,
+                'args': save_args
+            }
+            self._cond.notify()
+            return self._seq
+    
+    def save_now(self, key: Tuple, *save_args) -> Tuple[int, str]:
+        """Save synchronously, superseding any pending or in-flight autosave for the key"""
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            # The write in flight may yet be skipped as stale, so this save carries it along
+            older = [item['args'] for item in [self._pending.pop(key, None)] if item]
+            if key in self._in_flight:
+                older.insert(0, self._in_flight[key][1])
+            for older_args in reversed(older):
+                save_args = _merge_save_args(older_args, save_args)
+        return self._write(key, seq, save_args)
+    
+    def discard(self, key: Tuple):
+        """Drop the pending autosave for the key and wait out any write in flight, so no
+        autosave queued before this call is written after it"""
+        with self._write_lock, self._cond:
+            self._seq += 1
+            self._pending.pop(key, None)
+            self._in_flight.pop(key, None)
+            self._written_seq[key] = self._seq
+    
+    def last_saved(self, key: Tuple) -> Optional[Dict]:
+        """Return {'saved_at', 'saved_seq', 'report_id', 'message', 'error', 'failed_at'} for key.
         
-        return data
+        saved_at, saved_seq, report_id and message describe the latest successful save,
+        which also wrote every save submitted before saved_seq; error and failed_at the
+        latest failed one, cleared again by the next success.
+        """
+        with self._cond:
+            return self._last_saved.get(key)
     
-    return None
+    def is_pending(self, key: Tuple) -> bool:
+        with self._cond:
+            return key in self._pending
+    
+    def flush(self, key: Optional[Tuple] = None):
+        """Write pending saves immediately: every report's, or only the given key's.
+        Returns once those saves, and any the worker thread is writing, are written."""
+        with self._cond:
+            keys = list(self._pending) if key is None else [key] if key in self._pending else []
+            batch = [(key, self._pending.pop(key)) for key in keys]
+            self._in_flight.update((key, (item['seq'], item['args'])) for key, item in batch)
+            writing = [(flight_key, seq) for flight_key, (seq, _) in self._in_flight.items()
+                       if flight_key not in keys and key in (None, flight_key)]
+        for key, item in batch:
+            self._write(key, item['seq'], item['args'])
+        with self._cond:
+            self._cond.wait_for(lambda: all(self._in_flight.get(key, (None,))[0] != seq for key, seq in writing))
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    due = [key for key, item in self._pending.items() if item['due'] <= now]
+                    if due:
+                        break
+                    next_due = min((item['due'] for item in self._pending.values()), default=None)
+                    self._cond.wait(None if next_due is None else next_due - now)
+                batch = [(key, self._pending.pop(key)) for key in due]
+                self._in_flight.update((key, (item['seq'], item['args'])) for key, item in batch)
+            for key, item in batch:
+                self._write(key, item['seq'], item['args'])
+    
+    def _write(self, key: Tuple, seq: int, args: Tuple) -> Tuple[int, str]:
+        with self._write_lock:
+            # A newer state for this report was already written; this one is stale
+            stale = seq < self._written_seq.get(key, 0)
+            if stale:
+                report_id, message = 0, "Superseded by a newer save"
+            else:
+                try:
+                    report_id, message = save_report(*args)
+                except Exception as e:
+                    report_id, message = 0, f"Error saving report: {str(e)}"
+            with self._cond:
+                if self._in_flight.get(key, (None,))[0] == seq:
+                    del self._in_flight[key]
+                    self._cond.notify_all()
+                if not stale:
+                    self._written_seq[key] = seq
+                    if report_id:
+                        self._last_saved[key] = {'saved_at': datetime.now(), 'saved_seq': seq, 'report_id': report_id,
+                                                 'message': message, 'error': None, 'failed_at': None}
+                    else:
+                        # A failed write keeps the last good save on record next to the error
+                        previous = self._last_saved.get(key, {'saved_at': None, 'saved_seq': 0, 'report_id': 0,
+                                                              'message': None})
+                        self._last_saved[key] = {**previous, 'error': message, 'failed_at': datetime.now()}
+            return report_id, message
+
+@st.cache_resource(show_spinner=False)
+def get_autosave_worker() -> AutosaveWorker:
+    """Process-wide autosave worker shared by all sessions"""
+    return AutosaveWorker()
+
+def _find_user_id(username: str) -> Optional[int]:
+    with db_connection() as conn:
+        user = conn.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
+    return user[0] if user else None
+
+def _cli_import(args) -> int:
+    user_id = _find_user_id(args.user)
+    if user_id is None and args.password:
+        success, message = create_user(args.user, args.password)
+        if not success:
+            print(message, file=sys.stderr)
+            return 1
+        user_id = _find_user_id(args.user)
+    if user_id is None:
+        print(f"Unknown user: {args.user} (pass --password to create it)", file=sys.stderr)
+        return 1
+    
+    try:
+        sheets = read_import_files(args.files)
+    except (OSError, ValueError) as e:
+        print(f"Error reading import files: {e}", file=sys.stderr)
+        return 1
+    
+    start = time.perf_counter()
+    count, errors = import_reports(user_id, sheets)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        return 1
+    print(f"Imported {count} reports in {time.perf_counter() - start:.2f}s")
+    return 0
+
+def _cli_export(args) -> int:
+    user_id = None
+    if args.user:
+        user_id = _find_user_id(args.user)
+        if user_id is None:
+            print(f"Unknown user: {args.user}", file=sys.stderr)
+            return 1
+    
+    start = time.perf_counter()
+    try:
+        count = export_reports(args.output, args.format, user_id=user_id, annual_conference=args.conference,
+                               district=args.district, reporting_year=args.year)
+    except (OSError, ValueError) as e:
+        print(f"Error exporting reports: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} reports to {args.output} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+def _cli_role(args) -> int:
+    def write(conn):
+        return conn.execute('UPDATE users SET role = ? WHERE username = ?', (args.role, args.user)).rowcount
+    if not run_write(write):
+        print(f"Unknown user: {args.user}", file=sys.stderr)
+        return 1
+    print(f"{args.user} is now {'an' if args.role == 'admin' else 'a'} {args.role}")
+    return 0
+
+def _cli_compact(args) -> int:
+    start = time.perf_counter()
+    count = compact_report_deltas()
+    print(f"Compacted {count} report sections in {time.perf_counter() - start:.2f}s")
+    return 0
+
+def use_database(db_name: str):
+    """Point this process at another database file and bring its schema up to date"""
+    global DB_NAME
+    DB_NAME = db_name
+    for cached in (get_connection_pool, bootstrap_database, get_report_list_cache, get_template_cache,
+                   get_credential_cache, get_session_secret):
+        cached.clear()
+    bootstrap_database(db_name)
+
+_BENCH_WORDS = ("grace faith mission outreach youth worship stewardship ministry prayer fellowship "
+                "community service growth discipleship harvest renewal evangelism care").split()
+_BENCH_NAMES = ("Santos Reyes Cruz Bautista Ocampo Garcia Mendoza Torres Flores Villanueva "
+                "Ramos Castillo Aquino Navarro Salazar Domingo").split()
+
+def _bench_sheets(first: int, count: int, phrases: List[str], names: List[str]) -> Dict[str, pd.DataFrame]:
+    """Import sheets for synthetic reports first .. first + count - 1; the same numbers always give the same data"""
+    numbers = range(first, first + count)
+    sheets = {'reports': pd.DataFrame({
+        'report_name': [f"Report {n:06d}" for n in numbers],
+        'church_name': [f"{names[n % len(names)]} Memorial Church {n}" for n in numbers],
+        'district': [f"District {n % 40 + 1}" for n in numbers],
+        'annual_conference': [f"Annual Conference {n % 8 + 1}" for n in numbers],
+        'pastor_name': [f"Rev. {names[(n * 7) % len(names)]}" for n in numbers],
+        'council_chairperson': [names[(n * 11) % len(names)] for n in numbers],
+        'vision': [phrases[n % len(phrases)] for n in numbers],
+        'mission': [phrases[(n * 3) % len(phrases)] for n in numbers],
+        'core_values': [phrases[(n * 5) % len(phrases)] for n in numbers],
+        'nursery_enrolled': [n % 30 for n in numbers],
+        'kinder_enrolled': [n % 45 for n in numbers],
+        'membership': [50 + n % 950 for n in numbers],
+        'reporting_year': ['2025-2026'] * count,
+        'completion_percentage': [(n * 10) % 100 for n in numbers],
+    })}
+    # Tables shaped like the blank ones, keeping their row labels
+    for sheet, columns, rows in REPORT_TABLES.values():
+        cells = [(n, row) for n in numbers for row in range(_table_row_count(rows))]
+        table = {'report_name': [f"Report {n:06d}" for n, _ in cells]}
+        for position, (column, kind) in enumerate(columns.items()):
+            if kind == 'number':
+                table[column] = [float((n * 37 + row * 11 + position) % 5000) for n, row in cells]
+            elif position == 0 and isinstance(rows, list):
+                table[column] = [rows[row] for _, row in cells]
+            else:
+                pool = phrases if position % 2 else names
+                table[column] = [pool[(n * 13 + row * 7 + position) % len(pool)] for n, row in cells]
+        sheets[sheet] = pd.DataFrame(table)
+    return sheets
+
+def _bench_populate(size: int):
+    """Fill the current, empty database with `size` synthetic reports"""
+    rng = random.Random(0)
+    phrases = [' '.join(rng.choice(_BENCH_WORDS) for _ in range(rng.randint(4, 12))).capitalize() for _ in range(509)]
+    names = [f"{rng.choice(_BENCH_NAMES)} {rng.choice(_BENCH_NAMES)}" for _ in range(251)]
+    for first in range(0, size, BENCH_REPORTS_PER_USER):
+        username = f"bench{first // BENCH_REPORTS_PER_USER:05d}"
+        success, message = create_user(username, BENCH_PASSWORD, church_name=f"Church {first}")
+        if not success:
+            raise RuntimeError(message)
+        count = min(BENCH_REPORTS_PER_USER, size - first)
+        _, errors = import_reports(_find_user_id(username), _bench_sheets(first, count, phrases, names))
+        if errors:
+            raise RuntimeError('; '.join(errors))
+
+def _bench_time(fn, rounds: int) -> Dict:
+    """Run fn(round) once to warm up, then time `rounds` calls"""
+    fn(-1)
+    PROFILER.reset()
+    times = []
+    for round_number in range(rounds):
+        start = time.perf_counter()
+        fn(round_number)
+        times.append(time.perf_counter() - start)
+    sql_calls = sum(stat['count'] for stat in PROFILER.snapshot()['sql'].values())
+    return {'rounds': rounds, 'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times),
+            'max': max(times), 'sql_per_call': sql_calls / rounds}
+
+def _bench_database(rounds: int) -> Dict[str, Dict]:
+    """Time the hot paths against the current database"""
+    with db_connection() as conn:
+        users = conn.execute("SELECT id, username FROM users WHERE username LIKE 'bench%' ORDER BY id").fetchall()
+        reports = conn.execute('''
+            SELECT r.id, r.user_id, r.report_name FROM reports r
+            JOIN users u ON u.id = r.user_id WHERE u.username LIKE 'bench%' ORDER BY r.id
+        ''').fetchall()
+        template_id = conn.execute("SELECT id FROM templates WHERE name = 'Default Template'").fetchone()[0]
+    rng = random.Random(len(reports))
+    sample = rng.sample(reports, min(len(reports), 64))
+    user_ids = sorted({user_id for _, user_id, _ in sample})
+    username = users[0][1]
+    
+    def report(round_number):
+        return sample[round_number % len(sample)]
+    
+    def get_reports(round_number):
+        user_id = user_ids[round_number % len(user_ids)]
+        get_report_list_cache().invalidate(user_id)
+        get_user_reports(user_id)
+    
+    def get_reports_page(round_number):
+        user_id = user_ids[round_number % len(user_ids)]
+        get_report_list_cache().invalidate(user_id)
+        get_user_reports_page(user_id)
+    
+    def save(round_number):
+        report_id, user_id, report_name = report(round_number)
+        data = load_report(report_id, user_id)
+        # Alternate between two states so repeated runs leave the database as they found it
+        data['vision'] = f"{data['vision'].split(' (')[0]} ({round_number % 2})"
+        data['strategic_df'].iloc[0, -2] = round_number % 2
+        save_report(user_id, report_name, data.get('church_name', ''), data)
+    
+    benchmarks = {
+        'authenticate_user': lambda round_number: (get_credential_cache().clear(), authenticate_user(username, BENCH_PASSWORD)),
+        'authenticate_user_cached': lambda round_number: authenticate_user(username, BENCH_PASSWORD),
+        'get_user_reports': get_reports,
+        'get_user_reports_page': get_reports_page,
+        # Type-ahead on a report's number; the synthetic vocabulary is too small for word searches to be selective
+        'search_reports': lambda round_number: search_reports(report(round_number)[1], report(round_number)[2].split()[-1]),
+        'load_report': lambda round_number: load_report(report(round_number)[0], report(round_number)[1]),
+        'load_report_section': lambda round_number: load_report(report(round_number)[0], report(round_number)[1],
+                                                                sections=['church_info']),
+        'save_report': save,
+        'get_templates': lambda round_number: (get_template_cache().invalidate(), get_templates()),
+        'load_template': lambda round_number: (get_template_cache().invalidate(), load_template(template_id)),
+    }
+    results = {name: _bench_time(fn, rounds) for name, fn in benchmarks.items()}
+    
+    # The work behind create_downloadable_report, without its session state and render cache
+    state = {key: value for key, value in load_report(sample[0][0], sample[0][1]).items() if key in EXPORT_STATE_KEYS}
+    # Imported reports carry no session defaults
+    state.setdefault('current_year', 2025)
+    state.setdefault('completion_status', {section: True for section in COMPLETION_SECTIONS})
+    for export_format, (_, _, render) in REPORT_RENDERERS.items():
+        results[f'render_report_{export_format}'] = _bench_time(
+            lambda round_number: render(build_report_document(state)), rounds)
+    return results
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _compare_bench(results: Dict, baseline: Dict, threshold: float) -> int:
+    """Print median ratios against an earlier run. Returns the number of slowdowns beyond threshold."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} (slower than {threshold:.2f}x is flagged):")
+    regressions = 0
+    for size, size_results in results['sizes'].items():
+        baseline_results = baseline.get('sizes', {}).get(size, {}).get('benchmarks', {})
+        for name, stat in size_results['benchmarks'].items():
+            if name not in baseline_results:
+                continue
+            ratio = stat['median'] / baseline_results[name]['median']
+            flag = ''
+            if ratio > threshold:
+                regressions += 1
+                flag = '  REGRESSION'
+            print(f"  {int(size):>7,} {name:<24} {ratio:6.2f}x{flag}")
+    return regressions
+
+def _cli_bench(args) -> int:
+    workdir = args.workdir or tempfile.mkdtemp(prefix='church-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    results = {
+        'commit': _git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'rounds': args.rounds,
+        'sizes': {},
+    }
+    try:
+        for size in args.sizes:
+            db_name = os.path.join(workdir, f'bench_{size}.db')
+            use_database(db_name)
+            with db_connection() as conn:
+                existing = conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+            populate_seconds = None
+            if existing != size:
+                # Missing or left over from an interrupted run: build it again from scratch
+                get_connection_pool.clear()
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.exists(db_name + suffix):
+                        os.remove(db_name + suffix)
+                use_database(db_name)
+                print(f"Generating {size:,} reports in {db_name}...", flush=True)
+                start = time.perf_counter()
+                _bench_populate(size)
+                populate_seconds = time.perf_counter() - start
+            
+            benchmarks = _bench_database(args.rounds)
+            results['sizes'][str(size)] = {'populate_seconds': populate_seconds, 'benchmarks': benchmarks}
+            print(f"\n{size:,} reports" + (f" (generated in {populate_seconds:.1f}s)" if populate_seconds else ""))
+            for name, stat in benchmarks.items():
+                print(f"  {name:<24} median {stat['median'] * 1000:9.3f} ms   min {stat['min'] * 1000:9.3f} ms"
+                      f"   {stat['sql_per_call']:5.1f} SQL/call")
+    finally:
+        get_connection_pool.clear()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if _compare_bench(results, baseline, args.threshold):
+            return 1
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line tools; the app itself runs with `streamlit run tem.py`"""
+    parser = argparse.ArgumentParser(prog="tem.py", description="Church Reporting System command line tools")
+    parser.add_argument("--db", default=DB_NAME, help=f"Database file (default: {DB_NAME})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    import_parser = commands.add_parser("import", help="Bulk import reports from Excel workbooks or CSV files")
+    import_parser.add_argument("files", nargs="+", help="Excel workbooks, CSV or Parquet files named after their sheet, "
+                                                          "or zips of them as written by export")
+    import_parser.add_argument("--user", required=True, help="Username that will own the imported reports")
+    import_parser.add_argument("--password", help="Create the user with this password if it does not exist")
+    import_parser.set_defaults(handler=_cli_import)
+    
+    export_parser = commands.add_parser("export", help="Export reports to an Excel workbook, or a zip of Parquet or CSV files")
+    export_parser.add_argument("output", help="Output file")
+    export_parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="xlsx")
+    export_parser.add_argument("--user", help="Only reports owned by this user")
+    export_parser.add_argument("--conference", help="Only reports of this annual conference")
+    export_parser.add_argument("--district", help="Only reports of this district")
+    export_parser.add_argument("--year", help="Only reports of this reporting year, e.g. 2024-2025")
+    export_parser.set_defaults(handler=_cli_export)
+    
+    role_parser = commands.add_parser("role", help="Set a user's role; admins can open the diagnostics panel")
+    role_parser.add_argument("user", help="Username")
+    role_parser.add_argument("role", choices=["user", "admin"])
+    role_parser.set_defaults(handler=_cli_role)
+    
+    compact_parser = commands.add_parser("compact", help="Fold every report's pending JSON-Patch deltas into its section snapshots")
+    compact_parser.set_defaults(handler=_cli_compact)
+    
+    bench_parser = commands.add_parser("bench", help="Time the persistence and export paths on synthetic databases")
+    bench_parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCH_SIZES), help="Reports per database")
+    bench_parser.add_argument("--rounds", type=int, default=BENCH_ROUNDS, help="Timed calls per benchmark")
+    bench_parser.add_argument("--workdir", help="Keep the generated databases here and reuse them on later runs")
+    bench_parser.add_argument("--output", help="Write the results as JSON to this file")
+    bench_parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    bench_parser.add_argument("--threshold", type=float, default=1.25,
+                              help="Median slowdown against --compare that fails the run (default 1.25)")
+    bench_parser.set_defaults(handler=_cli_bench)
+    
+    args = parser.parse_args(argv)
+    if args.command != "bench":
+        # bench builds its own databases; the other commands work on --db
+        use_database(args.db)
+    return args.handler(args)
+
+# Run as a command line tool when started with plain `python tem.py ...`, before
+# anything below opens the app's database
+if __name__ == "__main__" and not st.runtime.exists():
+    sys.exit(main())
+
+# Time this script run for the diagnostics panel
+PROFILER.begin_rerun()
+
+# Initialize database: once per process, not on every rerun
+bootstrap_database(DB_NAME)
 
 # Page configuration
 st.set_page_config(
@@ -398,7 +3426,8 @@ st.set_page_config(
 )
 
 # Minimalist CSS with OS theme sync
-st.markdown("""
+with PROFILER.span('inject_css'):
+    st.markdown("""
 <style>
     :root {
         --bg-primary: #FFFFFF;
@@ -638,7 +3667,7 @@ st.markdown("""
         text-align: center;
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # Initialize session state
 if 'authenticated' not in st.session_state:
@@ -654,95 +3683,81 @@ if 'current_report_id' not in st.session_state:
 
 if 'reports' not in st.session_state:
     st.session_state.reports = {}
-if 'current_year' not in st.session_state:
-    st.session_state.current_year = datetime.now().year
-if 'completion_status' not in st.session_state:
-    st.session_state.completion_status = {
-        'church_info': False,
-        'council_report': False,
-        'lay_organizations': False,
-        'trustees': False,
-        'kindergarten': False,
-        'workers': False,
-        'leadership': False,
-        'appendices': False
-    }
 
-# Initialize dataframes in session state
-def initialize_dataframes():
-    """Initialize or reset dataframes in session state"""
-    st.session_state.strategic_df = pd.DataFrame({
-        'Strategic Area': [
-            'MINISTRY EXPANSION',
-            'LEADERSHIP DEVELOPMENT',
-            'FINANCIAL SUSTAINABILITY and STRUCTURAL DEVELOPMENT',
-            'PARTNERSHIP DEVELOPMENT',
-            'CHURCH WORKERS HEALTH CARE DEVELOPMENT'
-        ],
-        'Objectives': [''] * 5,
-        'Activities': [''] * 5,
-        'Timeline': [''] * 5,
-        'Responsible Persons': [''] * 5,
-        'Budget (₱)': [0] * 5,
-        'Status': [''] * 5
-    })
-
-    st.session_state.lay_df = pd.DataFrame({
-        'Organization': [
-            'United Methodist Men',
-            'United Methodist Women',
-            'United Methodist Youth',
-            'United Methodist Young Adults',
-            'Children\'s Ministry',
-            'Other (Specify)'
-        ],
-        'President': [''] * 6,
-        'Contact Number': [''] * 6,
-        'No. of Members': [0] * 6,
-        'Regular Meetings': [''] * 6,
-        'Key Programs': [''] * 6
-    })
-
-    st.session_state.trustee_df = pd.DataFrame({
-        'Property Description': [''] * 3,
-        'Date Acquired': [''] * 3,
-        'Specific Project': [''] * 3,
-        'Funding Source': [''] * 3,
-        'Cost of CT (₱)': [0] * 3,
-        'Total Cost (₱)': [0] * 3,
-        'Remarks': [''] * 3
-    })
-
-    st.session_state.leadership_df = pd.DataFrame({
-        'Position': [
-            'Chairperson',
-            'Vice-Chairperson',
-            'Secretary',
-            'Treasurer',
-            'Auditor',
-            'Board of Trustees Chair',
-            'Lay Leader',
-            'Other (Specify)'
-        ],
-        'Name': [''] * 8,
-        'Contact Number': [''] * 8,
-        'Email': [''] * 8,
-        'Status (New/Old)': [''] * 8
-    })
-
-    st.session_state.appendix_df = pd.DataFrame({
-        'Organization': [''] * 5,
-        'Position': [''] * 5,
-        'Name': [''] * 5,
-        'Cell Phone Number': [''] * 5,
-        'Facebook Account': [''] * 5,
-        'Email': [''] * 5
-    })
-
-if 'strategic_df' not in st.session_state:
-    initialize_dataframes()
+# The report being edited lives in one ReportModel; widgets only mirror its fields
+def open_report(model: ReportModel, report_id: Optional[int] = None, report_name: Optional[str] = None):
+    """Make model the session's report, e.g. a new ReportModel() to start a blank one"""
+    st.session_state.report_model = model
+    st.session_state.current_report_id = report_id
+    st.session_state.current_report_name = report_name
+    # The version picker lists the previous report's versions
+    st.session_state.pop('history_version', None)
+
+def get_report_model() -> ReportModel:
+    return st.session_state.report_model
+
+def bind_report_widgets(fields: List[str]):
+    """Seed the widgets keyed by these report fields from the model before they are drawn.
+    
+    Streamlit drops a widget's state on reruns that do not draw it, so the model
+    and not the widget holds the value between views.
+    """
+    model = get_report_model()
+    for field in fields:
+        st.session_state[field] = model.get(field)
+
+def update_report_field(field: str):
+    """on_change callback for a widget keyed by a report field"""
+    get_report_model().set(field, st.session_state[field])
+
+if 'report_model' not in st.session_state:
+    st.session_state.report_model = ReportModel()
 
 # Authentication functions for UI
+def sign_in(user: Tuple, token: str):
+    """Mark the session signed in as user and put its session token in the URL"""
+    st.session_state.authenticated = True
+    st.session_state.user_id = user[0]
+    st.session_state.username = user[1]
+    st.session_state.user_email = user[2]
+    st.session_state.user_full_name = user[3]
+    st.session_state.user_church_name = user[4]
+    st.session_state.user_role = user[5]
+    st.session_state.session_token = token
+    st.session_state.session_report_id = None
+    st.query_params[SESSION_QUERY_PARAM] = token
+
+def resume_signed_in_session(token: str):
+    """Sign a fresh Streamlit session back in from the token in its URL and reopen its last report"""
+    resumed = resume_session(token)
+    if resumed is None:
+        del st.query_params[SESSION_QUERY_PARAM]
+        return
+    user, report_id, token = resumed
+    sign_in(user, token)
+    if report_id:
+        reopen_report(report_id)
+
+def reopen_report(report_id: int):
+    """Make a stored report current without reading it; its sections load as they are viewed"""
+    with db_connection() as conn:
+        result = conn.execute('SELECT report_name FROM reports WHERE id = ? AND user_id = ? AND is_archived = 0',
+                              (report_id, st.session_state.user_id)).fetchone()
+    if result is None:
+        return
+    # An autosave still queued from before the reconnect has to land before anything is read
+    get_autosave_worker().flush((st.session_state.user_id, result[0]))
+    open_report(ReportModel(loaded_sections=set()), report_id, result[0])
+    st.session_state.session_report_id = report_id
+
+def remember_active_report():
+    """Record the current report on the server-side session when it changes, so a reconnect reopens it"""
+    token = st.session_state.get('session_token')
+    report_id = st.session_state.get('current_report_id')
+    if token and st.session_state.get('session_report_id') != report_id:
+        set_session_report(token, report_id)
+        st.session_state.session_report_id = report_id
+
 def login():
     """Handle user login"""
     st.markdown('<div class="login-container">', unsafe_allow_html=True)
@@ -760,13 +3775,7 @@ def login():
             if username and password:
                 user = authenticate_user(username, password)
                 if user:
-                    st.session_state.authenticated = True
-                    st.session_state.user_id = user[0]
-                    st.session_state.username = user[1]
-                    st.session_state.user_email = user[2]
-                    st.session_state.user_full_name = user[3]
-                    st.session_state.user_church_name = user[4]
-                    st.session_state.user_role = user[5]
+                    sign_in(user, create_session(user[0], st.session_state.current_report_id))
                     st.success("Login successful!")
                     st.rerun()
                 else:
@@ -803,11 +3812,8 @@ def login():
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Welcome message for first-time users
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("SELECT COUNT(*) FROM users")
-    user_count = c.fetchone()[0]
-    conn.close()
+    with db_connection() as conn:
+        user_count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
     
     if user_count == 0:
         st.markdown("""
@@ -832,219 +3838,195 @@ def logout():
     st.session_state.user_id = None
     st.session_state.username = None
     st.session_state.user_role = None
-    st.session_state.current_report_id = None
-    st.session_state.current_report_name = None
-    initialize_dataframes()
+    if st.session_state.get('session_token'):
+        end_session(st.session_state.pop('session_token'))
+    st.query_params.pop(SESSION_QUERY_PARAM, None)
+    open_report(ReportModel())
     st.rerun()
 
 # Report management functions
-def create_downloadable_report():
-    """Generate the complete report as a downloadable file"""
-    
-    # Calculate completion percentage
-    completed_sections = sum(st.session_state.completion_status.values())
-    total_sections = len(st.session_state.completion_status)
-    completion_percentage = (completed_sections / total_sections) * 100
-    
-    # Create a comprehensive report
-    report_content = []
-    
-    # Header
-    report_content.append("=" * 80)
-    report_content.append("CHURCH ANNUAL REPORT")
-    report_content.append("=" * 80)
-    report_content.append(f"\nGenerated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    report_content.append(f"Reporting Year: {st.session_state.current_year}-{st.session_state.current_year + 1}")
-    report_content.append(f"Church: {st.session_state.get('church_name', 'Not Provided')}")
-    report_content.append(f"Completion Status: {completion_percentage:.1f}%")
-    report_content.append("\n" + "=" * 80)
-    
-    # Church Information
-    report_content.append("\n1. CHURCH BASIC INFORMATION")
-    report_content.append("-" * 40)
-    report_content.append(f"Church Name: {st.session_state.get('church_name', 'Not Provided')}")
-    report_content.append(f"District: {st.session_state.get('district', 'Not Provided')}")
-    report_content.append(f"Annual Conference: {st.session_state.get('annual_conference', 'Not Provided')}")
-    report_content.append(f"Pastor: {st.session_state.get('pastor_name', 'Not Provided')}")
-    report_content.append(f"Council Chairperson: {st.session_state.get('council_chairperson', 'Not Provided')}")
-    
-    # Vision, Mission, Core Values
-    report_content.append("\nVision, Mission & Core Values:")
-    report_content.append(f"Vision: {st.session_state.get('vision', 'Not Provided')}")
-    report_content.append(f"Mission: {st.session_state.get('mission', 'Not Provided')}")
-    report_content.append(f"Core Values: {st.session_state.get('core_values', 'Not Provided')}")
-    
-    # Church Council Report
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n2. CHURCH COUNCIL CHAIRPERSON REPORT")
-    report_content.append("-" * 40)
-    report_content.append(st.session_state.strategic_df.to_string(index=False))
-    
-    # Lay Organizations
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n3. LAY ORGANIZATIONS CONSOLIDATED REPORT")
-    report_content.append("-" * 40)
-    report_content.append(st.session_state.lay_df.to_string(index=False))
-    
-    # Board of Trustees
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n4. BOARD OF TRUSTEES REPORT")
-    report_content.append("-" * 40)
-    report_content.append(st.session_state.trustee_df.to_string(index=False))
-    
-    # Kindergarten Committee
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n5. KINDERGARTEN COMMITTEE REPORT")
-    report_content.append("-" * 40)
-    report_content.append(f"Nursery Enrollment: {st.session_state.get('nursery_enrolled', 0)}")
-    report_content.append(f"Kindergarten Enrollment: {st.session_state.get('kinder_enrolled', 0)}")
-    
-    # Church Workers
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n6. CHURCH WORKERS REPORT")
-    report_content.append("-" * 40)
-    report_content.append(f"Total Church Membership: {st.session_state.get('membership', 0)}")
-    
-    # Leadership
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n7. LEADERSHIP 2026-2027")
-    report_content.append("-" * 40)
-    report_content.append(st.session_state.leadership_df.to_string(index=False))
-    
-    # Appendices
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\n8. APPENDICES")
-    report_content.append("-" * 40)
-    report_content.append(st.session_state.appendix_df.to_string(index=False))
-    
-    report_content.append(f"\nAudit Completed: {st.session_state.get('audit', 'No')}")
-    
-    # Signatures
-    report_content.append("\n" + "=" * 80)
-    report_content.append("\nSIGNATURES")
-    report_content.append("-" * 40)
-    report_content.append(f"Church Council Chairperson: {st.session_state.get('council_signature', '')}")
-    report_content.append(f"Administrative Pastor: {st.session_state.get('pastor_signature', '')}")
-    report_content.append(f"Secretary: {st.session_state.get('secretary_signature', '')}")
-    
-    report_content.append("\n" + "=" * 80)
-    report_content.append(f"\nREPORT COMPLETION: {completion_percentage:.1f}%")
-    report_content.append("=" * 80)
+def create_downloadable_report(export_format: str = 'txt') -> Tuple[Callable[[], bytes], str, str]:
+    """Deferred export of the current report for st.download_button. Returns (render, filename, mime).
     
-    # Convert to string
-    full_report = "\n".join(report_content)
+    Nothing is rendered until the button is clicked: render() then runs on the
+    download thread, reads any sections this session never loaded from the
+    database, and is memoized on the report content.
+    """
+    model = get_report_model()
+    state = {key: model.values[key] for key in EXPORT_STATE_KEYS if key in model.values}
+    missing = [section for section in REPORT_SECTIONS
+               if model.loaded_sections is not None and section not in model.loaded_sections]
+    report_id, user_id = st.session_state.get('current_report_id'), st.session_state.get('user_id')
     
-    # Create a downloadable file
-    b64 = base64.b64encode(full_report.encode()).decode()
-    
-    # Generate filename
-    church_name = st.session_state.get('church_name', 'Church').replace(" ", "_")
-    filename = f"{church_name}_Annual_Report_{datetime.now().strftime('%Y%m%d')}.txt"
+    def render() -> bytes:
+        with PROFILER.span(f'download_report_{export_format}'):
+            snapshot = dict(state)
+            if missing:
+                stored = load_report(report_id, user_id, sections=missing) or {}
+                snapshot.update({key: value for key, value in stored.items() if key in EXPORT_STATE_KEYS})
+            # The filename carries today's date, so the day is part of the cache key
+            content_hash = report_content_hash(snapshot) + datetime.now().strftime('%Y%m%d')
+            data = _render_downloadable_report(content_hash, export_format, snapshot)
+        PROFILER.record_payload(f'download_{export_format}', len(data))
+        return data
     
-    return b64, filename, full_report, completion_percentage
+    extension, mime, _ = REPORT_RENDERERS[export_format]
+    church_name = state.get('church_name', 'Church').replace(" ", "_")
+    filename = f"{church_name}_Annual_Report_{datetime.now().strftime('%Y%m%d')}{extension}"
+    return render, filename, mime
 
-def save_current_report():
-    """Save current report to database. Returns (success, message)"""
+def profile_frame(stats: Dict[str, Dict], label: str, scale: float = 1000) -> pd.DataFrame:
+    """One kind of profiler statistics as a table, largest total first; times scaled to milliseconds"""
+    frame = pd.DataFrame.from_dict(stats, orient='index', columns=['count', 'total', 'mean', 'max'])
+    frame[['total', 'mean', 'max']] *= scale
+    return frame.rename_axis(label).reset_index().sort_values('total', ascending=False)
+
+@PROFILER.timed()
+def save_current_report(background: bool = False):
+    """Save current report to database. Returns (success, message)
+    
+    With background=True the save is queued on the autosave worker and written
+    once editing pauses, so widget callbacks return immediately.
+    """
     if not st.session_state.authenticated:
         return False, "Please log in to save reports"
     
-    # Get current data
-    data_to_save = {}
-    
-    # Collect all session state data
-    for key in st.session_state:
-        if key not in ['_last_hash', 'authenticated', 'user', 'user_id', 'username', 'user_role', 
-                       'current_report_id', 'current_report_name', 'reports', 'completion_status',
-                       'show_preview', 'generate_report']:
-            data_to_save[key] = st.session_state[key]
-    
-    # Add completion status
-    completed_sections = sum(st.session_state.completion_status.values())
-    total_sections = len(st.session_state.completion_status)
-    completion_percentage = (completed_sections / total_sections) * 100
-    data_to_save['completion_percentage'] = completion_percentage
+    model = get_report_model()
     
     # Get report name
-    report_name = st.session_state.get('church_name', 'Untitled Report')
+    report_name = model.values.get('church_name', 'Untitled Report')
     if not report_name or report_name == 'Not Provided':
         report_name = "Untitled Report"
     
     if st.session_state.current_report_name:
         report_name = st.session_state.current_report_name
     
+    # A stored report is written only in the sections edited since the last save; a new one
+    # whole, or as far as it was loaded (the stored sections not viewed yet stay as they are)
+    if st.session_state.current_report_id:
+        sections = model.dirty_sections()
+        if not sections:
+            return True, "No changes to save"
+    else:
+        sections = model.loaded_sections
+    data_to_save = model.snapshot(sections)
+    as_of = model.edits
+    
+    # Add completion status
+    completed_sections = sum(model.values['completion_status'].values())
+    total_sections = len(model.values['completion_status'])
+    completion_percentage = (completed_sections / total_sections) * 100
+    data_to_save['completion_percentage'] = completion_percentage
+    sections = sorted(sections) if sections is not None else None
+    
+    worker = get_autosave_worker()
+    key = (st.session_state.user_id, report_name)
+    args = (st.session_state.user_id, report_name, model.values.get('church_name', ''), data_to_save, sections)
+    
+    if background:
+        model.save_queued(worker.submit(key, *args), data_to_save)
+        # Pin the name now so later autosaves coalesce onto the same report
+        st.session_state.current_report_name = report_name
+        return True, "Autosave queued"
+    
     # Save to database
-    report_id, message = save_report(
-        st.session_state.user_id,
-        report_name,
-        st.session_state.get('church_name', ''),
-        data_to_save
-    )
+    report_id, message = worker.save_now(key, *args)
     
     if report_id:
+        model.mark_saved(data_to_save, as_of)
         st.session_state.current_report_id = report_id
         st.session_state.current_report_name = report_name
         return True, message
     else:
         return False, message
 
+def sync_autosave_status() -> Optional[Dict]:
+    """Pick up the outcome of background saves for the current report"""
+    if not st.session_state.get('current_report_name'):
+        return None
+    status = get_autosave_worker().last_saved((st.session_state.user_id, st.session_state.current_report_name))
+    if status and status['report_id'] and not st.session_state.get('current_report_id'):
+        st.session_state.current_report_id = status['report_id']
+    if status and status['saved_seq']:
+        get_report_model().confirm_saved(status['saved_seq'])
+    return status
+
+@PROFILER.timed()
 def load_selected_report(report_id: int):
-    """Load a report from database into session state"""
-    report_data = load_report(report_id, st.session_state.user_id)
-    
-    if report_data:
-        # Clear current session state except authentication
-        auth_state = {
-            'authenticated': st.session_state.authenticated,
-            'user_id': st.session_state.user_id,
-            'username': st.session_state.username,
-            'user_role': st.session_state.user_role,
-            'current_report_id': report_id
-        }
-        
+    """Load a report from database into session state
+    
+    Only the general and Church Information sections are read here; the others
+    are loaded by ensure_sections_loaded() when first viewed.
+    """
+    eager_sections = [GENERAL_SECTION, 'church_info']
+    report_data = load_report(report_id, st.session_state.user_id, sections=eager_sections)
+    
+    if report_data is not None:
         # Get report name
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        c.execute('SELECT report_name FROM reports WHERE id = ?', (report_id,))
-        result = c.fetchone()
+        with db_connection() as conn:
+            result = conn.execute('SELECT report_name FROM reports WHERE id = ?', (report_id,)).fetchone()
         report_name = result[0] if result else "Loaded Report"
-        conn.close()
         
-        st.session_state.current_report_name = report_name
-        
-        # Clear session state
-        for key in list(st.session_state.keys()):
-            if key not in auth_state:
-                del st.session_state[key]
-        
-        # Restore authentication state
-        for key, value in auth_state.items():
-            st.session_state[key] = value
-        
-        # Load report data
-        for key, value in report_data.items():
-            st.session_state[key] = value
-        
-        # Initialize completion status if not in loaded data
-        if 'completion_status' not in st.session_state:
-            st.session_state.completion_status = {
-                'church_info': False,
-                'council_report': False,
-                'lay_organizations': False,
-                'trustees': False,
-                'kindergarten': False,
-                'workers': False,
-                'leadership': False,
-                'appendices': False
-            }
+        # Replace the report only; the rest of the session (navigation, search, login) stays
+        open_report(ReportModel(report_data, loaded_sections=set(eager_sections)), report_id, report_name)
         
         st.success(f"Report '{report_name}' loaded successfully!")
         st.rerun()
     else:
         st.error("Failed to load report. It may have been deleted or you don't have permission.")
 
+def ensure_sections_loaded(sections: List[str]):
+    """Load sections of the current report into its model the first time they are needed"""
+    model = get_report_model()
+    if model.loaded_sections is None:
+        # Nothing was loaded lazily: the model already holds the whole report
+        return
+    missing = [section for section in sections if section not in model.loaded_sections]
+    if not missing:
+        return
+    
+    section_data = load_report(st.session_state.current_report_id, st.session_state.user_id, sections=missing)
+    model.load(section_data or {}, sections=missing)
+
+def apply_selected_template():
+    """Copy the chosen template's tables into the report, then reset the template picker"""
+    selected = st.session_state.template_select
+    template = next((t for t in get_templates() if t['name'] == selected), None)
+    template_data = load_template(template['id']) if template else None
+    
+    if template_data:
+        model = get_report_model()
+        for key in REPORT_TABLES:
+            if key in template_data:
+                model.set(key, template_data[key])
+        st.success("Template loaded successfully!")
+    
+    st.session_state.template_select = "Select Template"
+
+def publish_template():
+    """Save the current report's tables as the template named in the sidebar, replacing
+    a public template of the same name"""
+    name = st.session_state.template_name.strip()
+    ensure_sections_loaded(sorted({_SECTION_BY_KEY.get(key, GENERAL_SECTION) for key in REPORT_TABLES}))
+    model = get_report_model()
+    tables = {key: model.get(key) for key in REPORT_TABLES if isinstance(model.get(key), pd.DataFrame)}
+    existing = next((t for t in get_templates() if t['name'] == name), None)
+    template_id, message = save_template(name, st.session_state.template_description, tables,
+                                         created_by=st.session_state.user_id,
+                                         template_id=existing['id'] if existing else None)
+    if template_id:
+        st.success(message)
+    else:
+        st.error(message)
+
 # Update completion status function
 def update_completion_status(section, is_complete):
-    st.session_state.completion_status[section] = is_complete
+    model = get_report_model()
+    model.set('completion_status', {**model.values['completion_status'], section: is_complete})
+
+# A reload or reconnect starts a fresh session; the token in the URL signs it back in
+if not st.session_state.authenticated and SESSION_QUERY_PARAM in st.query_params:
+    resume_signed_in_session(st.query_params[SESSION_QUERY_PARAM])
 
 # Main app logic
 if not st.session_state.authenticated:
@@ -1070,8 +4052,10 @@ else:
             logout()
     
     # Calculate completion percentage
-    completed_sections = sum(st.session_state.completion_status.values())
-    total_sections = len(st.session_state.completion_status)
+    ensure_sections_loaded([GENERAL_SECTION])
+    completion_status = get_report_model().values['completion_status']
+    completed_sections = sum(completion_status.values())
+    total_sections = len(completion_status)
     completion_percentage = (completed_sections / total_sections) * 100
     
     # Progress Bar
@@ -1106,12 +4090,7 @@ else:
         
         # New Report
         if st.button("📝 New Report", use_container_width=True):
-            st.session_state.current_report_id = None
-            st.session_state.current_report_name = None
-            initialize_dataframes()
-            for key in ['church_name', 'district', 'annual_conference', 'pastor_name', 'council_chairperson']:
-                if key in st.session_state:
-                    del st.session_state[key]
+            open_report(ReportModel())
             st.success("Started new report")
             st.rerun()
         
@@ -1126,35 +4105,52 @@ else:
         # Load Templates
         st.markdown('<div style="font-size: 0.875rem; color: var(--text-secondary); margin: 1.5rem 0 0.75rem 0;">TEMPLATES</div>', unsafe_allow_html=True)
         
+        # Applied from the on_change callback, which also resets the picker, so no extra rerun is needed
         templates = get_templates()
         template_names = ["Select Template"] + [f"{t['name']}" for t in templates]
-        selected_template = st.selectbox("", template_names, label_visibility="collapsed")
+        st.selectbox("", template_names, label_visibility="collapsed", key="template_select", on_change=apply_selected_template)
         
-        if selected_template != "Select Template":
-            template_id = [t['id'] for t in templates if f"{t['name']}" == selected_template][0]
-            template_data = load_template(template_id)
-            
-            if template_data:
-                for key in ['strategic_df', 'lay_df', 'trustee_df', 'leadership_df', 'appendix_df']:
-                    if key in template_data:
-                        st.session_state[key] = template_data[key]
-                st.success("Template loaded successfully!")
-                st.rerun()
+        # Templates are offered to every user, so only admins publish them
+        if st.session_state.user_role == 'admin':
+            with st.expander("Save as Template"):
+                template_name = st.text_input("Template name", key="template_name")
+                st.text_input("Description", key="template_description")
+                # Saved from the on_click callback, so the picker above already lists the new template
+                st.button("Save Template", use_container_width=True, disabled=not template_name.strip(),
+                          on_click=publish_template)
         
         st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
         
         # My Reports
         st.markdown('<div style="font-size: 0.875rem; color: var(--text-secondary); margin-bottom: 0.75rem;">MY REPORTS</div>', unsafe_allow_html=True)
         
-        user_reports = get_user_reports(st.session_state.user_id)
+        # Keyset-paged browser: page_cursors holds the cursor of every page before the current one
+        search = st.text_input("Search reports", key="report_search", placeholder="Search reports",
+                               label_visibility="collapsed", on_change=lambda: st.session_state.report_page_cursors.clear())
+        page_cursors = st.session_state.setdefault('report_page_cursors', [])
+        if search.strip():
+            # Ranked full-text matches replace the paged list while searching
+            user_reports, next_cursor = search_reports(st.session_state.user_id, search), None
+        else:
+            user_reports, next_cursor = get_user_reports_page(
+                st.session_state.user_id,
+                after=page_cursors[-1] if page_cursors else None
+            )
         
         if user_reports:
-            report_options = ["Select Report"] + [f"{r['report_name']} ({r['completion_percentage']:.0f}%)" for r in user_reports]
-            selected_report = st.selectbox("", report_options, label_visibility="collapsed", key="report_select")
+            report_labels = {r['id']: f"{r['report_name']} ({r['completion_percentage']:.0f}%)" for r in user_reports}
+            selected_report_id = st.selectbox(
+                "",
+                [None] + list(report_labels),
+                format_func=lambda report_id: report_labels.get(report_id, "Select Report"),
+                label_visibility="collapsed",
+                key="report_select"
+            )
             
-            if selected_report != "Select Report":
-                report_index = report_options.index(selected_report) - 1
-                selected_report_id = user_reports[report_index]['id']
+            if selected_report_id is not None:
+                match = next((r for r in user_reports if r['id'] == selected_report_id and r.get('snippet')), None)
+                if match and match['section']:
+                    st.caption(f"{match['section'].replace('_', ' ').title()}: {match['snippet']}")
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -1169,7 +4165,31 @@ else:
                         else:
                             st.error(message)
         else:
-            st.markdown('<div style="color: var(--text-tertiary); font-size: 0.875rem; text-align: center; padding: 1rem;">No saved reports</div>', unsafe_allow_html=True)
+            empty_message = "No matching reports" if search else "No saved reports"
+            st.markdown(f'<div style="color: var(--text-tertiary); font-size: 0.875rem; text-align: center; padding: 1rem;">{empty_message}</div>', unsafe_allow_html=True)
+        
+        if page_cursors or next_cursor:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("‹ Newer", use_container_width=True, disabled=not page_cursors, on_click=page_cursors.pop)
+            with col2:
+                st.button("Older ›", use_container_width=True, disabled=next_cursor is None,
+                          on_click=page_cursors.append, args=(next_cursor,))
+        
+        with st.expander("Import Reports"):
+            import_files = st.file_uploader("Excel workbooks, CSV or Parquet files, or exported zips",
+                                            type=['xlsx', 'csv', 'parquet', 'zip'],
+                                            accept_multiple_files=True, key="import_files")
+            if import_files and st.button("Import", use_container_width=True):
+                try:
+                    imported, import_errors = import_reports(st.session_state.user_id, read_import_files(import_files))
+                except (OSError, ValueError) as e:
+                    imported, import_errors = 0, [str(e)]
+                if import_errors:
+                    st.error("  \n".join(import_errors))
+                else:
+                    st.session_state.report_page_cursors.clear()
+                    st.success(f"Imported {imported} reports")
         
         st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
         
@@ -1187,6 +4207,37 @@ else:
         </div>
         """, unsafe_allow_html=True)
         
+        if st.session_state.get('current_report_id'):
+            # A collapsed expander still runs its body; this one is tracked so the version
+            # list and diff are only read while it is open
+            history = st.expander("History", key="history_open", on_change="rerun")
+            with history:
+                if history.open:
+                    report_id = st.session_state.current_report_id
+                    versions = list_report_versions(report_id, st.session_state.user_id)
+                    if versions:
+                        version_labels = {
+                            v['id']: f"{v['updated_at']} · {v['label'] or 'Autosave'}" for v in versions
+                        }
+                        version_id = st.selectbox("Version", list(version_labels), format_func=version_labels.get,
+                                                  key="history_version")
+                        changes = diff_report_versions(report_id, version_id, user_id=st.session_state.user_id) or {}
+                        if changes:
+                            st.caption("Differs from the current report in: " + ", ".join(
+                                f"{section.replace('_', ' ').title()} ({len(ops)} changes)" for section, ops in changes.items()))
+                        else:
+                            st.caption("Same as the current report")
+                        if st.button("Restore Version", use_container_width=True, disabled=not changes):
+                            # Autosaves queued before the restore would otherwise overwrite it
+                            get_autosave_worker().discard((st.session_state.user_id, st.session_state.current_report_name))
+                            success, message = restore_report_version(report_id, version_id, st.session_state.user_id)
+                            if success:
+                                load_selected_report(report_id)
+                            else:
+                                st.error(message)
+                    else:
+                        st.caption("No saved versions yet")
+        
         st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
         
         # Navigation
@@ -1202,8 +4253,11 @@ else:
             ("👨‍💼", "Church Workers", "workers"),
             ("👑", "Leadership", "leadership"),
             ("🙋", "Youth Ministry", "youth_ministry"),
-            ("📎", "Appendices", "appendices")
+            ("📎", "Appendices", "appendices"),
+            ("🌐", "Conference Summary", "conference_summary")
         ]
+        if st.session_state.user_role == 'admin':
+            section_options.append(("🩺", "Diagnostics", "diagnostics"))
         
         selected_section = st.selectbox(
             "",
@@ -1215,18 +4269,22 @@ else:
         
         # Get selected key
         selected_key = [key for _, name, key in section_options if name == selected_section][0]
+        if selected_key in REPORT_SECTIONS:
+            ensure_sections_loaded([selected_key])
         
         st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
         
         # Export Section
         st.markdown('<div style="font-size: 0.875rem; color: var(--text-secondary); margin-bottom: 0.75rem;">EXPORT</div>', unsafe_allow_html=True)
         
-        if st.button("Generate Report", use_container_width=True, type="primary"):
-            st.session_state.show_preview = True
+        report_format = st.selectbox("Format", list(REPORT_RENDERERS), format_func=str.upper,
+                                     label_visibility="collapsed", key="report_format")
         
-        b64, filename, report_content, completion_percentage = create_downloadable_report()
-        href = f'<a href="data:file/txt;base64,{b64}" download="{filename}" class="primary-button" style="display: block; text-align: center; margin-top: 0.75rem;">Download Report</a>'
-        st.markdown(href, unsafe_allow_html=True)
+        # The file is only rendered when the button is clicked and is streamed to the browser
+        # as a download; unchanged reports come straight from the cache
+        render_report, filename, mime = create_downloadable_report(report_format)
+        st.download_button("Download Report", render_report, file_name=filename, mime=mime,
+                           on_click="ignore", use_container_width=True, type="primary")
         
         # Theme Indicator
         st.markdown('<div class="theme-indicator">Theme: System • Database Active</div>', unsafe_allow_html=True)
@@ -1241,48 +4299,178 @@ else:
         st.markdown('<div class="section-header">Church Information</div>', unsafe_allow_html=True)
         
         # Auto-save on change
-        def check_church_info_completion():
+        def check_church_info_completion(field):
+            update_report_field(field)
+            model = get_report_model()
             required_fields = ['church_name', 'district', 'annual_conference', 'pastor_name', 'council_chairperson']
-            is_complete = all(st.session_state.get(field, '') != '' for field in required_fields)
+            is_complete = all(model.values.get(field, '') != '' for field in required_fields)
             update_completion_status('church_info', is_complete)
             # Auto-save with error handling
-            if st.session_state.authenticated and any(st.session_state.get(field, '') for field in required_fields):
-                success, message = save_current_report()
+            if st.session_state.authenticated and any(model.values.get(field, '') for field in required_fields):
+                success, message = save_current_report(background=True)
                 if not success:
                     # Show error but don't interrupt user
                     pass
         
+        bind_report_widgets(REPORT_SECTIONS['church_info'] + ['report_date'])
+        
         col1, col2 = st.columns(2)
         with col1:
             with st.container():
                 st.markdown('<div class="input-card">', unsafe_allow_html=True)
                 st.markdown('<div class="subsection-header">Basic Details</div>', unsafe_allow_html=True)
-                church_name = st.text_input("Church Name", key="church_name", on_change=check_church_info_completion)
-                district = st.text_input("District", key="district", on_change=check_church_info_completion)
-                annual_conference = st.text_input("Annual Conference", key="annual_conference", on_change=check_church_info_completion)
+                church_name = st.text_input("Church Name", key="church_name", on_change=check_church_info_completion, args=("church_name",))
+                district = st.text_input("District", key="district", on_change=check_church_info_completion, args=("district",))
+                annual_conference = st.text_input("Annual Conference", key="annual_conference", on_change=check_church_info_completion, args=("annual_conference",))
                 st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             with st.container():
                 st.markdown('<div class="input-card">', unsafe_allow_html=True)
                 st.markdown('<div class="subsection-header">Leadership</div>', unsafe_allow_html=True)
-                pastor_name = st.text_input("Pastor Name", key="pastor_name", on_change=check_church_info_completion)
-                council_chairperson = st.text_input("Council Chairperson", key="council_chairperson", on_change=check_church_info_completion)
-                report_date = st.date_input("Report Date", datetime.now(), key="report_date")
+                pastor_name = st.text_input("Pastor Name", key="pastor_name", on_change=check_church_info_completion, args=("pastor_name",))
+                council_chairperson = st.text_input("Council Chairperson", key="council_chairperson", on_change=check_church_info_completion, args=("council_chairperson",))
+                report_date = st.date_input("Report Date", key="report_date", on_change=check_church_info_completion, args=("report_date",))
                 st.markdown('</div>', unsafe_allow_html=True)
         
         # Vision, Mission, Core Values
         with st.container():
             st.markdown('<div class="input-card">', unsafe_allow_html=True)
             st.markdown('<div class="subsection-header">Vision, Mission & Values</div>', unsafe_allow_html=True)
-            vision = st.text_area("Annual Conference Vision", height=100, key="vision", on_change=check_church_info_completion)
-            mission = st.text_area("Annual Conference Mission", height=100, key="mission", on_change=check_church_info_completion)
-            core_values = st.text_area("Annual Conference Core Values", height=100, key="core_values", on_change=check_church_info_completion)
+            vision = st.text_area("Annual Conference Vision", height=100, key="vision", on_change=check_church_info_completion, args=("vision",))
+            mission = st.text_area("Annual Conference Mission", height=100, key="mission", on_change=check_church_info_completion, args=("mission",))
+            core_values = st.text_area("Annual Conference Core Values", height=100, key="core_values", on_change=check_church_info_completion, args=("core_values",))
             st.markdown('</div>', unsafe_allow_html=True)
     
+    elif selected_section == "Conference Summary":
+        st.markdown('<div class="section-header">Conference Summary</div>', unsafe_allow_html=True)
+        
+        metrics = load_report_metrics()
+        if metrics.empty:
+            st.info("No saved reports to summarize yet.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                years = sorted(metrics['reporting_year'].dropna().unique(), reverse=True)
+                reporting_year = st.selectbox("Reporting Year", ["All Years"] + years, key="summary_year")
+            with col2:
+                rollup_level = st.radio("Group By", ["District", "Annual Conference"], horizontal=True, key="summary_level")
+            
+            if reporting_year != "All Years":
+                metrics = metrics[metrics['reporting_year'] == reporting_year]
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Churches", f"{metrics['church_name'].nunique():,}")
+            col2.metric("Church Membership", f"{metrics['membership'].sum():,.0f}")
+            col3.metric("Lay Organization Members", f"{metrics['lay_members'].sum():,.0f}")
+            col4.metric("Strategic Budget (₱)", f"{metrics['budget_total'].sum():,.2f}")
+            
+            rollup = conference_rollup(metrics, by='annual_conference' if rollup_level == "Annual Conference" else 'district')
+            st.dataframe(
+                rollup.rename(columns={
+                    'annual_conference': 'Annual Conference', 'district': 'District',
+                    'reports': 'Reports', 'churches': 'Churches',
+                    'budget_total': 'Budget (₱)', 'lay_members': 'Lay Members',
+                    'trustee_ct_cost': 'Cost of CT (₱)', 'trustee_total_cost': 'Trustee Total Cost (₱)',
+                    'nursery_enrolled': 'Nursery', 'kinder_enrolled': 'Kindergarten', 'membership': 'Membership'
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            # The export carries every church's tables, officers' contact details included, so
+            # it is for admins; the rollup above only shows totals and stays open to everyone
+            if st.session_state.user_role == 'admin':
+                with st.expander("Export Reports"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        available_formats = [name for name, writer in EXPORT_FORMATS.items() if writer.available]
+                        export_format = st.selectbox("Format", available_formats, format_func=str.upper, key="export_format")
+                    with col2:
+                        conferences = sorted(metrics['annual_conference'].unique())
+                        export_conference = st.selectbox("Annual Conference", ["All Conferences"] + conferences,
+                                                         format_func=lambda conference: conference or "Unspecified",
+                                                         key="export_conference")
+                    
+                    export_filters = {
+                        'annual_conference': None if export_conference == "All Conferences" else export_conference,
+                        'reporting_year': None if reporting_year == "All Years" else reporting_year,
+                    }
+                    
+                    def build_export(export_format=export_format, export_filters=export_filters):
+                        # Written to a temporary file rather than memory; download_button reads it back
+                        # once (it accepts raw, unbuffered files) and the file is gone when released
+                        output = tempfile.TemporaryFile(buffering=0)
+                        export_reports(output, export_format, **export_filters)
+                        PROFILER.record_payload(f'export_{export_format}', output.tell())
+                        return output
+                    
+                    writer = EXPORT_FORMATS[export_format]
+                    st.download_button("Download Export", build_export, file_name=f"church_reports{writer.extension}",
+                                       mime=writer.mime, on_click="ignore", use_container_width=True)
+    
+    elif selected_section == "Diagnostics" and st.session_state.user_role == 'admin':
+        st.markdown('<div class="section-header">Diagnostics</div>', unsafe_allow_html=True)
+        
+        profile = PROFILER.snapshot()
+        recent = pd.DataFrame(profile['recent_reruns'], columns=['started_at', 'page', 'duration', 'sql_count',
+                                                                 'sql_time', 'payload_bytes', 'functions'])
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Reruns", f"{sum(stat['count'] for stat in profile['rerun'].values()):,}")
+        if not recent.empty:
+            col2.metric("Median Rerun", f"{recent['duration'].median() * 1000:.1f} ms")
+            col3.metric("95th Percentile", f"{recent['duration'].quantile(0.95) * 1000:.1f} ms")
+            col4.metric("SQL per Rerun", f"{recent['sql_count'].mean():.1f}")
+        st.caption(f"Collected since {profile['started_at']} by this server process; "
+                   f"{profile['interrupted_reruns']} runs were cut short by a rerun. Times are in milliseconds.")
+        
+        pages_tab, functions_tab, sql_tab, payloads_tab, recent_tab, plans_tab = st.tabs(
+            ["Pages", "Functions", "SQL", "Payloads", "Recent Reruns", "Query Plans"])
+        with pages_tab:
+            st.dataframe(profile_frame(profile['rerun'], 'Page'), hide_index=True, use_container_width=True)
+        with functions_tab:
+            st.dataframe(profile_frame(profile['function'], 'Function'), hide_index=True, use_container_width=True)
+        with sql_tab:
+            st.dataframe(profile_frame(profile['sql'], 'Statement'), hide_index=True, use_container_width=True)
+        with payloads_tab:
+            st.dataframe(profile_frame(profile['payload'], 'Payload (bytes)', scale=1), hide_index=True,
+                         use_container_width=True)
+        with recent_tab:
+            recent = recent.drop(columns='functions').iloc[::-1]
+            recent[['duration', 'sql_time']] *= 1000
+            st.dataframe(recent, hide_index=True, use_container_width=True)
+        with plans_tab:
+            if st.button("Check Query Plans"):
+                plans = check_query_plans()
+                st.dataframe(pd.DataFrame({'Index': list(plans), 'Used': list(plans.values())}),
+                             hide_index=True, use_container_width=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("Download JSON", lambda: json.dumps(PROFILER.snapshot(), indent=2),
+                               file_name="diagnostics.json", mime="application/json", on_click="ignore",
+                               use_container_width=True)
+        with col2:
+            st.download_button("Download Prometheus", PROFILER.to_prometheus, file_name="diagnostics.prom",
+                               mime="text/plain", on_click="ignore", use_container_width=True)
+        with col3:
+            if st.button("Reset Statistics", use_container_width=True):
+                PROFILER.reset()
+                st.rerun()
+    
     # ... (all other sections would follow the same pattern)
     
     # Database status indicator
+    autosave_status = sync_autosave_status()
+    remember_active_report()
+    saved_at = autosave_status['saved_at'] if autosave_status else None
+    last_save = saved_at.strftime('%H:%M:%S') if saved_at else 'Not saved yet'
+    if autosave_status and autosave_status['error']:
+        last_save += f" (autosave failed at {autosave_status['failed_at'].strftime('%H:%M:%S')})"
+        # Announce each failure once; the footer keeps showing it until a save succeeds
+        if st.session_state.get('autosave_error_at') != autosave_status['failed_at']:
+            st.session_state.autosave_error_at = autosave_status['failed_at']
+            st.toast(autosave_status['error'], icon="⚠️")
     st.markdown(f"""
     <div class="footer">
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 2rem;">
@@ -1299,7 +4487,7 @@ else:
                 <div style="font-size: 0.875rem; color: var(--text-secondary); line-height: 1.5;">
                     • Name: {st.session_state.get('current_report_name', 'Unsaved')}<br>
                     • Completion: {completion_percentage:.1f}%<br>
-                    • Last save: {datetime.now().strftime('%H:%M')}
+                    • Last save: {last_save}
                 </div>
             </div>
             <div>
@@ -1326,3 +4514,6 @@ else:
             Changes are auto-saved to the database.
         </div>
         """, unsafe_allow_html=True)
+
+# Record this script run for the diagnostics panel; runs cut short by st.rerun() never get here
+PROFILER.end_rerun(st.session_state.get('nav_select', "Church Information") if st.session_state.authenticated else "Login")
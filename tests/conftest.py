@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def tem(tmp_path_factory):
+    """The app module; importing it bootstraps a database in the working directory, so do that in a scratch one"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("import"))
+    try:
+        import tem
+    finally:
+        os.chdir(cwd)
+    return tem
+
+
+@pytest.fixture
+def db(tem, tmp_path):
+    """tem pointed at a fresh, fully migrated database"""
+    tem.use_database(str(tmp_path / "test.db"))
+    return tem
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def user_id(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    return db.authenticate_user("alice", "secret1")[0]
+
+
+@pytest.fixture
+def writes(db, monkeypatch):
+    """Every save_report() call the worker makes, as (district, report name)"""
+    calls = []
+    save_report = db.save_report
+    
+    def recording_save_report(user_id, report_name, church_name, data, sections=None):
+        calls.append((data.get("district"), report_name))
+        return save_report(user_id, report_name, church_name, data, sections)
+    
+    monkeypatch.setattr(db, "save_report", recording_save_report)
+    return calls
+
+
+def save_args(user_id, district):
+    return user_id, "Annual", "Grace Church", {"church_name": "Grace Church", "district": district}, None
+
+
+def stored_district(db, user_id):
+    report_id = db.get_user_reports(user_id)[0]["id"]
+    return db.load_report(report_id, user_id)["district"]
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_rapid_edits_coalesce_into_one_write(db, user_id, writes):
+    worker = db.AutosaveWorker(debounce=0.2, max_delay=5)
+    key = (user_id, "Annual")
+    seqs = [worker.submit(key, *save_args(user_id, f"District {number}")) for number in range(5)]
+    
+    wait_until(lambda: worker.last_saved(key) is not None)
+    assert writes == [("District 4", "Annual")]
+    assert worker.last_saved(key)["saved_seq"] == seqs[-1]
+    assert stored_district(db, user_id) == "District 4"
+
+
+def test_max_delay_bounds_the_debounce(db, user_id, writes):
+    worker = db.AutosaveWorker(debounce=0.3, max_delay=0.5)
+    key = (user_id, "Annual")
+    start = time.monotonic()
+    while time.monotonic() - start < 1.0 and not writes:
+        worker.submit(key, *save_args(user_id, "North"))
+        time.sleep(0.05)
+    assert writes, "edits kept postponing the save past max_delay"
+
+
+def test_out_of_order_write_is_dropped(db, user_id, writes):
+    worker = db.AutosaveWorker(debounce=60)
+    key = (user_id, "Annual")
+    older = worker.submit(key, *save_args(user_id, "Old"))
+    newer = worker.submit(key, *save_args(user_id, "New"))
+    
+    assert worker._write(key, newer, save_args(user_id, "New"))[0]
+    report_id, message = worker._write(key, older, save_args(user_id, "Old"))
+    assert report_id == 0
+    assert message == "Superseded by a newer save"
+    assert writes == [("New", "Annual")]
+    assert worker.last_saved(key)["saved_seq"] == newer
+    assert stored_district(db, user_id) == "New"
+
+
+def test_save_now_supersedes_the_pending_autosave(db, user_id, writes):
+    worker = db.AutosaveWorker(debounce=60)
+    key = (user_id, "Annual")
+    worker.submit(key, *save_args(user_id, "Queued"))
+    report_id, _ = worker.save_now(key, *save_args(user_id, "Now"))
+    
+    assert report_id
+    assert not worker.is_pending(key)
+    worker.flush()
+    assert writes == [("Now", "Annual")]
+    assert stored_district(db, user_id) == "Now"
+
+
+def test_flush_writes_the_pending_save(db, user_id, writes):
+    worker = db.AutosaveWorker(debounce=60)
+    key = (user_id, "Annual")
+    seq = worker.submit(key, *save_args(user_id, "North"))
+    
+    worker.flush(key)
+    assert not worker.is_pending(key)
+    assert worker.last_saved(key)["saved_seq"] == seq
+    assert stored_district(db, user_id) == "North"
+
+
+def test_flush_waits_for_the_save_being_written(db, user_id, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    save_report = db.save_report
+    
+    def slow_save_report(*args):
+        started.set()
+        release.wait(5)
+        return save_report(*args)
+    
+    monkeypatch.setattr(db, "save_report", slow_save_report)
+    worker = db.AutosaveWorker(debounce=0)
+    key = (user_id, "Annual")
+    worker.submit(key, *save_args(user_id, "North"))
+    assert started.wait(5)
+    
+    flusher = threading.Thread(target=worker.flush, args=(key,))
+    flusher.start()
+    flusher.join(0.2)
+    assert flusher.is_alive(), "flush returned before the worker's save was written"
+    release.set()
+    flusher.join(5)
+    assert not flusher.is_alive()
+    assert worker.last_saved(key)["report_id"]
+    assert stored_district(db, user_id) == "North"
@@ -0,0 +1,24 @@
+import json
+
+
+def test_bench_smoke(tem, tmp_path):
+    workdir, output = tmp_path / "bench", tmp_path / "results.json"
+    argv = ["bench", "--sizes", "10", "--rounds", "1", "--workdir", str(workdir), "--output", str(output)]
+
+    assert tem.main(argv) == 0
+    results = json.loads(output.read_text())
+    assert results["rounds"] == 1
+    assert list(results["sizes"]) == ["10"]
+    size = results["sizes"]["10"]
+    assert size["populate_seconds"] > 0
+    assert size["benchmarks"]
+    for stat in size["benchmarks"].values():
+        assert 0 <= stat["min"] <= stat["median"]
+        assert stat["sql_per_call"] >= 0
+
+    # A second run reuses the database and compares against the first
+    rerun = tmp_path / "rerun.json"
+    assert tem.main(argv[:-1] + [str(rerun), "--compare", str(output), "--threshold", "1000"]) == 0
+    rerun_size = json.loads(rerun.read_text())["sizes"]["10"]
+    assert rerun_size["populate_seconds"] is None
+    assert rerun_size["benchmarks"].keys() == size["benchmarks"].keys()
@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+
+FORMATS = ["xlsx", "parquet", "csv"]
+
+
+@pytest.fixture
+def users(db):
+    ids = []
+    for username in ("alice", "bob"):
+        ok, _ = db.create_user(username, "secret1")
+        assert ok
+        ids.append(db.authenticate_user(username, "secret1")[0])
+    return ids
+
+
+def source_sheets():
+    names = [f"Church {number} 2025" for number in range(5)]
+    return {
+        "reports": pd.DataFrame({
+            "report_name": names,
+            "church_name": [f"Church {number}" for number in range(5)],
+            "district": ["North", "South", "North", "East", "West"],
+            "annual_conference": ["Central"] * 5,
+            "vision": ["Grow, serve & \"welcome\"", "Line one\nline two", "", "Ñandú", "Plain"],
+            "membership": ["120", "1,500", "", "7", "0"],
+            "reporting_year": ["2025-2026"] * 5,
+        }, dtype=object),
+        "trustees": pd.DataFrame({
+            "report_name": [names[0], names[0], names[3]],
+            "Specific Project": ["Roof", "Chairs", "Sound"],
+            "Total Cost (₱)": ["1000", "250.5", ""],
+        }, dtype=object),
+        "council_report": pd.DataFrame({
+            "report_name": [names[1]],
+            "Area": ["Outreach"],
+        }, dtype=object),
+    }
+
+
+def is_blank(value):
+    return value is None or value == "" or value == 0
+
+
+def without_blanks(report):
+    """A report without its blank fields and blank table columns, which an export writes out for every report"""
+    normalized = {}
+    for key, value in report.items():
+        if isinstance(value, pd.DataFrame):
+            value = value[[column for column in value.columns if not value[column].map(is_blank).all()]]
+            normalized[key] = value.reset_index(drop=True)
+        elif not is_blank(value):
+            normalized[key] = value
+    return normalized
+
+
+def reports_by_name(db, user_id):
+    return {r["report_name"]: without_blanks(db.load_report(r["id"], user_id)) for r in db.get_user_reports(user_id)}
+
+
+def assert_same_reports(expected, actual):
+    assert set(actual) == set(expected)
+    for name, report in expected.items():
+        assert set(actual[name]) == set(report), name
+        for key, value in report.items():
+            if isinstance(value, pd.DataFrame):
+                pd.testing.assert_frame_equal(actual[name][key], value, check_dtype=False, obj=f"{name} {key}")
+            else:
+                assert actual[name][key] == value, (name, key)
+
+
+@pytest.mark.parametrize("export_format", FORMATS)
+def test_export_imports_back_unchanged(db, users, tmp_path, export_format):
+    alice, bob = users
+    assert db.import_reports(alice, source_sheets()) == (5, [])
+    
+    path = tmp_path / f"export{db.EXPORT_FORMATS[export_format].extension}"
+    assert db.export_reports(str(path), export_format, user_id=alice) == 5
+    assert db.import_reports(bob, db.read_import_files([str(path)])) == (5, [])
+    
+    original = reports_by_name(db, alice)
+    assert original["Church 0 2025"]["trustee_df"]["Specific Project"].tolist() == ["Roof", "Chairs"]
+    assert_same_reports(original, reports_by_name(db, bob))
+
+
+@pytest.mark.parametrize("export_format", FORMATS)
+def test_export_filters(db, users, tmp_path, export_format):
+    alice, bob = users
+    db.import_reports(alice, source_sheets())
+    db.import_reports(bob, {"reports": pd.DataFrame({"report_name": ["Bob's"], "district": ["North"]}, dtype=object)})
+    
+    path = str(tmp_path / f"export{db.EXPORT_FORMATS[export_format].extension}")
+    assert db.export_reports(path, export_format) == 6
+    assert db.export_reports(path, export_format, district="North") == 3
+    assert db.export_reports(path, export_format, user_id=bob, district="North") == 1
+    assert db.export_reports(path, export_format, reporting_year="1999-2000") == 0
+    
+    db.export_reports(path, export_format, district="North")
+    exported = db.read_import_files([path])["reports"]
+    assert sorted(exported["report_name"]) == ["Bob's", "Church 0 2025", "Church 2 2025"]
+    assert set(exported["owner"]) == {"alice", "bob"}
+
+
+def test_export_spans_several_batches(db, users, tmp_path, monkeypatch):
+    alice, bob = users
+    monkeypatch.setattr(db, "EXPORT_BATCH_SIZE", 2)
+    db.import_reports(alice, source_sheets())
+    path = str(tmp_path / "export.zip")
+    assert db.export_reports(path, "csv") == 5
+    assert db.import_reports(bob, db.read_import_files([path])) == (5, [])
+    assert_same_reports(reports_by_name(db, alice), reports_by_name(db, bob))
+
+
+def test_unknown_export_format_raises_value_error(db, tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format: pdf"):
+        db.export_reports(str(tmp_path / "export.pdf"), "pdf")
@@ -0,0 +1,112 @@
+import zipfile
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def user_id(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    return db.authenticate_user("alice", "secret1")[0]
+
+
+def sheets():
+    return {
+        "reports": pd.DataFrame({"report_name": ["Grace 2025", "Hope 2025"], "church_name": ["Grace", "Hope"],
+                                 "district": ["North", "South"], "membership": ["1,200", ""]}, dtype=object),
+        "trustees": pd.DataFrame({"report_name": ["Grace 2025", "Grace 2025", "Hope 2025"],
+                                  "Specific Project": ["Roof", "Chairs", "Sound"],
+                                  "Total Cost (₱)": ["1,000", "250.5", None]}, dtype=object),
+    }
+
+
+def report_named(db, user_id, name):
+    report_id = next(r["id"] for r in db.get_user_reports(user_id) if r["report_name"] == name)
+    return db.load_report(report_id, user_id)
+
+
+def test_import_creates_reports_with_their_tables(db, user_id):
+    count, errors = db.import_reports(user_id, sheets())
+    assert (count, errors) == (2, [])
+    
+    grace = report_named(db, user_id, "Grace 2025")
+    assert grace["district"] == "North"
+    assert grace["membership"] == 1200
+    assert grace["trustee_df"]["Specific Project"].tolist() == ["Roof", "Chairs"]
+    assert grace["trustee_df"]["Total Cost (₱)"].tolist() == [1000.0, 250.5]
+    assert report_named(db, user_id, "Hope 2025")["membership"] == 0
+
+
+def test_reimport_updates_reports_in_place(db, user_id):
+    db.import_reports(user_id, sheets())
+    changed = sheets()
+    changed["reports"].loc[0, "district"] = "East"
+    assert db.import_reports(user_id, changed) == (2, [])
+    assert len(db.get_user_reports(user_id)) == 2
+    assert report_named(db, user_id, "Grace 2025")["district"] == "East"
+
+
+DROP = object()
+
+
+@pytest.mark.parametrize("sheet, column, values, error", [
+    ("reports", None, None, "A 'reports' sheet with a report_name column is required"),
+    ("reports", "report_name", DROP, "A 'reports' sheet with a report_name column is required"),
+    ("reports", "report_name", ["Grace 2025", ""], "reports: 1 row(s) have no report_name"),
+    ("reports", "report_name", ["Grace 2025", "Grace 2025"], "reports: duplicate report_name Grace 2025"),
+    ("reports", "membership", ["many", "3"], "reports: membership is not a number for Grace 2025"),
+    ("trustees", "report_name", ["Grace 2025", "Faith 2025", "Hope 2025"],
+     "trustees: rows for reports not in the reports sheet: Faith 2025"),
+    ("trustees", "Total Cost (₱)", ["1,000", "a lot", None], "trustees: Total Cost (₱) is not a number for Grace 2025"),
+    ("trustees", "report_name", DROP, "trustees: a report_name column is required"),
+])
+def test_invalid_sheets_reject_the_whole_import(db, user_id, sheet, column, values, error):
+    broken = sheets()
+    if column is None:
+        del broken[sheet]
+    elif values is DROP:
+        broken[sheet] = broken[sheet].drop(columns=column)
+    else:
+        broken[sheet] = broken[sheet].assign(**{column: values})
+    count, errors = db.import_reports(user_id, broken)
+    assert count == 0
+    assert error in errors
+    assert db.get_user_reports(user_id) == []
+
+
+def test_reads_csv_parquet_and_zipped_files(db, user_id, tmp_path):
+    sheets()["reports"].to_csv(tmp_path / "reports.csv", index=False)
+    sheets()["trustees"].to_parquet(tmp_path / "Board of Trustees.parquet")
+    with zipfile.ZipFile(tmp_path / "export.zip", "w") as archive:
+        archive.write(tmp_path / "reports.csv", "reports.csv")
+        archive.write(tmp_path / "Board of Trustees.parquet", "trustees.parquet")
+    
+    for files in ([tmp_path / "reports.csv", tmp_path / "Board of Trustees.parquet"], [tmp_path / "export.zip"]):
+        read = db.read_import_files([str(path) for path in files])
+        assert set(read) == {"reports", "trustees"}
+        assert db.prepare_import(read)[1] == []
+
+
+def test_unreadable_files_raise_value_error(db, tmp_path):
+    (tmp_path / "notes.txt").write_text("hello")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        db.read_import_files([str(tmp_path / "notes.txt")])
+    
+    (tmp_path / "broken.zip").write_text("not a zip")
+    with pytest.raises(ValueError, match="Not a zip archive"):
+        db.read_import_files([str(tmp_path / "broken.zip")])
+    
+    with zipfile.ZipFile(tmp_path / "mixed.zip", "w") as archive:
+        archive.writestr("reports.txt", "hello")
+    with pytest.raises(ValueError, match="Unsupported file type: reports.txt"):
+        db.read_import_files([str(tmp_path / "mixed.zip")])
+
+
+def test_import_command_rejects_invalid_files(db, user_id, tmp_path, capsys):
+    broken = sheets()
+    broken["reports"] = broken["reports"].assign(membership=["many", "3"])
+    broken["reports"].to_csv(tmp_path / "reports.csv", index=False)
+    assert db.main(["--db", str(tmp_path / "test.db"), "import", "--user", "alice", str(tmp_path / "reports.csv")]) == 1
+    assert "membership is not a number" in capsys.readouterr().err
+    assert db.get_user_reports(user_id) == []
@@ -0,0 +1,39 @@
+import copy
+import math
+
+import pytest
+
+CASES = [
+    ({}, {}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1, "b": 2}, {"b": 2}),
+    ({"a": 1}, {"a": 1, "c": [1, 2]}),
+    ({"a": {"b": {"c": 1}}}, {"a": {"b": {"c": 2, "d": None}}}),
+    ({"rows": [1, 2, 3]}, {"rows": [1, 5, 3]}),
+    ({"rows": [1, 2, 3]}, {"rows": [1, 2]}),
+    ({"rows": [{"x": 1}, {"x": 2}]}, {"rows": [{"x": 1}, {"x": 3, "y": "new"}]}),
+    ({"a/b": 1, "c~d": 2}, {"a/b": 3, "c~d": 4, "e~/f": 5}),
+    ({"a": [1, 2]}, {"a": "text"}),
+    ({"frame": {"__frame__": 1, "columns": ["Amount"], "data": [[1.0, 2.0]]}},
+     {"frame": {"__frame__": 1, "columns": ["Amount"], "data": [[1.0, 7.5]]}}),
+]
+
+
+@pytest.mark.parametrize("old, new", CASES)
+def test_patch_round_trip(tem, old, new):
+    ops = tem.diff_json(old, new)
+    assert tem.apply_json_patch(copy.deepcopy(old), ops) == new
+
+
+def test_unchanged_document_gives_no_ops(tem):
+    doc = {"a": [1, {"b": "c"}], "d": None}
+    assert tem.diff_json(doc, copy.deepcopy(doc)) == []
+
+
+def test_unchanged_nan_cell_is_not_a_change(tem):
+    assert tem.diff_json({"data": [[1.0, math.nan]]}, {"data": [[1.0, math.nan]]}) == []
+
+
+def test_edited_cell_diffs_to_one_op(tem):
+    ops = tem.diff_json({"data": [[1, 2], [3, 4]]}, {"data": [[1, 2], [3, 9]]})
+    assert ops == [{"op": "replace", "path": "/data/1/1", "value": 9}]
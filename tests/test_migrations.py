@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+
+import pandas as pd
+
+# Schema and row format of databases written before versioned migrations
+BASELINE_SCHEMA = [
+    '''CREATE TABLE users (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           username TEXT UNIQUE NOT NULL,
+           email TEXT UNIQUE,
+           password_hash TEXT NOT NULL,
+           full_name TEXT,
+           church_name TEXT,
+           role TEXT DEFAULT 'user',
+           created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+           last_login TIMESTAMP
+       )''',
+    '''CREATE TABLE reports (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           user_id INTEGER NOT NULL,
+           report_name TEXT NOT NULL,
+           church_name TEXT,
+           reporting_year TEXT,
+           completion_percentage REAL DEFAULT 0,
+           data_json TEXT NOT NULL,
+           created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+           updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+           is_archived BOOLEAN DEFAULT 0,
+           FOREIGN KEY (user_id) REFERENCES users (id)
+       )''',
+    '''CREATE TABLE templates (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           name TEXT NOT NULL,
+           description TEXT,
+           data_json TEXT NOT NULL,
+           created_by INTEGER,
+           is_public BOOLEAN DEFAULT 1,
+           created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+           FOREIGN KEY (created_by) REFERENCES users (id)
+       )''',
+]
+
+TRUSTEES = pd.DataFrame({"Specific Project": ["Roof", "Chairs"], "Total Cost (₱)": [1200.0, 300.0]})
+
+
+def make_baseline_database(path):
+    conn = sqlite3.connect(path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO users (username, password_hash) VALUES ('legacy', ?)",
+                 (hashlib.sha256(b"oldpass").hexdigest(),))
+    data = {"church_name": "Grace Church", "district": "North", "annual_conference": "Central",
+            "membership": 120, "trustee_df": TRUSTEES.to_dict()}
+    conn.execute('''INSERT INTO reports (user_id, report_name, church_name, reporting_year, data_json)
+                    VALUES (1, 'Annual 2024', 'Grace Church', '2024-2025', ?)''', (json.dumps(data),))
+    conn.commit()
+    conn.close()
+
+
+def test_baseline_database_migrates(tem, tmp_path):
+    path = str(tmp_path / "baseline.db")
+    make_baseline_database(path)
+    tem.use_database(path)
+    
+    with tem.db_connection() as conn:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        data_json = conn.execute("SELECT data_json FROM reports WHERE id = 1").fetchone()[0]
+        sections = {row[0] for row in conn.execute("SELECT section FROM report_sections WHERE report_id = 1")}
+        metrics = conn.execute("SELECT district, trustee_total_cost FROM report_metrics WHERE report_id = 1").fetchone()
+        templates = conn.execute("SELECT COUNT(*) FROM templates WHERE name = 'Default Template'").fetchone()[0]
+    assert versions == [version for version, _, _ in tem.SCHEMA_MIGRATIONS]
+    assert data_json == "{}"
+    assert {"church_info", "trustees", "workers"} <= sections
+    assert metrics == ("North", 1500.0)
+    assert templates == 1
+    assert all(tem.check_query_plans().values())
+    
+    report = tem.load_report(1, user_id=1)
+    assert report["church_name"] == "Grace Church"
+    assert report["membership"] == 120
+    pd.testing.assert_frame_equal(report["trustee_df"].reset_index(drop=True), TRUSTEES, check_dtype=False)
+    
+    assert [version["label"] for version in tem.list_report_versions(1, user_id=1)] == ["Initial version"]
+    assert [row["id"] for row in tem.search_reports(1, "Grace")] == [1]
+
+
+def test_migrated_database_is_not_migrated_again(tem, tmp_path):
+    path = str(tmp_path / "baseline.db")
+    make_baseline_database(path)
+    tem.use_database(path)
+    tem.use_database(path)
+    with tem.db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == tem.SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM report_versions").fetchone()[0] == 1
+
@@ -0,0 +1,45 @@
+import hashlib
+
+import pytest
+
+
+def test_legacy_password_hash_is_upgraded_on_login(db):
+    ok, _ = db.create_user("legacy", "placeholder")
+    assert ok
+    with db.db_connection() as conn:
+        conn.execute("UPDATE users SET password_hash = ? WHERE username = 'legacy'",
+                     (hashlib.sha256(b"oldpass").hexdigest(),))
+        conn.commit()
+    
+    assert db.authenticate_user("legacy", "wrong") is None
+    assert db.authenticate_user("legacy", "oldpass")[1] == "legacy"
+    with db.db_connection() as conn:
+        stored = conn.execute("SELECT password_hash FROM users WHERE username = 'legacy'").fetchone()[0]
+    assert stored.startswith(db.PASSWORD_HASHER + "$")
+    assert not db.password_needs_rehash(stored)
+    
+    db.get_credential_cache().clear()
+    assert db.authenticate_user("legacy", "oldpass")[1] == "legacy"
+    assert db.authenticate_user("legacy", "wrong") is None
+
+
+def test_hashes_are_salted(db):
+    first, second = db.hash_password("same password"), db.hash_password("same password")
+    assert first != second
+    assert db.verify_password("same password", first)
+    assert db.verify_password("same password", second)
+    assert not db.verify_password("other password", first)
+
+
+@pytest.mark.parametrize("scheme", ["scrypt", "pbkdf2_sha256"])
+def test_every_hashing_scheme_round_trips(db, scheme):
+    stored = db.hash_password("secret", scheme=scheme)
+    assert stored.startswith(scheme + "$")
+    assert db.verify_password("secret", stored)
+    assert not db.verify_password("Secret", stored)
+
+
+def test_legacy_scheme_only_verifies(db):
+    with pytest.raises(ValueError, match="sha256"):
+        db.hash_password("secret", scheme="sha256")
+    assert db.verify_password("secret", hashlib.sha256(b"secret").hexdigest())
@@ -0,0 +1,17 @@
+def test_hot_queries_use_their_indexes(db):
+    plans = db.check_query_plans()
+    assert plans
+    assert all(plans.values()), plans
+
+
+def test_hot_queries_use_their_indexes_with_reports(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    user_id = db.authenticate_user("alice", "secret1")[0]
+    for number in range(30):
+        report_id, _ = db.save_report(user_id, f"Report {number}", "Grace Church", {"district": f"District {number}"})
+        assert report_id
+    with db.db_connection() as conn:
+        conn.execute("ANALYZE")
+    plans = db.check_query_plans()
+    assert all(plans.values()), plans
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def user_id(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    return db.authenticate_user("alice", "secret1")[0]
+
+
+# Incompressible text, so the section snapshot stays larger than a few small deltas
+VISION = os.urandom(1000).hex()
+
+
+def save(db, user_id, district):
+    report_id, message = db.save_report(user_id, "Annual", "Grace Church",
+                                        {"church_name": "Grace Church", "vision": VISION, "district": district})
+    assert report_id, message
+    return report_id
+
+
+def delta_count(db, report_id):
+    with db.db_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM report_deltas WHERE report_id = ?", (report_id,)).fetchone()[0]
+
+
+def test_saves_append_deltas(db, user_id):
+    report_id = save(db, user_id, "District 0")
+    for number in range(1, 4):
+        save(db, user_id, f"District {number}")
+    assert delta_count(db, report_id) == 3
+    assert db.load_report(report_id, user_id)["district"] == "District 3"
+
+
+def test_save_compacts_a_long_delta_chain(db, user_id, monkeypatch):
+    monkeypatch.setattr(db, "REPORT_DELTA_COMPACT_EVERY", 5)
+    report_id = save(db, user_id, "District 0")
+    counts = []
+    for number in range(1, 13):
+        save(db, user_id, f"District {number}")
+        counts.append(delta_count(db, report_id))
+    assert 0 in counts
+    assert max(counts) < 5
+    assert db.load_report(report_id, user_id)["district"] == "District 12"
+
+
+def test_compact_report_deltas_folds_pending_deltas(db, user_id):
+    report_id = save(db, user_id, "District 0")
+    for number in range(1, 4):
+        save(db, user_id, f"District {number}")
+    before = db.load_report(report_id, user_id)
+    
+    assert db.compact_report_deltas(report_id) == 1
+    assert delta_count(db, report_id) == 0
+    assert db.load_report(report_id, user_id) == before
+    assert db.compact_report_deltas() == 0
+
+
+def test_compact_command(db, user_id, tmp_path, capsys):
+    report_id = save(db, user_id, "District 0")
+    save(db, user_id, "District 1")
+    assert db.main(["--db", str(tmp_path / "test.db"), "compact"]) == 0
+    assert "Compacted 1 report sections" in capsys.readouterr().out
+    assert delta_count(db, report_id) == 0
+    assert db.load_report(report_id, user_id)["district"] == "District 1"
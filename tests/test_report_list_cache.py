@@ -0,0 +1,53 @@
+def report(report_id, updated_at):
+    return {"id": report_id, "report_name": f"Report {report_id}", "church_name": "Grace", "reporting_year": "2026-2027",
+            "completion_percentage": 0, "created_at": updated_at, "updated_at": updated_at, "is_archived": 0}
+
+
+def test_entries_are_capped_least_recently_used_first(tem):
+    cache = tem.ReportListCache(max_entries=3)
+    for page in range(3):
+        cache.get(1, lambda: [page], key=("page", page))
+    cache.get(1, lambda: None, key=("page", 0))   # touch page 0, so page 1 is the oldest
+    cache.get(2, lambda: ["search"], key=("search", "grace"))
+    
+    assert len(cache._entries) == 3
+    loads = []
+    assert cache.get(1, lambda: loads.append("page 0") or "reloaded", key=("page", 0)) == [0]
+    assert cache.get(1, lambda: loads.append("page 1") or "reloaded", key=("page", 1)) == "reloaded"
+    assert loads == ["page 1"]
+    assert len(cache._entries) == 3
+
+
+def test_expired_entries_are_reloaded_and_replaced(tem):
+    cache = tem.ReportListCache(ttl=0)
+    assert cache.get(1, lambda: "first", key="search") == "first"
+    assert cache.get(1, lambda: "second", key="search") == "second"
+    assert len(cache._entries) == 1
+
+
+def test_write_keeps_the_full_list_and_drops_pages(tem):
+    cache = tem.ReportListCache()
+    cache.get(1, lambda: [report(1, "2026-01-01")])
+    cache.get(1, lambda: "page", key=("page", None))
+    cache.get(2, lambda: "other user's page", key=("page", None))
+    
+    cache.upsert(1, report(2, "2026-02-01"))
+    assert [r["id"] for r in cache.get(1, lambda: None)] == [2, 1]
+    assert cache.get(1, lambda: "reloaded", key=("page", None)) == "reloaded"
+    assert cache.get(2, lambda: None, key=("page", None)) == "other user's page"
+    
+    cache.remove(1, 2)
+    assert [r["id"] for r in cache.get(1, lambda: None)] == [1]
+    cache.invalidate(1)
+    assert cache.get(1, lambda: "reloaded") == "reloaded"
+
+
+def test_load_racing_a_write_is_not_cached(tem):
+    cache = tem.ReportListCache()
+    
+    def racing_loader():
+        cache.upsert(1, report(1, "2026-01-01"))
+        return "stale"
+    
+    assert cache.get(1, racing_loader, key=("page", None)) == "stale"
+    assert cache.get(1, lambda: "fresh", key=("page", None)) == "fresh"
@@ -0,0 +1,54 @@
+import re
+import zlib
+
+import pandas as pd
+
+LONG_TEXT = " ".join(f"word{number}" for number in range(1500))
+
+
+def document(*blocks):
+    return {
+        'title': "CHURCH ANNUAL REPORT",
+        'meta': [("Church", "Grace")],
+        'sections': [("1. SECTION", list(blocks))],
+        'completion_percentage': 50.0,
+    }
+
+
+def pdf_pages(data):
+    """Decoded content stream of each page"""
+    streams = re.findall(rb"stream\n(.*?)\nendstream", data, re.S)
+    return [zlib.decompress(stream).decode('cp1252') for stream in streams]
+
+
+def text_lines(page):
+    return [(float(y), text) for y, text in re.findall(r"[\d.]+ ([\d.]+) Td \((.*?)\) Tj ET", page)]
+
+
+def boxes(page):
+    return [(float(y), float(height)) for y, height in re.findall(r"[\d.]+ ([\d.-]+) [\d.]+ ([\d.]+) re S", page)]
+
+
+def test_long_field_flows_onto_following_pages(tem):
+    pages = pdf_pages(tem._render_pdf(document(('fields', [("Vision", LONG_TEXT), ("Mission", "Serve")]))))
+
+    assert len(pages) > 2
+    lines = [line for page in pages for line in text_lines(page)]
+    assert all(tem._PdfDocument.MARGIN <= y <= tem._PdfDocument.PAGE_HEIGHT - tem._PdfDocument.MARGIN for y, _ in lines)
+    words = " ".join(text for _, text in lines).split()
+    assert [word for word in words if word.startswith("word")] == LONG_TEXT.split()
+    assert "Mission" in words
+
+
+def test_tall_table_row_is_split_with_repeated_header(tem):
+    table = pd.DataFrame({"Name": ["Short", "Tall", "After"], "Notes": ["One", LONG_TEXT, "Two"]})
+    pages = pdf_pages(tem._render_pdf(document(('table', table))))
+
+    assert len(pages) > 2
+    for page in pages:
+        assert all(y >= tem._PdfDocument.MARGIN and y + height <= tem._PdfDocument.PAGE_HEIGHT - tem._PdfDocument.MARGIN
+                   for y, height in boxes(page))
+    assert all("(Name)" in page and "(Notes)" in page for page in pages)
+    words = " ".join(text for page in pages for _, text in text_lines(page)).split()
+    assert [word for word in words if word.startswith("word")] == LONG_TEXT.split()
+    assert words.index("After") > words.index("word1499")
@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.fixture
+def user_id(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    return db.authenticate_user("alice", "secret1")[0]
+
+
+def save(db, user_id, district):
+    report_id, message = db.save_report(user_id, "Annual", "Grace Church", {"church_name": "Grace Church",
+                                                                           "district": district})
+    assert report_id, message
+    return report_id
+
+
+def test_saves_within_the_coalesce_window_share_a_version(db, user_id):
+    report_id = save(db, user_id, "North")
+    save(db, user_id, "South")
+    versions = db.list_report_versions(report_id, user_id)
+    assert len(versions) == 1
+    assert db.load_report(report_id, user_id)["district"] == "South"
+
+
+def test_retention_keeps_the_newest_versions(db, user_id, monkeypatch):
+    monkeypatch.setattr(db, "REPORT_VERSION_COALESCE_SECONDS", 0)
+    monkeypatch.setattr(db, "REPORT_VERSIONS_KEEP", 3)
+    for number in range(6):
+        report_id = save(db, user_id, f"District {number}")
+    
+    versions = db.list_report_versions(report_id, user_id)
+    assert len(versions) == 3
+    oldest = versions[-1]["id"]
+    assert db.diff_report_versions(report_id, oldest, user_id=user_id) == {
+        "church_info": [{"op": "replace", "path": "/district", "value": "District 5"}]}
+    
+    # Blobs only the evicted versions referenced are gone
+    with db.db_connection() as conn:
+        blobs = conn.execute("SELECT COUNT(*) FROM section_blobs").fetchone()[0]
+        referenced = conn.execute("SELECT COUNT(DISTINCT content_hash) FROM report_version_sections").fetchone()[0]
+    assert blobs == referenced
+
+
+def test_restore_is_recorded_as_a_new_version(db, user_id, monkeypatch):
+    monkeypatch.setattr(db, "REPORT_VERSION_COALESCE_SECONDS", 0)
+    report_id = save(db, user_id, "North")
+    first = db.list_report_versions(report_id, user_id)[0]["id"]
+    save(db, user_id, "South")
+    
+    ok, message = db.restore_report_version(report_id, first, user_id)
+    assert ok, message
+    assert db.load_report(report_id, user_id)["district"] == "North"
+    versions = db.list_report_versions(report_id, user_id)
+    assert len(versions) == 3
+    assert versions[0]["label"] == f"Restored version {first}"
+    assert db.restore_report_version(report_id, first, user_id + 1)[0] is False
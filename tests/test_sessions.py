@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.fixture
+def user_id(db):
+    ok, _ = db.create_user("alice", "secret1")
+    assert ok
+    return db.authenticate_user("alice", "secret1")[0]
+
+
+def test_resume_rotates_the_token(db, user_id):
+    token = db.create_session(user_id, report_id=7)
+
+    user, report_id, new_token = db.resume_session(token)
+    assert user[0] == user_id and user[1] == "alice"
+    assert report_id == 7
+    assert new_token != token
+
+    # The old token was spent by the resume; the new one works once in turn
+    assert db.resume_session(token) is None
+    assert db.resume_session(new_token)[0][0] == user_id
+    assert db.resume_session(new_token) is None
+
+
+def test_set_session_report_is_carried_over(db, user_id):
+    token = db.create_session(user_id)
+    db.set_session_report(token, 3)
+    assert db.resume_session(token)[1] == 3
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda token: token[:-1] + ("0" if token[-1] != "0" else "1"),
+    lambda token: "0" * 32 + token[32:],
+    lambda token: ".".join((token.split(".")[0], str(int(token.split(".")[1]) + 3600), token.split(".")[2])),
+    lambda token: token.rsplit(".", 1)[0],
+    lambda token: "",
+])
+def test_tampered_token_is_rejected(db, user_id, tamper):
+    token = db.create_session(user_id)
+    assert db.resume_session(tamper(token)) is None
+    # A failed attempt does not spend the real token
+    assert db.resume_session(token) is not None
+
+
+def test_expired_token_is_rejected(db, user_id, monkeypatch):
+    monkeypatch.setattr(db, "SESSION_TTL_SECONDS", -1)
+    assert db.resume_session(db.create_session(user_id)) is None
+
+
+def test_session_expired_in_database_is_rejected(db, user_id):
+    token = db.create_session(user_id)
+    with db.db_connection() as conn:
+        conn.execute("UPDATE sessions SET expires_at = 0")
+        conn.commit()
+    assert db.resume_session(token) is None
+
+
+def test_tokens_survive_a_restart(db, user_id):
+    token = db.create_session(user_id)
+    db.get_session_secret.clear()
+    assert db.resume_session(token) is not None
+
+
+def test_end_session(db, user_id):
+    token = db.create_session(user_id)
+    db.end_session(token)
+    assert db.resume_session(token) is None
@@ -0,0 +1,49 @@
+import pandas as pd
+
+
+def default_template_id(db):
+    return next(template["id"] for template in db.get_templates() if template["name"] == "Default Template")
+
+
+def test_update_invalidates_the_cached_template(db):
+    template_id = default_template_id(db)
+    cached = db.load_template(template_id)
+    assert "strategic_df" in cached
+    
+    tables = {"strategic_df": pd.DataFrame({"Goal": ["Grow"], "Budget": [100.0]})}
+    assert db.save_template("Default Template", "Changed", tables, template_id=template_id)[0] == template_id
+    
+    reloaded = db.load_template(template_id)
+    assert set(reloaded) == {"strategic_df"}
+    assert reloaded["strategic_df"]["Goal"].tolist() == ["Grow"]
+    assert next(t for t in db.get_templates() if t["id"] == template_id)["description"] == "Changed"
+
+
+def test_new_template_joins_the_cached_catalog(db):
+    assert [template["name"] for template in db.get_templates()] == ["Default Template"]
+    template_id, message = db.save_template("Small Church", "Fewer rows", {"lay_df": pd.DataFrame({"A": [1]})})
+    assert template_id, message
+    assert [template["name"] for template in db.get_templates()] == ["Default Template", "Small Church"]
+    assert db.load_template(template_id)["lay_df"]["A"].tolist() == [1]
+
+
+def test_load_started_before_a_write_is_not_cached(db):
+    template_id = default_template_id(db)
+    cache = db.get_template_cache()
+    
+    def racing_loader(loaded_id):
+        data = db._read_template(loaded_id)
+        cache.invalidate()   # a write lands while this load runs
+        return data
+    
+    assert cache.template(template_id, racing_loader) is not None
+    calls = []
+    cache.template(template_id, lambda loaded_id: calls.append(loaded_id) or db._read_template(loaded_id))
+    assert calls == [template_id]
+
+
+def test_cached_template_is_not_shared_with_callers(db):
+    template_id = default_template_id(db)
+    first = db.load_template(template_id)
+    first["strategic_df"].iloc[0, 0] = "edited"
+    assert db.load_template(template_id)["strategic_df"].iloc[0, 0] != "edited"